@@ -10,58 +10,81 @@ _log.setLevel(logging.DEBUG)
 
 AVAILABLE_PROBLEMS = ['Query26','LiGen','StereoMatch','LiGenTot','ScaledLiGen','ScaledLiGenTot','ScaledStereoMatch','ScaledQuery26', 'ScaledStereoMatch10']
 
-parser = argparse.ArgumentParser(prog='QALIBOO: Simplified finite domain q-KG',
-                                 description='QALIBOO: Simplified finite domain q-KG',
-                                 usage='Specify the selected problem and the other parameters.'
-                                       ' Results are saved in the results/simplified_runs folder')
-parser.add_argument('--problem', '-p', help='Selected dataset', choices=AVAILABLE_PROBLEMS, required=True)
-parser.add_argument('--init', '-i', help='Number of initial points', type=int, default=7)
-parser.add_argument('--iter', '-n', help='Number of iterations', type=int, default=9)
-parser.add_argument('--points', '-q', help='Points per iteration (the `q` parameter)', type=int, default=7)
-parser.add_argument('--sample_size', '-m', help='GP sample size (`M` parameter)', type=int, default=30)
-parser.add_argument('--upper_bound', '-ub', help='Upper Bound (ML model)', type=float, default=None)
-parser.add_argument('--domain_upper_bound', '-dub', help='Domain Upper Bound', type=float, default=None)
-parser.add_argument('--lower_bound', '-lb', help='Lower Bound (ML model)', type=float, default=None)
-parser.add_argument('--nascent_minima', '-nm', help='Nascent Minima term (ML model)', type=bool, default=False)
-parser.add_argument('--timeout', '-t', help='Timeout for the optimization', type=int, default=0)
-parser.add_argument('--time_proportion', '-prop', help='Scaling for simulation time', type=int, default=1)
-params = parser.parse_args()
+# The background hyperparameter sampler is a spawned process that imports this module again,
+# so nothing below may run on import
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='QALIBOO: Simplified finite domain q-KG',
+                                     description='QALIBOO: Simplified finite domain q-KG',
+                                     usage='Specify the selected problem and the other parameters.'
+                                           ' Results are saved in the results/simplified_runs folder')
+    parser.add_argument('--problem', '-p', help='Selected dataset', choices=AVAILABLE_PROBLEMS, required=True)
+    parser.add_argument('--init', '-i', help='Number of initial points', type=int, default=7)
+    parser.add_argument('--iter', '-n', help='Number of iterations', type=int, default=9)
+    parser.add_argument('--points', '-q', help='Points per iteration (the `q` parameter)', type=int, default=7)
+    parser.add_argument('--sample_size', '-m', help='GP sample size (`M` parameter)', type=int, default=30)
+    parser.add_argument('--upper_bound', '-ub', help='Upper Bound (ML model)', type=float, default=None)
+    parser.add_argument('--domain_upper_bound', '-dub', help='Domain Upper Bound', type=float, default=None)
+    parser.add_argument('--lower_bound', '-lb', help='Lower Bound (ML model)', type=float, default=None)
+    parser.add_argument('--nascent_minima', '-nm', help='Nascent Minima term (ML model)', type=bool, default=False)
+    parser.add_argument('--timeout', '-t', help='Timeout for the optimization', type=int, default=0)
+    parser.add_argument('--time_proportion', '-prop', help='Scaling for simulation time', type=int, default=1)
+    parser.add_argument('--experiment_store', '-db', help='SQLite file where results are saved instead of a result folder', type=str, default=None)
+    parser.add_argument('--hyperparameter_sampler', '-hs', help='MCMC sampler of the GP hyperparameters', choices=['emcee', 'hmc', 'map', 'laplace'], default='emcee')
+    parser.add_argument('--mcmc_effective_samples', '-ess', help='Stop each MCMC training at this effective sample size', type=int, default=None)
+    parser.add_argument('--refresh_evaluations', '-re', help='New evaluations between two GP hyperparameter resamplings', type=int, default=1)
+    parser.add_argument('--refresh_seconds', '-rs', help='Seconds after which the GP hyperparameters are resampled', type=float, default=None)
+    parser.add_argument('--background_hyperparameters', '-bh', help='Resample the GP hyperparameters in a background process', action='store_true')
+    parser.add_argument('--max_staleness', '-ms', help='Evaluations the background hyperparameters may lag behind', type=int, default=None)
+    parser.add_argument('--optimization_threads', '-ot', help='Threads running the acquisition optimization restarts', type=int, default=1)
+    parser.add_argument('--kg_evaluation_budget', '-kb', help='Max KG evaluations of the restart racing (successive halving), at least 2*n_restarts', type=int, default=None)
+    params = parser.parse_args()
 
-objective_func_name = params.problem
-np.random.seed(np.random.randint(1, 1000)) 
-objective_func = getattr(precomputed_functions, params.problem)
-known_minimum = objective_func.minimum
-domain = objective_func
+    objective_func_name = params.problem
+    seed = np.random.randint(1, 1000)
+    np.random.seed(seed)
+    objective_func = getattr(precomputed_functions, params.problem)
+    known_minimum = objective_func.minimum
+    domain = objective_func
 
-n_initial_points = params.init
-n_iterations = params.iter
-n_points_per_iteration = params.points
-#m_domain_discretization_sample_size = params.sample_size
-lb = params.lower_bound
-ub = params.upper_bound
-nm = params.nascent_minima
-timeout = params.timeout
-time_proportion = params.time_proportion
-dub = params.domain_upper_bound
-num_processors = multiprocessing.cpu_count()
-print("Maximum number of available process", num_processors)
+    n_initial_points = params.init
+    n_iterations = params.iter
+    n_points_per_iteration = params.points
+    #m_domain_discretization_sample_size = params.sample_size
+    lb = params.lower_bound
+    ub = params.upper_bound
+    nm = params.nascent_minima
+    timeout = params.timeout
+    time_proportion = params.time_proportion
+    dub = params.domain_upper_bound
+    num_processors = multiprocessing.cpu_count()
+    print("Maximum number of available process", num_processors)
 
-Baop = PAKMAN(n_initial_points=n_initial_points, 
-           n_iterations=n_iterations, 
-           batch_size=n_points_per_iteration, 
-           objective_func=objective_func,
-           domain=objective_func,
-           objective_func_name=objective_func_name, 
-           lb=lb, 
-           ub=ub,
-           dub=dub,
-           nm=nm,
-           uniform_sample=True,
-           save=True,
-           timeout=timeout)
+    Baop = PAKMAN(n_initial_points=n_initial_points, 
+               n_iterations=n_iterations, 
+               batch_size=n_points_per_iteration, 
+               objective_func=objective_func,
+               domain=objective_func,
+               objective_func_name=objective_func_name, 
+               lb=lb, 
+               ub=ub,
+               dub=dub,
+               nm=nm,
+               uniform_sample=True,
+               save=True,
+               timeout=timeout,
+               experiment_store=params.experiment_store,
+               seed=seed,
+               hyperparameter_sampler=params.hyperparameter_sampler,
+               mcmc_effective_samples=params.mcmc_effective_samples,
+               refresh_evaluations=params.refresh_evaluations,
+               refresh_seconds=params.refresh_seconds,
+               background_hyperparameters=params.background_hyperparameters,
+               max_hyperparameter_staleness=params.max_staleness,
+               n_optimization_threads=params.optimization_threads,
+               kg_evaluation_budget=params.kg_evaluation_budget)
 
-# 60 for LiGen (in teoria per 5)
-# 36 for StereoMatch (in teoria per 250)
-# 33 for StereoMatch10 (in teoria per 3)
-Baop.async_optimization(timeout, n_points_per_iteration, time_proportion) # Cambia il time
-#Baop.sync_optimization()
+    # 60 for LiGen (in teoria per 5)
+    # 36 for StereoMatch (in teoria per 250)
+    # 33 for StereoMatch10 (in teoria per 3)
+    Baop.async_optimization(timeout, n_points_per_iteration, time_proportion) # Cambia il time
+    #Baop.sync_optimization()
@@ -47,6 +47,20 @@ class AbstractProblem:
             self._evaluation_count += 1
         return self.evaluate_true(x)
 
+    def evaluate_batch(self, X, *, do_not_count=False):
+        """Evaluate every row of X, updating the evaluation count once
+
+        Returns values, indexes and times as arrays. Indexes and times are
+        None for problems whose evaluate_true returns only the value.
+        """
+        if not do_not_count:
+            self._evaluation_count += len(X)
+        results = [self.evaluate_true(x) for x in X]
+        if results and isinstance(results[0], tuple):
+            values, indexes, times = (np.array(r) for r in zip(*results))
+            return values, indexes, times
+        return np.array(results), None, None
+
     def add_evaluation_count(self, n):
         self._evaluation_count += n
         return
\ No newline at end of file
@@ -195,8 +195,9 @@ elif nm:
 result_folder = aux.create_result_folder(result_folder_)
 
 
-aux.csv_init(result_folder,initial_points_index, dat)
-aux.csv_history(result_folder,-1,initial_points_index, dat)
+result_writer = aux.ResultWriter(result_folder, dat)
+result_writer.write_init(initial_points_index)
+result_writer.write_history(-1, initial_points_index)
 
 initial_points = [data_containers.SamplePoint(pt,
                                               initial_points_value[num])
@@ -392,7 +393,7 @@ for s in range(n_iterations):
     with open(hist, 'w') as f:
         json.dump(h_p, f, indent=2) 
     '''   
-    aux.csv_history(result_folder,s,next_points_index, dat)
+    result_writer.write_history(s, next_points_index)
     
 
 
@@ -458,12 +459,13 @@ for s in range(n_iterations):
     _log.info(f'Optimizer Time: {global_time}')
 
     #aux.save_execution_time([next_points_time], result_folder)
-    aux.csv_info(s,n_points_per_iteration, objective_func.evaluation_count,
-                global_time, unfeasible_points, mape_value, result_folder, error)
+    result_writer.write_info(s, n_points_per_iteration, objective_func.evaluation_count,
+                             global_time, unfeasible_points, mape_value, error)
 
     if global_time >= 5000:
         break
 
+result_writer.close()
 _log.info("\nOptimization finished successfully!")
 
 
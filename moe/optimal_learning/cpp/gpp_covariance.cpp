@@ -55,6 +55,27 @@ NormSquaredWithInverseWeights(double const * restrict point_one,
   return norm;
 }
 
+/*!\rst
+  Same as NormSquaredWithInverseWeights(), from precomputed ``(p1_i - p2_i)^2`` terms.
+
+  \param
+    :square_differences[size]: the squared differences ``(p1_i - p2_i)^2``
+    :weights[size]: the vector W, i.e., the scaling to apply to each term of the norm
+    :size: number of dimensions in point
+  \return
+    the weighted ``L_2``-norm of the vector difference ``p1 - p2``.
+\endrst*/
+OL_PURE_FUNCTION OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT double
+NormSquaredOfSquareDifferences(double const * restrict square_differences,
+                               double const * restrict weights, int size) noexcept {
+  double norm = 0.0;
+
+  for (int i = 0; i < size; ++i) {
+    norm += square_differences[i]/weights[i];
+  }
+  return norm;
+}
+
 /*!\rst
   Validate and initialize covariance function data (sizes, hyperparameters).
 
@@ -168,6 +189,11 @@ void SquareExponential::Covariance(double const * restrict point_one,
   ``\pderiv{cov(x_1, x_2)}{x_{1,i}} = (x_{2,i} - x_{1,i}) / L_{i}^2 * cov(x_1, x_2)``
   the gradient of the above matrix Cov wrt to the first point x1.
 */
+double SquareExponential::CovarianceOfSquareDifferences(double const * restrict square_differences) const noexcept {
+  const double norm_val = NormSquaredOfSquareDifferences(square_differences, lengths_sq_.data(), dim_);
+  return alpha_*std::exp(-0.5*norm_val);
+}
+
 void SquareExponential::GradCovariance(double const * restrict point_one,
                                        int const * restrict derivatives_one,
                                        int num_derivatives_one,
@@ -386,6 +412,13 @@ void MaternNu2p5::Covariance(double const * restrict point_one,
   }
 }
 
+double MaternNu2p5::CovarianceOfSquareDifferences(double const * restrict square_differences) const noexcept {
+  const double norm_val = NormSquaredOfSquareDifferences(square_differences, lengths_sq_.data(), dim_);
+  const double matern_arg = kSqrt5 * std::sqrt(norm_val);
+  const double exp_part = std::exp(-matern_arg);
+  return alpha_*exp_part*(1.0 + matern_arg + 5.0/3.0*norm_val);
+}
+
 void MaternNu2p5::GradCovariance(double const * restrict point_one,
                                  int const * restrict derivatives_one,
                                  int num_derivatives_one,
@@ -93,6 +93,20 @@ class CovarianceInterface {
                           int num_derivatives_two,
                           double * restrict cov) const noexcept OL_WARN_UNUSED_RESULT = 0;
 
+  /*!\rst
+    Computes the covariance of the function values of two points (no gradients), given only the squared
+    differences of their coordinates.  Same value as ``cov[0]`` from Covariance().
+
+    Stationary covariances depend on the points only through these differences, so callers that evaluate
+    many hyperparameters on fixed points can compute them once.
+
+    \param
+      :square_differences[dim]: ``(point_one[i] - point_two[i])^2`` for each dimension ``i``
+    \return
+      value of covariance between the function values of the two points
+  \endrst*/
+  virtual double CovarianceOfSquareDifferences(double const * restrict square_differences) const noexcept OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT = 0;
+
   /*!\rst
     Computes the gradient of this.Covariance(point_one, point_two) with respect to the FIRST argument, point_one.
 
@@ -234,6 +248,9 @@ class SquareExponential final : public CovarianceInterface {
                           int num_derivatives_two,
                           double * restrict cov) const noexcept override OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT;
 
+  // covariance of the function values of two points, from their squared coordinate differences [dim]
+  virtual double CovarianceOfSquareDifferences(double const * restrict square_differences) const noexcept override OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT;
+
   // gradient of the covariance function wrt point_one (tensor)
   // [dim][1+num_derivatives_one][1+num_derivatives_two]
   virtual void GradCovariance(double const * restrict point_one,
@@ -352,6 +369,9 @@ class MaternNu2p5 final : public CovarianceInterface {
                           int length_two,
                           double * restrict cov) const noexcept override OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT;
 
+  // covariance of the function values of two points, from their squared coordinate differences [dim]
+  virtual double CovarianceOfSquareDifferences(double const * restrict square_differences) const noexcept override OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT;
+
   // gradient of the covariance function wrt point_one (tensor)
   // [dim][1+num_derivatives_one][1+num_derivatives_two]
   virtual void GradCovariance(double const * restrict point_one,
@@ -12,6 +12,8 @@
 #include <boost/python/extract.hpp>  // NOLINT(build/include_order)
 #include <boost/python/make_constructor.hpp>  // NOLINT(build/include_order)
 
+#include <pthread.h>
+
 #include <algorithm>
 #include <limits>
 #include <vector>
@@ -308,6 +310,20 @@ double ComputeDistance (const Point& p1, const Point& p2) {
 }
 
 // ======================== FiniteDomain class methods ========================
+namespace {
+
+// libgomp cannot start new threads in a process forked after the parent used OpenMP (e.g., PAKMAN's async workers,
+// forked by multiprocessing): parallel regions opened there never return.  Forked children stay single-threaded.
+bool in_forked_child = false;
+
+void MarkForkedChild() {
+  in_forked_child = true;
+}
+
+const int fork_handler_status = pthread_atfork(nullptr, nullptr, &MarkForkedChild);
+
+}  // end unnamed namespace
+
 FiniteDomain::FiniteDomain (const boost::python::list& points,
                             int dim_in)
                             : dim_(dim_in), finite_latin_hypercube_(dim_in) {
@@ -351,6 +367,94 @@ void FiniteDomain::SetData(const boost::python::list& points) {
   n_available_points_ = n_points_;
   is_point_selected_ = std::vector<bool>(n_points_, false);
   uniform_distribution_ = std::uniform_int_distribution<int>(0, n_points_ - 1);
+  BuildKdTree();
+}
+
+void FiniteDomain::BuildKdTree() {
+  kd_tree_indexes_.resize(n_points_);
+  std::iota(kd_tree_indexes_.begin(), kd_tree_indexes_.end(), 0);
+  kd_tree_split_dims_.assign(n_points_, 0);
+  BuildKdTreeNode(0, n_points_);
+}
+
+void FiniteDomain::BuildKdTreeNode(int begin, int end) {
+  if (end - begin <= 1) {
+    return;
+  }
+  // Split along the dimension with the largest spread, so that cells stay compact
+  int split_dim = 0;
+  double max_spread = -1.0;
+  for (int j = 0; j < dim_; j++) {
+    double min_value = std::numeric_limits<double>::infinity();
+    double max_value = -std::numeric_limits<double>::infinity();
+    for (int i = begin; i < end; i++) {
+      min_value = std::fmin(min_value, points_[kd_tree_indexes_[i]][j]);
+      max_value = std::fmax(max_value, points_[kd_tree_indexes_[i]][j]);
+    }
+    if (max_value - min_value > max_spread) {
+      max_spread = max_value - min_value;
+      split_dim = j;
+    }
+  }
+
+  const int middle = begin + (end - begin) / 2;
+  std::nth_element(kd_tree_indexes_.begin() + begin, kd_tree_indexes_.begin() + middle,
+                   kd_tree_indexes_.begin() + end, [this, split_dim](int lhs, int rhs) {
+                     return points_[lhs][split_dim] < points_[rhs][split_dim];
+                   });
+  kd_tree_split_dims_[middle] = split_dim;
+  BuildKdTreeNode(begin, middle);
+  BuildKdTreeNode(middle + 1, end);
+}
+
+void FiniteDomain::SearchKdTreeNode(int begin, int end, const Point& point, int k,
+                                    std::priority_queue<std::pair<double, int>> * heap) const {
+  if (begin >= end) {
+    return;
+  }
+  const int middle = begin + (end - begin) / 2;
+  const int index = kd_tree_indexes_[middle];
+  // The heap is a max-heap on (distance, index): its top is the worst neighbour kept so far
+  const std::pair<double, int> candidate(ComputeDistance(points_[index], point), index);
+  if (static_cast<int>(heap->size()) < k) {
+    heap->push(candidate);
+  } else if (candidate < heap->top()) {
+    heap->pop();
+    heap->push(candidate);
+  }
+
+  if (end - begin == 1) {
+    return;
+  }
+  const int split_dim = kd_tree_split_dims_[middle];
+  const double offset = point[split_dim] - points_[index][split_dim];
+  // Lower bound on the distance to the far side; shrunk by a few ulps so that rounding in
+  // ComputeDistance() never prunes a tie that the full sort would have kept
+  const double far_side_distance = std::fabs(offset) * (1.0 - 4.0 * std::numeric_limits<double>::epsilon());
+  // Visit first the side containing the query point, then the other one only if it may hold closer points
+  if (offset < 0.0) {
+    SearchKdTreeNode(begin, middle, point, k, heap);
+    if (static_cast<int>(heap->size()) < k || far_side_distance <= heap->top().first) {
+      SearchKdTreeNode(middle + 1, end, point, k, heap);
+    }
+  } else {
+    SearchKdTreeNode(middle + 1, end, point, k, heap);
+    if (static_cast<int>(heap->size()) < k || far_side_distance <= heap->top().first) {
+      SearchKdTreeNode(begin, middle, point, k, heap);
+    }
+  }
+}
+
+void FiniteDomain::FindKNearestPoints(const Point& point, int k, std::vector<std::pair<double, int>> * nearest) const {
+  k = std::max(0, std::min(k, n_points_));
+  std::priority_queue<std::pair<double, int>> heap;
+  SearchKdTreeNode(0, n_points_, point, k, &heap);
+
+  nearest->resize(heap.size());
+  for (int i = static_cast<int>(heap.size()) - 1; i >= 0; i--) {
+    (*nearest)[i] = heap.top();
+    heap.pop();
+  }
 }
 
 boost::python::list FiniteDomain::GetData() const
@@ -385,6 +489,53 @@ boost::python::list FiniteDomain::FindDistancesAndIndexesFromPoint(const boost::
   return output;
 }
 
+boost::python::list FiniteDomain::FindKNearestDistancesAndIndexesFromPoint(const boost::python::list& py_point,
+                                                                           int k) const
+{
+  Point point;
+  CopyPylistToVector(py_point, dim_, point);
+  std::vector<std::pair<double, int>> nearest;
+  FindKNearestPoints(point, k, &nearest);
+  boost::python::list py_distances, py_indexes;
+  for (const auto& current_pair : nearest) {
+    py_distances.append(current_pair.first);
+    py_indexes.append(current_pair.second);
+  }
+  boost::python::list output;
+  output.append(py_distances);
+  output.append(py_indexes);
+  return output;
+}
+
+boost::python::list FiniteDomain::FindKNearestDistancesAndIndexesFromPoints(const boost::python::list& py_points,
+                                                                            int k, int max_num_threads) const
+{
+  const int n_queries = boost::python::len(py_points) / dim_;
+  std::vector<double> flat_points;
+  CopyPylistToVector(py_points, n_queries * dim_, flat_points);
+  std::vector<std::vector<std::pair<double, int>>> nearest(n_queries);
+  if (in_forked_child) {
+    max_num_threads = 1;
+  }
+  // Python objects are only touched outside of the parallel region
+#pragma omp parallel for num_threads(max_num_threads) schedule(static) if (n_queries > 1)
+  for (int i = 0; i < n_queries; i++) {
+    const Point point(flat_points.begin() + i * dim_, flat_points.begin() + (i + 1) * dim_);
+    FindKNearestPoints(point, k, &nearest[i]);
+  }
+  boost::python::list py_distances, py_indexes;
+  for (int i = 0; i < n_queries; i++) {
+    for (const auto& current_pair : nearest[i]) {
+      py_distances.append(current_pair.first);
+      py_indexes.append(current_pair.second);
+    }
+  }
+  boost::python::list output;
+  output.append(py_distances);
+  output.append(py_indexes);
+  return output;
+}
+
 boost::python::list FiniteDomain::SamplePointsInDomain(int sample_size,
                                                        bool allow_multiple_selection) {
   boost::python::list output;
@@ -432,6 +583,8 @@ void ExportFiniteDomain() {
       .def("set_data", &FiniteDomain::SetData)
       .def("get_data", &FiniteDomain::GetData)
       .def("find_distances_and_indexes_from_point", &FiniteDomain::FindDistancesAndIndexesFromPoint)
+      .def("find_k_nearest_distances_and_indexes_from_point", &FiniteDomain::FindKNearestDistancesAndIndexesFromPoint)
+      .def("find_k_nearest_distances_and_indexes_from_points", &FiniteDomain::FindKNearestDistancesAndIndexesFromPoints)
       .def("sample_points_in_domain", &FiniteDomain::SamplePointsInDomain)
       .def("print", &FiniteDomain::Print)
       ;
@@ -23,7 +23,9 @@
 #include <vector>
 #include <random>
 #include <map>
+#include <queue>
 #include <set>
+#include <utility>
 #include "gpp_common.hpp"
 #include "gpp_exception.hpp"
 #include "gpp_geometry.hpp"
@@ -454,6 +456,53 @@ class FiniteDomain {
   \endrst*/
   boost::python::list FindDistancesAndIndexesFromPoint(const boost::python::list& py_point) const;
 
+  /*!\rst
+    Find the ``k`` points of the domain closest to ``point``.
+
+    The search runs on the k-d tree built in SetData(), so it visits only
+    the subtrees that can still contain one of the ``k`` nearest points.
+    Ties are broken by index, so the output matches the first ``k`` entries
+    of FindDistancesAndIndexesFromPoint().
+
+    \param
+      :point[dim]: the query point
+      :k: number of neighbours to return (clamped to the number of points)
+    \output
+      :nearest[k]: (distance, index) pairs ordered from closest to furthest
+  \endrst*/
+  void FindKNearestPoints(const Point& point, int k, std::vector<std::pair<double, int>> * nearest) const OL_NONNULL_POINTERS;
+
+  /*!\rst
+    Return the distances and indexes of the ``k`` points closest to the given point.
+
+    \param
+      :py_point: python list of float (double) with the coordinates of the query point
+      :k: number of neighbours to return
+    \return
+      :list: a python list of two lists of length ``k``, the first one containing the distances,
+      the second one containing the index of the points, both ordered
+      from closest to furthest
+  \endrst*/
+  boost::python::list FindKNearestDistancesAndIndexesFromPoint(const boost::python::list& py_point, int k) const;
+
+  /*!\rst
+    Batch version of FindKNearestDistancesAndIndexesFromPoint().
+
+    Queries are independent, so they are spread over ``max_num_threads`` OpenMP threads.
+    In a process forked after loading this module, a single thread is used instead.
+
+    \param
+      :py_points: flat python list of ``n_queries * dim`` float (double), the query points
+      :k: number of neighbours to return for each query
+      :max_num_threads: maximum number of threads for use by OpenMP
+    \return
+      :list: a python list of two flat lists of length ``n_queries * k``, the first one containing
+      the distances, the second one containing the indexes; the ``i``-th block of ``k`` entries
+      refers to the ``i``-th query, ordered from closest to furthest
+  \endrst*/
+  boost::python::list FindKNearestDistancesAndIndexesFromPoints(const boost::python::list& py_points, int k,
+                                                                int max_num_threads) const;
+
 // WIP
 //  bool GenerateLatinHypercubePoints(int sample_size, np::ndarray * output)
 
@@ -462,6 +511,27 @@ class FiniteDomain {
   \endrst*/
   void Print() const;
  private:
+  /*!\rst
+    Build the k-d tree over ``points_``.
+
+    The tree is stored implicitly: each node owns a range of ``kd_tree_indexes_``,
+    its splitting point sits at the middle of the range and the two halves are its children.
+  \endrst*/
+  void BuildKdTree();
+
+  /*!\rst
+    Recursively arrange ``kd_tree_indexes_[begin, end)`` as a k-d tree node, splitting
+    along the dimension with the largest spread.
+  \endrst*/
+  void BuildKdTreeNode(int begin, int end);
+
+  /*!\rst
+    Recursively visit the node owning ``kd_tree_indexes_[begin, end)``, keeping in ``heap``
+    the ``k`` closest (distance, index) pairs found so far.
+  \endrst*/
+  void SearchKdTreeNode(int begin, int end, const Point& point, int k,
+                        std::priority_queue<std::pair<double, int>> * heap) const OL_NONNULL_POINTERS;
+
   std::vector<Point> points_; //! the list of Points included in the domain
   int n_points_;  //! the number of points
   int dim_ ;     //! the number of spatial dimensions of the domain
@@ -470,6 +540,8 @@ class FiniteDomain {
   std::vector<std::map<double,std::set<int>>> finite_latin_hypercube_;
   std::default_random_engine random_engine_; //! a random engine
   std::uniform_int_distribution<int> uniform_distribution_; //! a uniform distribution
+  std::vector<int> kd_tree_indexes_;  //! point indexes laid out as an implicit k-d tree
+  std::vector<int> kd_tree_split_dims_;  //! splitting dimension of the node whose splitting point is at the same position
 };
 
 /*!\rst
@@ -34,7 +34,8 @@ GaussianProcessMCMC::GaussianProcessMCMC(double const * restrict hypers_mcmc,
       points_sampled_(points_sampled_in, points_sampled_in + num_sampled_in*dim_in),
       points_sampled_value_(points_sampled_value_in, points_sampled_value_in + num_sampled_in*(num_derivatives_in+1)),
       derivatives_(derivatives_in, derivatives_in + num_derivatives_in),
-      num_derivatives_(num_derivatives_in) {
+      num_derivatives_(num_derivatives_in),
+      num_modifications_(0) {
   gaussian_process_lst.reserve(num_mcmc_);
   const double * hypers = hypers_mcmc;
   const double * noises = noises_mcmc;
@@ -48,6 +49,41 @@ GaussianProcessMCMC::GaussianProcessMCMC(double const * restrict hypers_mcmc,
   }
 }
 
+void GaussianProcessMCMC::SetHyperparameters(double const * restrict hypers_mcmc,
+                                             double const * restrict noises_mcmc, int num_mcmc) {
+  while (static_cast<int>(gaussian_process_lst.size()) > num_mcmc) {
+    gaussian_process_lst.pop_back();
+  }
+  const double * hypers = hypers_mcmc;
+  const double * noises = noises_mcmc;
+  for (int i=0; i<num_mcmc; ++i) {
+    if (i < num_mcmc_) {
+      gaussian_process_lst[i].SetCovarianceHyperparametersAndNoiseVariance(hypers, noises);
+    } else {
+      MaternNu2p5 sqexp(dim_, hypers[0], hypers+1);
+      gaussian_process_lst.emplace_back(sqexp, points_sampled_.data(), points_sampled_value_.data(),
+                                        noises, derivatives_.data(), num_derivatives_,
+                                        dim_, num_sampled_);
+    }
+    hypers += dim_+1;
+    noises += num_derivatives_+1;
+  }
+  num_mcmc_ = num_mcmc;
+  ++num_modifications_;
+}
+
+void GaussianProcessMCMC::AddSampledPoints(double const * restrict new_points,
+                                           double const * restrict new_points_value, int num_new_points) {
+  points_sampled_.insert(points_sampled_.end(), new_points, new_points + num_new_points*dim_);
+  points_sampled_value_.insert(points_sampled_value_.end(), new_points_value,
+                               new_points_value + num_new_points*(num_derivatives_+1));
+  num_sampled_ += num_new_points;
+  for (auto& gaussian_process : gaussian_process_lst) {
+    gaussian_process.AddPointsToGP(new_points, new_points_value, num_new_points);
+  }
+  ++num_modifications_;
+}
+
 template <typename DomainType>
 KnowledgeGradientMCMCEvaluator<DomainType>::KnowledgeGradientMCMCEvaluator(const GaussianProcessMCMC& gaussian_process_mcmc, const int num_fidelity,
                                                                            double const * discrete_pts_lst,
@@ -159,8 +195,10 @@ double KnowledgeGradientMCMCEvaluator<DomainType>::ComputeKnowledgeGradient(Stat
   .. Note:: comments here are copied to _compute_grad_knowledge_gradient_monte_carlo() in python_version/knowledge_gradient.py
 \endrst*/
 template <typename DomainType>
-void KnowledgeGradientMCMCEvaluator<DomainType>::ComputeGradKnowledgeGradient(StateType * kg_state, double * restrict grad_KG) const {
+double KnowledgeGradientMCMCEvaluator<DomainType>::ComputeGradKnowledgeGradient(StateType * kg_state, double * restrict grad_KG) const {
   double KG = 0.0;
+  // grad_KG may hold a previous gradient (e.g., when an optimizer reuses its buffer)
+  std::fill(grad_KG, grad_KG + kg_state->num_to_sample*dim_, 0.0);
   for (int i=0; i<num_mcmc_hypers_; ++i){
     std::vector<double> temp(kg_state->dim*kg_state->num_to_sample, 0.0);
     KG += (*knowledge_gradient_evaluator_lst)[i].ComputeGradKnowledgeGradient((*(kg_state->kg_state_list)).data()+i, temp.data());
@@ -177,6 +215,7 @@ void KnowledgeGradientMCMCEvaluator<DomainType>::ComputeGradKnowledgeGradient(St
     grad_KG[k] = grad_KG[k]/static_cast<double>(num_mcmc_hypers_);
     grad_KG[k] = (grad_KG[k]*cost - KG*kg_state->gradcost[k])/Square(cost);
   }
+  return KG/cost;
 }
 
 template class KnowledgeGradientMCMCEvaluator<TensorProductDomain>;
@@ -186,7 +225,7 @@ template <typename DomainType>
 void KnowledgeGradientMCMCState<DomainType>::SetCurrentPoint(const EvaluatorType& kg_evaluator,
                                                              double const * restrict points_to_sample_in) {
   // update current point in union_of_points
-  std::copy(points_to_sample_in, points_to_sample_in + dim, union_of_points.data());
+  std::copy(points_to_sample_in, points_to_sample_in + num_to_sample*dim, union_of_points.data());
 
   // evaluate derived quantities for the GP
   for (int i=0; i<kg_evaluator.num_mcmc();++i){
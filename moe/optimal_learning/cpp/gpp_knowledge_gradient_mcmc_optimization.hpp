@@ -174,6 +174,37 @@ struct GaussianProcessMCMC final {
       return derivatives_;
     }
 
+    /*!\rst
+      Number of calls to SetHyperparameters() and AddSampledPoints() so far. Objects that precompute quantities from
+      the GPs (e.g., a KnowledgeGradientMCMCEvaluator) record it to detect that they are out of date.
+    \endrst*/
+    int num_modifications() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+      return num_modifications_;
+    }
+
+    /*!\rst
+      Replace the hyperparameter samples, keeping the sampled points. GPs that already exist are updated in place
+      (they keep their RNG), the data is not copied again.
+
+      \param
+        :hypers_mcmc[dim+1][num_mcmc]: covariance hyperparameters of each sample
+        :noises_mcmc[num_derivatives+1][num_mcmc]: noise variance of each sample
+        :num_mcmc: number of samples, may differ from the current one
+    \endrst*/
+    void SetHyperparameters(double const * restrict hypers_mcmc, double const * restrict noises_mcmc,
+                            int num_mcmc) OL_NONNULL_POINTERS;
+
+    /*!\rst
+      Add the specified historical data to every GP of the sample.
+
+      \param
+        :new_points[dim][num_new_points]: coordinates of each new point to add
+        :new_points_value[num_derivatives+1][num_new_points]: function value (and derivatives) at each new point
+        :num_new_points: number of new points to add
+    \endrst*/
+    void AddSampledPoints(double const * restrict new_points, double const * restrict new_points_value,
+                          int num_new_points) OL_NONNULL_POINTERS;
+
     std::vector<GaussianProcess> gaussian_process_lst;
 
  private:
@@ -195,6 +226,9 @@ struct GaussianProcessMCMC final {
   std::vector<int> derivatives_;
   //! number of derivatives observations
   int num_derivatives_;
+
+  //! number of calls to SetHyperparameters() and AddSampledPoints()
+  int num_modifications_;
 };
 
 template <typename DomainType>
@@ -313,8 +347,10 @@ class KnowledgeGradientMCMCEvaluator final {
       :grad_KG[dim][num_to_sample]: gradient of KG, ``\pderiv{KG(Xq \cup Xp)}{Xq_{d,i}}`` where ``Xq`` is ``points_to_sample``
       and ``Xp`` is ``points_being_sampled`` (grad KG from sampling ``points_to_sample`` with
       ``points_being_sampled`` concurrent experiments wrt each dimension of the points in ``points_to_sample``)
+    \return
+      the knowledge gradient, as computed by ComputeKnowledgeGradient(), from the same Monte Carlo pass
   \endrst*/
-  void ComputeGradKnowledgeGradient(StateType * kg_state, double * restrict grad_KG) const OL_NONNULL_POINTERS;
+  double ComputeGradKnowledgeGradient(StateType * kg_state, double * restrict grad_KG) const OL_NONNULL_POINTERS;
 
   OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(KnowledgeGradientMCMCEvaluator);
 
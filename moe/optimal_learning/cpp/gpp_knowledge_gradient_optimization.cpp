@@ -41,7 +41,18 @@ KnowledgeGradientEvaluator<DomainType>::KnowledgeGradientEvaluator(const Gaussia
     domain_(domain),
     gaussian_process_(&gaussian_process_in),
     discrete_pts_(discrete_points(discrete_pts, num_pts)),
-    num_pts_(num_pts){
+    num_pts_(num_pts),
+    discrete_pts_covariance_(gaussian_process_in.num_sampled()*(gaussian_process_in.num_derivatives()+1)*num_pts) {
+  // the covariance with points_sampled does not depend on the points whose KG is computed: build it once
+  std::vector<double> full_discrete_pts(num_pts_*dim_, 1.0);
+  for (int i = 0; i < num_pts_; ++i) {
+    std::copy(discrete_pts_.data() + i*(dim_-num_fidelity_), discrete_pts_.data() + (i+1)*(dim_-num_fidelity_),
+              full_discrete_pts.data() + i*dim_);
+  }
+  BuildMixCovarianceMatrix(*gaussian_process_->covariance_ptr_, gaussian_process_->points_sampled().data(),
+                           full_discrete_pts.data(), dim_, gaussian_process_->num_sampled(), num_pts_,
+                           gaussian_process_->derivatives().data(), gaussian_process_->num_derivatives(),
+                           nullptr, 0, discrete_pts_covariance_.data());
 }
 
 template <typename DomainType>
@@ -57,7 +68,22 @@ KnowledgeGradientEvaluator<DomainType>::KnowledgeGradientEvaluator(KnowledgeGrad
     domain_(other.domain()),
     gaussian_process_(other.gaussian_process()),
     discrete_pts_(other.discrete_pts_copy()),
-    num_pts_(other.number_discrete_pts()){
+    num_pts_(other.number_discrete_pts()),
+    discrete_pts_covariance_(other.discrete_pts_covariance()) {
+}
+
+template <typename DomainType>
+int KnowledgeGradientEvaluator<DomainType>::ComputeBestDiscretizedPoint(const GaussianProcess& gaussian_process_after,
+                                                                        StateType * kg_state) const {
+  const int num_rows = gaussian_process_after.num_sampled()*(gaussian_process_after.num_derivatives()+1);
+  const int num_discretized = kg_state->num_union + num_pts_;
+
+  // posterior mean: ``mus = mean + Ks^T * K^-1 * y``, with Ks precomputed by the state
+  std::fill(kg_state->discretized_set_mean.begin(), kg_state->discretized_set_mean.end(), gaussian_process_after.get_mean());
+  GeneralMatrixVectorMultiply(kg_state->discretized_set_covariance.data(), 'T', gaussian_process_after.get_K_inv_y().data(),
+                              1.0, 1.0, num_rows, num_discretized, num_rows, kg_state->discretized_set_mean.data());
+  return std::min_element(kg_state->discretized_set_mean.begin(), kg_state->discretized_set_mean.end()) -
+      kg_state->discretized_set_mean.begin();
 }
 
 /*!\rst
@@ -106,8 +132,10 @@ double KnowledgeGradientEvaluator<DomainType>::ComputeKnowledgeGradient(StateTyp
 
     gaussian_process_after.NewSampledValue(make_up_function_value.data(), num_union, gaussian_process_->num_sampled(), false);
 
-    ComputeOptimalPosteriorMean(gaussian_process_after, num_fidelity_, optimizer_parameters_,
-                                domain_, kg_state->discretized_set.data(), num_union + num_pts_,
+    // the posterior mean optimization starts from the best point of the discretized set
+    const int best_start = ComputeBestDiscretizedPoint(gaussian_process_after, kg_state);
+    ComputeOptimalPosteriorMean(gaussian_process_after, num_fidelity_, optimizer_parameters_, domain_,
+                                kg_state->discretized_set.data() + best_start*(dim_-num_fidelity_), 1,
                                 &found_flag, kg_state->best_point.data() + i*dim_, &best_function_value);
     aggregate += best_posterior + best_function_value;
   }
@@ -189,8 +217,10 @@ double KnowledgeGradientEvaluator<DomainType>::ComputeGradKnowledgeGradient(Stat
 
     gaussian_process_after.NewSampledValue(make_up_function_value.data(), num_union, gaussian_process_->num_sampled(), false);
 
-    ComputeOptimalPosteriorMean(gaussian_process_after, num_fidelity_, optimizer_parameters_,
-                                domain_, kg_state->discretized_set.data(), num_union + num_pts_,
+    // the posterior mean optimization starts from the best point of the discretized set
+    const int best_start = ComputeBestDiscretizedPoint(gaussian_process_after, kg_state);
+    ComputeOptimalPosteriorMean(gaussian_process_after, num_fidelity_, optimizer_parameters_, domain_,
+                                kg_state->discretized_set.data() + best_start*(dim_-num_fidelity_), 1,
                                 &found_flag, kg_state->best_point.data() + i*dim_, &best_function_value);
     aggregate += best_posterior + best_function_value;
   }  // end for i: num_mc_iterations_
@@ -235,6 +265,10 @@ void KnowledgeGradientState<DomainType>::SetCurrentPoint(const EvaluatorType& kg
   // update points_to_sample in union_of_points
   std::copy(points_to_sample, points_to_sample + num_to_sample*dim, union_of_points.data());
 
+  // the discretized set starts with the (fidelity-free) union_of_points
+  subset_union_of_points = SubsetData(union_of_points.data(), num_union, kg_evaluator.num_fidelity());
+  std::copy(subset_union_of_points.begin(), subset_union_of_points.end(), discretized_set.begin());
+
   // evaluate derived quantities for the GP
   points_to_sample_state.SetupState(*kg_evaluator.gaussian_process(), union_of_points.data(),
                                     num_union, num_gradients_to_sample, num_derivatives, true, (num_derivatives>0));
@@ -259,6 +293,8 @@ KnowledgeGradientState<DomainType>::KnowledgeGradientState(const EvaluatorType&
     subset_union_of_points(SubsetData(union_of_points.data(), num_union, kg_evaluator.num_fidelity())),
     discretized_set(BuildUnionOfPoints(subset_union_of_points.data(), kg_evaluator.discrete_pts_copy().data(),
                                        num_union, kg_evaluator.number_discrete_pts(), dim - kg_evaluator.num_fidelity())),
+    discretized_set_covariance((kg_evaluator.gaussian_process()->num_sampled() + num_union)*
+                               (kg_evaluator.gaussian_process()->num_derivatives()+1)*(num_union + kg_evaluator.number_discrete_pts())),
     points_to_sample_state(*kg_evaluator.gaussian_process(), union_of_points.data(), num_union,
                            gradients_in, num_gradients_in, num_derivatives, true, configure_for_gradients),
     normal_rng(normal_rng_in),
@@ -270,7 +306,8 @@ KnowledgeGradientState<DomainType>::KnowledgeGradientState(const EvaluatorType&
     normals(num_union*(1+num_gradients_to_sample)*num_iterations),
     best_point(dim*num_iterations),
     chol_inverse_cov(num_iterations*num_union*(1+num_gradients_to_sample)),
-    grad_chol_inverse_cov(dim*num_iterations*num_union*(1+num_gradients_to_sample)*num_derivatives) {
+    grad_chol_inverse_cov(dim*num_iterations*num_union*(1+num_gradients_to_sample)*num_derivatives),
+    discretized_set_mean(num_union + kg_evaluator.number_discrete_pts()) {
   PreCompute(kg_evaluator, points_to_sample);
 }
 
@@ -314,6 +351,43 @@ void KnowledgeGradientState<DomainType>::PreCompute(const EvaluatorType& kg_eval
     cholesky_to_sample_var.data(), num_union*(1+num_gradients_to_sample), leading_minor_index);
   }
   ZeroUpperTriangle(num_union*(1+num_gradients_to_sample), cholesky_to_sample_var.data());
+
+  // covariance of the discretized set with the points sampled by the GP conditioned on union_of_points;
+  // the block of the evaluator's points_sampled and discrete_pts is precomputed
+  const GaussianProcess& gaussian_process = *kg_evaluator.gaussian_process();
+  const int num_pts = kg_evaluator.number_discrete_pts();
+  const int num_discretized = num_union + num_pts;
+  const int num_rows_sampled = gaussian_process.num_sampled()*(gaussian_process.num_derivatives()+1);
+  const int num_rows_union = num_union*(gaussian_process.num_derivatives()+1);
+  const int num_rows = num_rows_sampled + num_rows_union;
+  const int subset_dim = dim - kg_evaluator.num_fidelity();
+  std::vector<double> full_discretized_set(num_discretized*dim, 1.0);
+  for (int i = 0; i < num_discretized; ++i) {
+    std::copy(discretized_set.data() + i*subset_dim, discretized_set.data() + (i+1)*subset_dim,
+              full_discretized_set.data() + i*dim);
+  }
+  std::vector<double> sampled_covariance(num_rows_sampled*num_union);
+  BuildMixCovarianceMatrix(*gaussian_process.covariance_ptr_, gaussian_process.points_sampled().data(),
+                           full_discretized_set.data(), dim, gaussian_process.num_sampled(), num_union,
+                           gaussian_process.derivatives().data(), gaussian_process.num_derivatives(),
+                           nullptr, 0, sampled_covariance.data());
+  std::vector<double> union_covariance(num_rows_union*num_discretized);
+  BuildMixCovarianceMatrix(*gaussian_process.covariance_ptr_, union_of_points.data(),
+                           full_discretized_set.data(), dim, num_union, num_discretized,
+                           gaussian_process.derivatives().data(), gaussian_process.num_derivatives(),
+                           nullptr, 0, union_covariance.data());
+  double const * restrict discrete_pts_covariance = kg_evaluator.discrete_pts_covariance().data();
+  for (int j = 0; j < num_discretized; ++j) {
+    double * restrict column = discretized_set_covariance.data() + j*num_rows;
+    if (j < num_union) {
+      std::copy(sampled_covariance.data() + j*num_rows_sampled, sampled_covariance.data() + (j+1)*num_rows_sampled, column);
+    } else {
+      std::copy(discrete_pts_covariance + (j-num_union)*num_rows_sampled,
+                discrete_pts_covariance + (j-num_union+1)*num_rows_sampled, column);
+    }
+    std::copy(union_covariance.data() + j*num_rows_union, union_covariance.data() + (j+1)*num_rows_union,
+              column + num_rows_sampled);
+  }
 }
 
 template struct KnowledgeGradientState<TensorProductDomain>;
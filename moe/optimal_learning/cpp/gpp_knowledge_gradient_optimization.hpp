@@ -219,6 +219,10 @@ class KnowledgeGradientEvaluator final {
     return gaussian_process_;
   }
 
+  const std::vector<double>& discrete_pts_covariance() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return discrete_pts_covariance_;
+  }
+
   /*!\rst
     Wrapper for ComputeKnowledgeGradient(); see that function for details.
   \endrst*/
@@ -264,6 +268,20 @@ class KnowledgeGradientEvaluator final {
   OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(KnowledgeGradientEvaluator);
 
  private:
+  /*!\rst
+    Finds the point of ``kg_state->discretized_set`` with the smallest posterior mean under ``gaussian_process_after``
+    (the GP conditioned on ``union_of_points``), from the covariance precomputed in the state.
+
+    \param
+      :gaussian_process_after: the GP with ``union_of_points`` appended to its sampled points
+      :kg_state[1]: properly configured state object
+    \output
+      :kg_state[1]: state with ``discretized_set_mean`` modified
+    \return
+      index of the best point in ``discretized_set``; ties go to the first point
+  \endrst*/
+  int ComputeBestDiscretizedPoint(const GaussianProcess& gaussian_process_after, StateType * kg_state) const OL_NONNULL_POINTERS;
+
   //! spatial dimension (e.g., entries per point of points_sampled)
   const int dim_;
   //! dim of the fidelity
@@ -284,6 +302,8 @@ class KnowledgeGradientEvaluator final {
   std::vector<double> discrete_pts_;
   //! number of points in discrete_pts
   const int num_pts_;
+  //! covariance between ``points_sampled`` and discrete_pts (fidelities set to 1.0), as built by BuildMixCovarianceMatrix()
+  std::vector<double> discrete_pts_covariance_;
 };
 
 extern template class KnowledgeGradientEvaluator<TensorProductDomain>;
@@ -447,6 +467,9 @@ struct KnowledgeGradientState final {
   //! discretized set in KG computation
   std::vector<double> subset_union_of_points;
   std::vector<double> discretized_set;
+  //! covariance between the points sampled by the GP conditioned on union_of_points (``points_sampled`` followed by
+  //! union_of_points) and discretized_set (fidelities set to 1.0)
+  std::vector<double> discretized_set_covariance;
 
   //! gaussian process state
   GaussianProcess::StateType points_to_sample_state;
@@ -475,6 +498,8 @@ struct KnowledgeGradientState final {
   std::vector<double> chol_inverse_cov;
   //! grad_chol_inverse_cov
   std::vector<double> grad_chol_inverse_cov;
+  //! the mean of the GP conditioned on union_of_points, evaluated at discretized_set
+  std::vector<double> discretized_set_mean;
 
   OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(KnowledgeGradientState);
 };
@@ -550,6 +550,66 @@ void GaussianProcess::RecomputeMeanVariables(bool mean_change /* = true*/) {
   CholeskyFactorLMatrixVectorSolve(K_chol_.data(), num_sampled_*(num_derivatives_+1), K_inv_y_.data());
 }
 
+/*!\rst
+  Extends the cholesky factor of ``K`` to the last ``num_new_points`` points of ``points_sampled_``, which is
+  otherwise unchanged since the last factorization. With ``K = [K_11, K_12; K_21, K_22]``, where ``K_11`` is
+  the covariance of the old points, the factor is ``L = [L_11, 0; L_21, L_22]`` with ``L_21^T = L_11^-1 * K_12``
+  and ``L_22 = chol(K_22 - L_21 * L_21^T)``. This costs ``O(N^2 * k)`` instead of ``O((N + k)^3)``.
+
+  Falls back to RecomputeCholeskyVariables() (which throws if ``K`` is singular) if the new block
+  is not numerically positive definite.
+\endrst*/
+void GaussianProcess::UpdateCholeskyVariables(int num_new_points) {
+  const int num_sampled_old = num_sampled_ - num_new_points;
+  const int size_old = num_sampled_old*(num_derivatives_+1);
+  const int size_new = num_new_points*(num_derivatives_+1);
+  const int size = size_old + size_new;
+  if (unlikely(num_sampled_old == 0 || static_cast<int>(K_chol_.size()) != Square(size_old))) {
+    RecomputeCholeskyVariables();
+    return;
+  }
+
+  double const * restrict new_points = points_sampled_.data() + num_sampled_old*dim_;
+  // L_21^T = L_11^-1 * K_12
+  std::vector<double> chol_cross(size_old*size_new);
+  optimal_learning::BuildMixCovarianceMatrix(*covariance_ptr_, points_sampled_.data(), new_points, dim_,
+                                             num_sampled_old, num_new_points, derivatives_.data(), num_derivatives_,
+                                             derivatives_.data(), num_derivatives_, chol_cross.data());
+  TriangularMatrixMatrixSolve(K_chol_.data(), 'N', size_old, size_new, size_old, chol_cross.data());
+
+  // L_22 = chol(K_22 - L_21 * L_21^T)
+  std::vector<double> chol_new(Square(size_new));
+  optimal_learning::BuildCovarianceMatrixWithNoiseVariance(*covariance_ptr_, noise_variance_.data(), new_points, dim_,
+                                                           num_new_points, derivatives_.data(), num_derivatives_,
+                                                           chol_new.data());
+  GeneralMatrixMatrixMultiply(chol_cross.data(), 'T', chol_cross.data(), -1.0, 1.0, size_new, size_old, size_new,
+                              chol_new.data());
+  int leading_minor_index = ComputeCholeskyFactorL(size_new, chol_new.data());
+  if (unlikely(leading_minor_index != 0)) {
+    // the update lost too much precision (or K is singular): factor K from scratch
+    RecomputeCholeskyVariables();
+    return;
+  }
+
+  // the leading dimension grows from size_old to size: move the columns of L_11, last one first
+  K_chol_.resize(Square(size));
+  for (int j = size_old - 1; j > 0; --j) {
+    std::copy_backward(K_chol_.begin() + j*size_old, K_chol_.begin() + (j+1)*size_old, K_chol_.begin() + j*size + size_old);
+  }
+  for (int j = 0; j < size_old; ++j) {
+    for (int i = 0; i < size_new; ++i) {
+      K_chol_[size_old + i + j*size] = chol_cross[j + i*size_old];
+    }
+  }
+  for (int j = 0; j < size_new; ++j) {
+    std::fill(K_chol_.begin() + (size_old + j)*size, K_chol_.begin() + (size_old + j)*size + size_old, 0.0);
+    std::copy(chol_new.begin() + j*size_new, chol_new.begin() + (j+1)*size_new,
+              K_chol_.begin() + (size_old + j)*size + size_old);
+  }
+
+  K_inv_y_.resize(size);
+}
+
 GaussianProcess::GaussianProcess(const CovarianceInterface& covariance_in,
                                  double const * restrict points_sampled_in,
                                  double const * restrict points_sampled_value_in,
@@ -1711,10 +1771,9 @@ void GaussianProcess::AddPointsToGP(double const * restrict new_points,
   points_sampled_value_.resize(num_sampled_*(num_derivatives_+1));
   std::copy_backward(new_points_value, new_points_value + num_new_points*(num_derivatives_+1), points_sampled_value_.end());
 
-  // recompute derived quantities
-  // TODO(GH-192): Insert the new covariance (and cholesky covariance) rows into the current matrix  (O(N^2))
-  // instead of recomputing everything (O(N^3)).
-  RecomputeDerivedVariables(mean_change);
+  // extend the cholesky factor with the new rows (O(N^2)) instead of recomputing everything (O(N^3))
+  UpdateCholeskyVariables(num_new_points);
+  RecomputeMeanVariables(mean_change);
 }
 
 void GaussianProcess::AddSampledPointsToGP(double const * restrict new_points,
@@ -1730,10 +1789,8 @@ void GaussianProcess::AddSampledPointsToGP(double const * restrict new_points,
   points_sampled_value_.resize(num_sampled_*(num_derivatives_+1));
   std::copy_backward(new_points_value, new_points_value + num_new_points*(num_derivatives_+1), points_sampled_value_.end());
 
-  // recompute derived quantities
-  // TODO(GH-192): Insert the new covariance (and cholesky covariance) rows into the current matrix  (O(N^2))
-  // instead of recomputing everything (O(N^3)).
-  RecomputeCholeskyVariables();
+  // extend the cholesky factor with the new rows (O(N^2)) instead of recomputing everything (O(N^3))
+  UpdateCholeskyVariables(num_new_points);
 }
 
 void GaussianProcess::NewSampledValue(double const * restrict new_points_value,
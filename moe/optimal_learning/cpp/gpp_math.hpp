@@ -366,6 +366,25 @@ class GaussianProcess final {
     RecomputeDerivedVariables();
   }
 
+  /*!\rst
+    Change the hyperparameters of this GP's covariance function and its noise variance at once.
+    Forces a single recomputation of all derived quantities for GP to remain consistent.
+
+    .. WARNING::
+         Using this function invalidates any PointsToSampleState objects created with "this" object.
+         For any such objects "state", call state.SetupState(...) to restore them.
+
+    \param
+      :hyperparameters_new[covariance_ptr->GetNumberOfHyperparameters]: new hyperparameter array
+      :noise_variance_new[num_derivatives+1]: new noise variance of the function values and of each derivative
+  \endrst*/
+  void SetCovarianceHyperparametersAndNoiseVariance(double const * restrict hyperparameters_new,
+                                                    double const * restrict noise_variance_new) OL_NONNULL_POINTERS {
+    covariance_ptr_->SetHyperparameters(hyperparameters_new);
+    std::copy(noise_variance_new, noise_variance_new + num_derivatives_ + 1, noise_variance_.begin());
+    RecomputeDerivedVariables();
+  }
+
   /*!\rst
     Sets up the PointsToSampleState object so that it can be used to compute GP mean, variance, and gradients thereof.
     ASSUMES all needed space is ALREADY ALLOCATED.
@@ -382,7 +401,7 @@ class GaussianProcess final {
   /*!\rst
     Add the specified (point, fcn value, noise variance) historical data to this GP.
 
-    Forces recomputation of all derived quantities for GP to remain consistent.
+    Extends the cholesky factor of ``K`` with the new points and recomputes ``K^-1 * y``, so the GP remains consistent.
 
     \param
       :new_points[dim][num_new_points]: coordinates of each new point to add
@@ -833,6 +852,13 @@ class GaussianProcess final {
 
   void RecomputeCholeskyVariables();
 
+  /*!\rst
+    Extends the cholesky factor of ``K`` to the last ``num_new_points`` points of ``points_sampled_``,
+    refactoring ``K`` from scratch only if the update is not numerically stable.
+    ``K_inv_y_`` is resized but not recomputed.
+  \endrst*/
+  void UpdateCholeskyVariables(int num_new_points);
+
   void RecomputeMeanVariables(bool mean_change = true);
 
   // size information
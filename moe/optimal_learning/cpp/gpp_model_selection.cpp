@@ -357,6 +357,35 @@ OL_NONNULL_POINTERS void BuildCovarianceMatrixWithNoiseVariance(const Covariance
     delete [] cov_temp;
 }
 
+/*!\rst
+  Same as BuildCovarianceMatrixWithNoiseVariance() without derivative observations, but the points are only
+  seen through the squared differences of their coordinates.  These do not depend on the hyperparameters, so
+  each entry reduces to a weighted sum and an exp.
+
+  \param
+    :covariance: the CovarianceFunction object encoding assumptions about the GP's behavior on our data
+    :square_differences[dim][num_sampled*(num_sampled+1)/2]: ``(X_j - X_i)^2`` for each pair ``i <= j``, ordered by
+      ``j`` then ``i``
+    :dim: spatial dimension of a point
+    :num_sampled: number of points
+    :noise_variance: noise variance to add to each diagonal entry
+  \output
+    :cov_matrix[num_sampled][num_sampled]: computed covariance matrix (lower triangle)
+\endrst*/
+OL_NONNULL_POINTERS void BuildCovarianceMatrixFromSquareDifferences(const CovarianceInterface& covariance,
+                                                                    double const * restrict square_differences,
+                                                                    int dim, int num_sampled,
+                                                                    double noise_variance,
+                                                                    double * restrict cov_matrix) noexcept {
+  for (int j = 0; j < num_sampled; ++j) {  // row
+    for (int i = 0; i <= j; ++i) {  // col
+      cov_matrix[j + i*num_sampled] = covariance.CovarianceOfSquareDifferences(square_differences);
+      square_differences += dim;
+    }
+    cov_matrix[j + j*num_sampled] += noise_variance;
+  }
+}
+
 /*!\rst
   Build ``A_{jik} = \pderiv{K_{ij}}{\theta_k}``
 
@@ -518,10 +547,36 @@ LogMarginalLikelihoodEvaluator::LogMarginalLikelihoodEvaluator(double const * re
       derivatives_(derivatives_in, derivatives_in + num_derivatives_in),
       points_sampled_(points_sampled_in, points_sampled_in + num_sampled_in*dim_in),
       points_sampled_value_(points_sampled_value_in, points_sampled_value_in + (num_derivatives_in+1)*num_sampled_in) {
+  AppendSquareDifferences(0);
+}
+
+void LogMarginalLikelihoodEvaluator::AppendSquareDifferences(int first_new_point) {
+  square_differences_.reserve(num_sampled_*(num_sampled_+1)/2*dim_);
+  for (int j = first_new_point; j < num_sampled_; ++j) {
+    for (int i = 0; i <= j; ++i) {
+      for (int d = 0; d < dim_; ++d) {
+        square_differences_.push_back(Square(points_sampled_[j*dim_ + d] - points_sampled_[i*dim_ + d]));
+      }
+    }
+  }
+}
+
+void LogMarginalLikelihoodEvaluator::AddSampledPoints(double const * restrict new_points,
+                                                      double const * restrict new_points_value,
+                                                      int num_new_points) {
+  const int first_new_point = num_sampled_;
+  num_sampled_ += num_new_points;
+  points_sampled_.insert(points_sampled_.end(), new_points, new_points + num_new_points*dim_);
+  points_sampled_value_.insert(points_sampled_value_.end(), new_points_value,
+                               new_points_value + num_new_points*(num_derivatives_+1));
+  AppendSquareDifferences(first_new_point);
 }
 
 void LogMarginalLikelihoodEvaluator::BuildHyperparameterGradCovarianceMatrix(
     LogMarginalLikelihoodState * log_likelihood_state) const noexcept {
+  // allocated on first use: states that only evaluate the log likelihood never need this space
+  log_likelihood_state->grad_hyperparameter_cov_matrix.resize(
+      log_likelihood_state->num_hyperparameters*Square(num_sampled_*(num_derivatives_+1)));
   optimal_learning::BuildHyperparameterGradCovarianceMatrix(*log_likelihood_state->covariance_ptr,
                                                             points_sampled_.data(), dim_, num_sampled_,
                                                             log_likelihood_state->noise_variance.data(),
@@ -539,9 +594,15 @@ void LogMarginalLikelihoodEvaluator::BuildHyperparameterGradCovarianceMatrix(
 
 void LogMarginalLikelihoodEvaluator::FillLogLikelihoodState(LogMarginalLikelihoodState * log_likelihood_state) const {
   // K_chol
-  optimal_learning::BuildCovarianceMatrixWithNoiseVariance(*log_likelihood_state->covariance_ptr, points_sampled_.data(),
-                                                           dim_, num_sampled_, log_likelihood_state->noise_variance.data(),
-                                                           derivatives_.data(), num_derivatives_, log_likelihood_state->K_chol.data());
+  if (num_derivatives_ == 0) {
+    BuildCovarianceMatrixFromSquareDifferences(*log_likelihood_state->covariance_ptr, square_differences_.data(),
+                                               dim_, num_sampled_, log_likelihood_state->noise_variance[0],
+                                               log_likelihood_state->K_chol.data());
+  } else {
+    optimal_learning::BuildCovarianceMatrixWithNoiseVariance(*log_likelihood_state->covariance_ptr, points_sampled_.data(),
+                                                             dim_, num_sampled_, log_likelihood_state->noise_variance.data(),
+                                                             derivatives_.data(), num_derivatives_, log_likelihood_state->K_chol.data());
+  }
 
   // Adding the variance of measurement noise to the covariance matrix
   for (int i = 0; i < num_sampled_ * (1+num_derivatives_); i++){
@@ -819,7 +880,8 @@ void LogMarginalLikelihoodState::SetupState(const EvaluatorType& log_likelihood_
     K_chol.resize(Square(num_sampled*(num_derivatives+1)));
     K_inv_y.resize(num_sampled*(num_derivatives+1));
     y.resize(num_sampled*(num_derivatives+1));
-    grad_hyperparameter_cov_matrix.resize(num_hyperparameters*Square(num_sampled*(num_derivatives+1)));
+    // release the gradient space; BuildHyperparameterGradCovarianceMatrix() reallocates it if needed
+    std::vector<double>().swap(grad_hyperparameter_cov_matrix);
     temp_vec.resize(num_sampled*(num_derivatives+1));
   }
 
@@ -839,7 +901,7 @@ LogMarginalLikelihoodState::LogMarginalLikelihoodState(const EvaluatorType& log_
       K_chol(Square(num_sampled*(num_derivatives+1))),
       K_inv_y(num_sampled*(num_derivatives+1)),
       y(num_sampled*(num_derivatives+1)),
-      grad_hyperparameter_cov_matrix(num_hyperparameters*Square(num_sampled*(num_derivatives+1))),
+      grad_hyperparameter_cov_matrix(),
       temp_vec(num_sampled*(num_derivatives+1)) {
   std::vector<double> hyperparameters(num_hyperparameters);
   covariance_ptr->GetHyperparameters(hyperparameters.data());
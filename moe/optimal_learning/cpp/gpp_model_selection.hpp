@@ -294,6 +294,19 @@ class LogMarginalLikelihoodEvaluator final {
     return num_derivatives_;
   }
 
+  /*!\rst
+    Appends new training points (and their values) to the data held by this evaluator.
+
+    .. WARNING:: State objects built from this evaluator are INVALIDATED; call their SetupState() again.
+
+    \param
+      :new_points[dim][num_new_points]: coordinates of the points to add
+      :new_points_value[num_derivatives+1][num_new_points]: values of the points to add
+      :num_new_points: number of points to add
+  \endrst*/
+  void AddSampledPoints(double const * restrict new_points, double const * restrict new_points_value,
+                        int num_new_points) OL_NONNULL_POINTERS;
+
   /*!\rst
     Wrapper for ComputeLogLikelihood(); see that function for details.
   \endrst*/
@@ -392,6 +405,14 @@ class LogMarginalLikelihoodEvaluator final {
   \endrst*/
   void BuildHyperparameterGradCovarianceMatrix(StateType * log_likelihood_state) const noexcept;
 
+  /*!\rst
+    Appends to ``square_differences_`` the pairs of points involving ``points_sampled_[first_new_point:]``.
+
+    \param
+      :first_new_point: index of the first point not yet in ``square_differences_``
+  \endrst*/
+  void AppendSquareDifferences(int first_new_point);
+
   /*!\rst
     Constructs the tensor of hessians (wrt hyperparameters) of the covariance function at all pairs of ``points_sampled_``.
     The result is ``\mixpderiv{cov(X_i, X_j)}{\theta_k}{\theta_l}``, stored in ``hessian_hyperparameter_cov_matrix[i][j][k][l]``.
@@ -427,6 +448,8 @@ class LogMarginalLikelihoodEvaluator final {
   std::vector<double> points_sampled_value_;
   //! ``\sigma_n^2``, the noise variance
   //std::vector<double> noise_variance_;
+  //! ``(X_j - X_i)^2`` for each pair of points_sampled (``i <= j``), ordered by j then i; independent of the hyperparameters
+  std::vector<double> square_differences_;
 };
 
 /*!\rst
@@ -538,6 +561,7 @@ struct LogMarginalLikelihoodState final {
 
   // temporary storage: preallocated space used by LogMarginalLikelihoodEvaluator's member functions
   //! ``\pderiv{K_{ij}}{\theta_k}``; temporary b/c it is overwritten with each computation of GradLikelihood
+  //! empty until the first gradient computation, so states used only for the log likelihood stay small
   std::vector<double> grad_hyperparameter_cov_matrix;
   //! temporary storage space of size ``num_sampled``
   std::vector<double> temp_vec;
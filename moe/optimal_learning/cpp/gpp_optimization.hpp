@@ -17,6 +17,7 @@
         ii. IMPLEMENTATION DETAILS
 
      c. MULTISTART OPTIMIZATION
+     d. STOCHASTIC OPTIMIZATION
 
   3. CODE HIERARCHY / CALL-TREE
 
@@ -184,6 +185,13 @@
   can have exceptionally poor convergence characteristics or run too slowly.  In cases where these more advanced techniques
   fail, we commonly fall back to 'dumb' search.
 
+  **2d. STOCHASTIC OPTIMIZATION**
+
+  When the objective is itself a Monte Carlo estimate (e.g., q,p-KG), its gradient is noisy and the convergence tests
+  of GD are meaningless. StochasticGradientAscentOptimization() takes a fixed number of steps with a decreasing learning
+  rate instead. It works one point at a time (limiting each point's update to the domain) and takes a constraint
+  penalty, e.g., LinearConstraintPenalty, that keeps points inside a region the domain cannot express.
+
   **3. CODE HIERARCHY / CALL-TREE**
 
   **3a. REQUIREMENTS OF TEMPLATE (CLASS) PARAMETERS**
@@ -1051,6 +1059,146 @@ OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT int NewtonOptimization(
   return error;
 }
 
+/*!\rst
+  Constraint penalty that accepts every point: StochasticGradientAscentOptimization() is then only constrained by its
+  domain.
+\endrst*/
+struct NullConstraintPenalty final {
+  bool CheckPointInside(double const * restrict OL_UNUSED(point)) const noexcept OL_WARN_UNUSED_RESULT {
+    return true;
+  }
+};
+
+/*!\rst
+  Constraint penalty from a linear model ``y(x) = coefficients^T x + intercept`` of a quantity that should lie in
+  ``[lower_bound, upper_bound]`` (e.g., a ridge regression of the running time of an experiment and a time limit).
+  Use +/- infinity for a missing bound.
+
+  A point is inside when its prediction is within the bounds.
+\endrst*/
+class LinearConstraintPenalty final {
+ public:
+  /*!\rst
+    Constructs a LinearConstraintPenalty.
+
+    \param
+      :coefficients[dim]: coefficients of the linear model
+      :intercept: intercept of the linear model
+      :lower_bound: smallest allowed prediction (-infinity for none)
+      :upper_bound: largest allowed prediction (infinity for none)
+      :dim: number of spatial dimensions
+  \endrst*/
+  LinearConstraintPenalty(double const * restrict coefficients, double intercept, double lower_bound, double upper_bound,
+                          int dim_in)
+      : dim_(dim_in),
+        coefficients_(coefficients, coefficients + dim_in),
+        intercept_(intercept),
+        lower_bound_(lower_bound),
+        upper_bound_(upper_bound) {
+  }
+
+  int dim() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return dim_;
+  }
+
+  double Predict(double const * restrict point) const noexcept OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT {
+    return DotProduct(coefficients_.data(), point, dim_) + intercept_;
+  }
+
+  bool CheckPointInside(double const * restrict point) const noexcept OL_NONNULL_POINTERS OL_WARN_UNUSED_RESULT {
+    double prediction = Predict(point);
+    return prediction >= lower_bound_ && prediction <= upper_bound_;
+  }
+
+ private:
+  //! spatial dimension of the points
+  int dim_;
+  //! coefficients of the linear model
+  std::vector<double> coefficients_;
+  //! intercept of the linear model
+  double intercept_;
+  //! smallest allowed prediction
+  double lower_bound_;
+  //! largest allowed prediction
+  double upper_bound_;
+};
+
+/*!\rst
+  Stochastic gradient ascent: exactly ``num_steps`` steps ``pre_mult*(i+1)^{-gamma} * gradient``, for
+  ``i = first_step, ..., first_step + num_steps - 1``.  There is no convergence test since the gradient is noisy.
+
+  ``objective_state->GetProblemSize()`` is split into points of ``domain.dim()`` coordinates and each point's step is
+  limited to the domain.  A point that would leave the region accepted by ``constraint`` is walked back along
+  its gradient by a tenth of its step, at most 10 times, until it is accepted again; points that are already outside
+  the region are moved freely.
+
+  \param
+    :objective_evaluator: reference to object that can compute the objective function and its gradient
+    :parameters: StochasticGradientAscentParameters object that describes the steps
+    :domain: object specifying the domain of a single point (see gpp_domain.hpp)
+    :constraint: object checking that a point is acceptable (e.g., NullConstraintPenalty, LinearConstraintPenalty)
+    :initial_gradient[problem_size]: gradient of the objective at the initial guess if it is already known, nullptr otherwise
+    :objective_state[1]: a properly configured state object for the ObjectiveFunctionEvaluator template parameter
+                         objective_state.GetCurrentPoint() will be used to obtain the initial guess
+  \output
+    :objective_state[1]: a state object whose temporary data members may have been modified
+                         objective_state.GetCurrentPoint() will return the last point of the ascent
+\endrst*/
+template <typename ObjectiveFunctionEvaluator, typename DomainType, typename ConstraintPenalty>
+void StochasticGradientAscentOptimization(
+    const ObjectiveFunctionEvaluator& objective_evaluator,
+    const StochasticGradientAscentParameters& parameters,
+    const DomainType& domain,
+    const ConstraintPenalty& constraint,
+    double const * initial_gradient,
+    typename ObjectiveFunctionEvaluator::StateType * objective_state) {
+  static constexpr int kMaxConstraintBacktracks = 10;
+  static constexpr double kConstraintBacktrackFactor = 0.1;
+  const int problem_size = objective_state->GetProblemSize();
+  const int dim = domain.dim();
+  const int num_points = problem_size/dim;
+  std::vector<double> grad_objective(problem_size);
+  std::vector<double> step(problem_size);
+  std::vector<double> next_point(problem_size);
+  std::vector<double> candidate(dim);
+
+  objective_state->GetCurrentPoint(next_point.data());
+  const int last_step = parameters.first_step + parameters.num_steps;
+  for (int i = parameters.first_step; i < last_step; ++i) {
+    double alpha_n = parameters.pre_mult*std::pow(static_cast<double>(i+1), -parameters.gamma);
+    if (i == parameters.first_step && initial_gradient != nullptr) {
+      std::copy(initial_gradient, initial_gradient + problem_size, grad_objective.begin());
+    } else {
+      objective_evaluator.ComputeGradObjectiveFunction(objective_state, grad_objective.data());
+    }
+    for (int j = 0; j < problem_size; ++j) {
+      grad_objective[j] *= alpha_n;
+    }
+    std::copy(grad_objective.begin(), grad_objective.end(), step.begin());
+
+    for (int k = 0; k < num_points; ++k) {
+      double * restrict point = next_point.data() + k*dim;
+      domain.LimitUpdate(parameters.max_relative_change, point, step.data() + k*dim);
+      for (int j = 0; j < dim; ++j) {
+        candidate[j] = point[j] + step[k*dim + j];
+      }
+      if (unlikely(!constraint.CheckPointInside(candidate.data()) && constraint.CheckPointInside(point))) {
+        for (int l = 0; l < kMaxConstraintBacktracks; ++l) {
+          for (int j = 0; j < dim; ++j) {
+            candidate[j] -= kConstraintBacktrackFactor*grad_objective[k*dim + j];
+          }
+          if (constraint.CheckPointInside(candidate.data())) {
+            break;
+          }
+        }
+      }
+      std::copy(candidate.begin(), candidate.end(), point);
+    }
+
+    objective_state->SetCurrentPoint(objective_evaluator, next_point.data());
+  }
+}
+
 /*!\rst
   The "null" or identity optimizer: it does nothing, giving the same output its inputs
   This is useful to allow the multistart optimizer template to be reused for 'dumb' searches and
@@ -195,6 +195,49 @@ struct NewtonParameters {
   double tolerance;
 };
 
+/*!\rst
+  Container to hold parameters that specify the behavior of stochastic gradient ascent (see
+  StochasticGradientAscentOptimization() in gpp_optimization.hpp).
+
+  Unlike GradientDescentParameters, there is no tolerance or restarting: the objective is noisy (e.g., Monte Carlo KG),
+  so exactly ``num_steps`` steps are taken, with learning rate ``pre_mult * (i+1)^{-\gamma}`` on the i-th step.
+  ``first_step`` offsets ``i`` so that an ascent can be continued where a previous call stopped.
+\endrst*/
+struct StochasticGradientAscentParameters {
+  // Users must set parameters explicitly.
+  StochasticGradientAscentParameters() = delete;
+
+  /*!\rst
+    Construct a StochasticGradientAscentParameters object.
+
+    INPUTS:
+    See member declarations below for a description of each parameter.
+  \endrst*/
+  StochasticGradientAscentParameters(int num_steps_in, int first_step_in, double gamma_in, double pre_mult_in,
+                                     double max_relative_change_in)
+      : num_steps(num_steps_in),
+        first_step(first_step_in),
+        gamma(gamma_in),
+        pre_mult(pre_mult_in),
+        max_relative_change(max_relative_change_in) {
+  }
+
+  // iteration control
+  //! number of gradient ascent steps (suggest: 50-100)
+  int num_steps;
+  //! index of the first step in the learning rate schedule (0 to start a new ascent)
+  int first_step;
+
+  // learning rate control
+  //! exponent controlling rate of step size decrease (suggest: 0.5-0.9)
+  double gamma;
+  //! scaling factor for step size (suggest: 0.1-1.0)
+  double pre_mult;
+
+  //! max change allowed per step (as a relative fraction of current distance to wall) (suggest: 0.5-1.0)
+  double max_relative_change;
+};
+
 }  // end namespace optimal_learning
 
 #endif  // MOE_OPTIMAL_LEARNING_CPP_GPP_OPTIMIZER_PARAMETERS_HPP_
@@ -553,6 +553,8 @@ BOOST_PYTHON_MODULE(GPP) {
         that need it (as opposed to recreating it every time).  Constructing the GP is noted as step 2 of MOE above.
       * GradientDescentParameters, NewtonParameters: structs that hold tolerances, max step counts, learning rates, etc.
         that control the behavior of the derivative-based optimizers
+      * StochasticGradientAscentParameters: struct that controls the stochastic gradient ascent of the knowledge gradient
+      * LinearConstraintPenalty: linear model of a constrained quantity, restricting the points of the stochastic optimizers
       * RandomnessSourceContainer: container for a uniform RNG and a normal (gaussian) RNG. These are needed by the C++ to
         guarantee that multi-threaded runs see different (and consistent) randomness. This class also exposes several
         functions for setting thread-safe seeds (both explicitly and automatically).
@@ -598,6 +600,7 @@ BOOST_PYTHON_MODULE(GPP) {
   ExportModelSelectionFunctions();
   ExportOptimizerParameterStructs();
   ExportRandomnessContainer();
+  ExportConstraintPenalties();
   ExportFiniteDomain();
 }  // end BOOST_PYTHON_MODULE(GPP) definition
 
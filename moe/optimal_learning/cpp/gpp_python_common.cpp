@@ -24,11 +24,13 @@
 #include <boost/python/enum.hpp>  // NOLINT(build/include_order)
 #include <boost/python/extract.hpp>  // NOLINT(build/include_order)
 #include <boost/python/list.hpp>  // NOLINT(build/include_order)
+#include <boost/python/make_constructor.hpp>  // NOLINT(build/include_order)
 
 #include "gpp_common.hpp"
 #include "gpp_domain.hpp"
 #include "gpp_logging.hpp"
 #include "gpp_model_selection.hpp"
+#include "gpp_optimization.hpp"
 #include "gpp_optimizer_parameters.hpp"
 #include "gpp_random.hpp"
 
@@ -298,6 +300,78 @@ void ExportOptimizerParameterStructs() {
       .def_readwrite("max_relative_change", &NewtonParameters::max_relative_change, "max change allowed per update (as a relative fraction of current distance to wall) (Newton may ignore this) (suggest: 1.0)")
       .def_readwrite("tolerance", &NewtonParameters::tolerance, "when the magnitude of the gradient falls below this value, stop (suggest: 1.0e-10)")
       ;  // NOLINT, this is boost style
+
+  boost::python::class_<StochasticGradientAscentParameters, boost::noncopyable>("StochasticGradientAscentParameters", boost::python::init<int, int, double, double, double>(
+      (boost::python::arg("num_steps"), "first_step", "gamma", "pre_mult", "max_relative_change"), R"%%(
+    Constructor for a StochasticGradientAscentParameters object.
+
+    :param num_steps: number of gradient ascent steps, there is no convergence test (suggest: 50-100)
+    :type num_steps: int >= 0
+    :param first_step: index of the first step in the learning rate schedule, to continue a previous ascent (0 otherwise)
+    :type first_step: int >= 0
+    :param gamma: exponent controlling rate of step size decrease, the i-th step is ``pre_mult * (i+1)^{-gamma} * gradient`` (suggest: 0.5-0.9)
+    :type gamma: float64 > 0.0
+    :param pre_mult: scaling factor for step size (suggest: 0.1-1.0)
+    :type pre_mult: float64 > 0.0
+    :param max_relative_change: max change allowed per step (as a relative fraction of current distance to wall) (suggest: 0.5-1.0)
+    :type max_relative_change: float64 in [0, 1]
+    )%%"))
+      .def_readwrite("num_steps", &StochasticGradientAscentParameters::num_steps, "number of gradient ascent steps")
+      .def_readwrite("first_step", &StochasticGradientAscentParameters::first_step, "index of the first step in the learning rate schedule")
+      .def_readwrite("gamma", &StochasticGradientAscentParameters::gamma, "exponent controlling rate of step size decrease")
+      .def_readwrite("pre_mult", &StochasticGradientAscentParameters::pre_mult, "scaling factor for step size")
+      .def_readwrite("max_relative_change", &StochasticGradientAscentParameters::max_relative_change, "max change allowed per step (as a relative fraction of current distance to wall)")
+      ;  // NOLINT, this is boost style
+}
+
+namespace {
+
+/*!\rst
+  Surrogate "constructor" for LinearConstraintPenalty intended only for use by boost::python.  This aliases the normal C++
+  constructor, replacing ``double const * restrict`` arguments with ``const boost::python::list&`` arguments.
+\endrst*/
+LinearConstraintPenalty * make_linear_constraint_penalty(const boost::python::list& coefficients, double intercept,
+                                                         double lower_bound, double upper_bound, int dim) {
+  std::vector<double> coefficients_C(dim);
+  CopyPylistToVector(coefficients, dim, coefficients_C);
+  return new LinearConstraintPenalty(coefficients_C.data(), intercept, lower_bound, upper_bound, dim);
+}
+
+double PredictLinearConstraintWrapper(const LinearConstraintPenalty& constraint_penalty, const boost::python::list& point) {
+  std::vector<double> point_C(constraint_penalty.dim());
+  CopyPylistToVector(point, constraint_penalty.dim(), point_C);
+  return constraint_penalty.Predict(point_C.data());
+}
+
+}  // end unnamed namespace
+
+void ExportConstraintPenalties() {
+  boost::python::class_<LinearConstraintPenalty, boost::noncopyable>("LinearConstraintPenalty", boost::python::no_init)
+      .def("__init__", boost::python::make_constructor(&make_linear_constraint_penalty), R"%%(
+    Constructor for a LinearConstraintPenalty: a linear model ``y(x) = coefficients^T x + intercept`` of a quantity that
+    should lie in ``[lower_bound, upper_bound]``, used by the stochastic optimizers (see gpp_optimization.hpp).
+
+    :param coefficients: coefficients of the linear model
+    :type coefficients: list of float64 with length dim
+    :param intercept: intercept of the linear model
+    :type intercept: float64
+    :param lower_bound: smallest allowed prediction (-inf for none)
+    :type lower_bound: float64
+    :param upper_bound: largest allowed prediction (inf for none)
+    :type upper_bound: float64
+    :param dim: number of spatial dimensions
+    :type dim: int > 0
+          )%%")
+      .add_property("dim", &LinearConstraintPenalty::dim, "number of spatial dimensions")
+      .def("predict", PredictLinearConstraintWrapper, R"%%(
+    Prediction of the linear model at a point.
+
+    :param point: point to predict
+    :type point: list of float64 with length dim
+    :return: ``coefficients^T point + intercept``
+    :rtype: float64
+          )%%")
+      ;  // NOLINT, this is boost style
 }
 
 void ExportRandomnessContainer() {
@@ -10,7 +10,8 @@
      a. PythonInterfaceInputContainer: captures the most common set of inputs used in gpp_python
      b. utilities for copying between std::vector and boost::python::list
 
-  2. A RandomnessSourceContainer for moving consistent RNG state between C++, Python
+  2. A RandomnessSourceContainer for moving consistent RNG state between C++, Python,
+     and a ScopedGILRelease to let other Python threads run during long C++ computations
   3. Export*() functions for giving Python access to various C++ calls via boost::python.
 
      a. enum classes
@@ -236,6 +237,25 @@ class RandomnessSourceContainer {
   int num_normal_rng_;
 };
 
+/*!\rst
+  Releases the GIL for its lifetime, so that other Python threads run meanwhile. No Python object may be
+  touched while it is alive.
+\endrst*/
+class ScopedGILRelease {
+ public:
+  ScopedGILRelease() : thread_state_(PyEval_SaveThread()) {
+  }
+
+  ~ScopedGILRelease() {
+    PyEval_RestoreThread(thread_state_);
+  }
+
+  OL_DISALLOW_COPY_AND_ASSIGN(ScopedGILRelease);
+
+ private:
+  PyThreadState * thread_state_;
+};
+
 /*!\rst
   Copies the first doubles elements of a python list (input) into a std::vector (output)
   Resizes output if needed.
@@ -294,6 +314,11 @@ void ExportOptimizerParameterStructs();
 \endrst*/
 void ExportRandomnessContainer();
 
+/*!\rst
+  Export the constraint penalties from gpp_optimization.hpp (e.g., LinearConstraintPenalty) to Python. Includes docstrings.
+\endrst*/
+void ExportConstraintPenalties();
+
 }  // end namespace optimal_learning
 
 #endif  // MOE_OPTIMAL_LEARNING_CPP_GPP_PYTHON_COMMON_HPP_
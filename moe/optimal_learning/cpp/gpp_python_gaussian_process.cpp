@@ -252,6 +252,16 @@ void AddPointsToGPWrapper(GaussianProcess * gaussian_process,
   gaussian_process->AddPointsToGP(new_points_C.data(), new_points_value_C.data(), num_new_points);
 }
 
+void SetHyperparametersWrapper(GaussianProcess * gaussian_process,
+                               const boost::python::list& hyperparameters,
+                               const boost::python::list& noise_variance) {
+  std::vector<double> hyperparameters_C(gaussian_process->dim() + 1);
+  std::vector<double> noise_variance_C(gaussian_process->num_derivatives() + 1);
+  CopyPylistToVector(hyperparameters, gaussian_process->dim() + 1, hyperparameters_C);
+  CopyPylistToVector(noise_variance, gaussian_process->num_derivatives() + 1, noise_variance_C);
+  gaussian_process->SetCovarianceHyperparametersAndNoiseVariance(hyperparameters_C.data(), noise_variance_C.data());
+}
+
 boost::python::list SamplePointFromGPWrapper(GaussianProcess * gaussian_process,
                                              const boost::python::list& point_to_sample) {
   int num_to_sample = 1;  // we're only drawing 1 point at a time here
@@ -425,6 +435,16 @@ void ExportGaussianProcessFunctions() {
         :param num_new_points: number of new points to add to the GP
         :type num_new_points: int
       )%%")
+      .def("set_hyperparameters", SetHyperparametersWrapper, R"%%(
+        Change the covariance hyperparameters and the noise variance of this GP, keeping its data.
+
+        Forces recomputation of all derived quantities for GP to remain consistent.
+
+        :param hyperparameters: ``\alpha`` (signal variance), then the length scales
+        :type hyperparameters: list of float64 with shape (dim + 1, )
+        :param noise_variance: noise variance of the function values and of each derivative
+        :type noise_variance: list of float64 with shape (num_derivatives + 1, )
+      )%%")
       .def("sample_point_from_gp", SamplePointFromGPWrapper, R"%%(
         Sample a function value from a Gaussian Process prior, provided a point at which to sample.
 
@@ -78,6 +78,39 @@ GaussianProcessMCMC * make_gaussian_process_mcmc(const boost::python::list& hype
   return new_gp_mcmc;
 }
 
+void SetHyperparametersMCMCWrapper(GaussianProcessMCMC * gaussian_process_mcmc,
+                                   const boost::python::list& hyperparameters_list,
+                                   const boost::python::list& noise_variance_list, int num_mcmc) {
+  const int dim = gaussian_process_mcmc->dim();
+  const int num_derivatives = gaussian_process_mcmc->num_derivatives();
+  std::vector<double> hyperparameters_list_vector(num_mcmc*(dim+1));
+  CopyPylistToVector(hyperparameters_list, num_mcmc*(dim+1), hyperparameters_list_vector);
+
+  std::vector<double> noise_variance_list_vector(num_mcmc*(1+num_derivatives));
+  CopyPylistToVector(noise_variance_list, num_mcmc*(1+num_derivatives), noise_variance_list_vector);
+
+  const int num_mcmc_old = gaussian_process_mcmc->num_mcmc();
+  gaussian_process_mcmc->SetHyperparameters(hyperparameters_list_vector.data(), noise_variance_list_vector.data(),
+                                            num_mcmc);
+  // seed the new GPs like the constructor does
+  for (int i = num_mcmc_old; i < num_mcmc; ++i) {
+    gaussian_process_mcmc->gaussian_process_lst[i].SetRandomizedSeed(0);
+  }
+}
+
+void AddSampledPointsMCMCWrapper(GaussianProcessMCMC * gaussian_process_mcmc,
+                                 const boost::python::list& new_points,
+                                 const boost::python::list& new_points_value,
+                                 int num_new_points) {
+  const int dim = gaussian_process_mcmc->dim();
+  const int num_derivatives = gaussian_process_mcmc->num_derivatives();
+  std::vector<double> new_points_C(dim*num_new_points);
+  std::vector<double> new_points_value_C(num_new_points*(1 + num_derivatives));
+  CopyPylistToVector(new_points, dim*num_new_points, new_points_C);
+  CopyPylistToVector(new_points_value, num_new_points*(1 + num_derivatives), new_points_value_C);
+  gaussian_process_mcmc->AddSampledPoints(new_points_C.data(), new_points_value_C.data(), num_new_points);
+}
+
 double ComputeKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
                                            const int num_fidelity,
                                            const boost::python::object& optimizer_parameters,
@@ -107,20 +140,26 @@ double ComputeKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process
   TensorProductDomain domain(domain_bounds_C.data(), input_container.dim-num_fidelity);
   const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
 
-  std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
-  KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
-                                                                   num_pts, max_int_steps, domain, gradient_descent_parameters,
-                                                                   best_so_far_list.data(), &evaluator_vector);
-
-  std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
-  KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
-                                                                          input_container.points_being_sampled.data(),
-                                                                          input_container.num_to_sample,
-                                                                          input_container.num_being_sampled,
-                                                                          num_pts, gaussian_process_mcmc.derivatives().data(),
-                                                                          gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
-                                                                          randomness_source.normal_rng_vec.data(), &state_vector);
-  return kg_evaluator.ComputeKnowledgeGradient(&kg_state);
+  double knowledge_gradient;
+  {
+    // only C++ objects from here on: let other Python threads (e.g., other optimizer restarts) run meanwhile
+    ScopedGILRelease gil_release;
+    std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
+                                                                     num_pts, max_int_steps, domain, gradient_descent_parameters,
+                                                                     best_so_far_list.data(), &evaluator_vector);
+
+    std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
+                                                                            input_container.points_being_sampled.data(),
+                                                                            input_container.num_to_sample,
+                                                                            input_container.num_being_sampled,
+                                                                            num_pts, gaussian_process_mcmc.derivatives().data(),
+                                                                            gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
+                                                                            randomness_source.normal_rng_vec.data(), &state_vector);
+    knowledge_gradient = kg_evaluator.ComputeKnowledgeGradient(&kg_state);
+  }
+  return knowledge_gradient;
 }
 
 boost::python::list ComputeGradKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
@@ -155,24 +194,415 @@ boost::python::list ComputeGradKnowledgeGradientMCMCWrapper(GaussianProcessMCMC&
   TensorProductDomain domain(domain_bounds_C.data(), input_container.dim-num_fidelity);
   const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
 
-  std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
-  KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
-                                                                   num_pts, max_int_steps, domain, gradient_descent_parameters,
-                                                                   best_so_far_list.data(), &evaluator_vector);
-
-  std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
-  KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
-                                                                          input_container.points_being_sampled.data(),
-                                                                          input_container.num_to_sample,
-                                                                          input_container.num_being_sampled,
-                                                                          num_pts, gaussian_process_mcmc.derivatives().data(),
-                                                                          gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
-                                                                          randomness_source.normal_rng_vec.data(), &state_vector);
-  kg_evaluator.ComputeGradKnowledgeGradient(&kg_state, grad_KG.data());
+  {
+    // only C++ objects from here on: let other Python threads (e.g., other optimizer restarts) run meanwhile
+    ScopedGILRelease gil_release;
+    std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
+                                                                     num_pts, max_int_steps, domain, gradient_descent_parameters,
+                                                                     best_so_far_list.data(), &evaluator_vector);
+
+    std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
+                                                                            input_container.points_being_sampled.data(),
+                                                                            input_container.num_to_sample,
+                                                                            input_container.num_being_sampled,
+                                                                            num_pts, gaussian_process_mcmc.derivatives().data(),
+                                                                            gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
+                                                                            randomness_source.normal_rng_vec.data(), &state_vector);
+    kg_evaluator.ComputeGradKnowledgeGradient(&kg_state, grad_KG.data());
+  }
 
   return VectorToPylist(grad_KG);
 }
 
+/*!\rst
+  Knowledge gradient and its gradient wrt points_to_sample, from a single Monte Carlo pass: the inner posterior mean
+  optimizations are shared. Same inputs as ComputeGradKnowledgeGradientMCMCWrapper().
+
+  \return
+    list ``[kg, grad_kg]`` where ``grad_kg`` is flattened with shape (num_to_sample, dim)
+\endrst*/
+boost::python::list ComputeKnowledgeGradientAndGradMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                               const int num_fidelity,
+                                                               const boost::python::object& optimizer_parameters,
+                                                               const boost::python::list& domain_bounds,
+                                                               const boost::python::list& discrete_pts,
+                                                               const boost::python::list& points_to_sample,
+                                                               const boost::python::list& points_being_sampled,
+                                                               int num_pts, int num_to_sample, int num_being_sampled,
+                                                               int max_int_steps, const boost::python::list& best_so_far,
+                                                               RandomnessSourceContainer& randomness_source) {
+  int num_derivatives_input = 0;
+  const boost::python::list gradients;
+
+  PythonInterfaceInputContainer input_container_discrete(discrete_pts, gradients, gaussian_process_mcmc.dim()-num_fidelity,
+                                                         num_pts*gaussian_process_mcmc.num_mcmc(), num_derivatives_input);
+  PythonInterfaceInputContainer input_container(points_to_sample, points_being_sampled, gradients, gaussian_process_mcmc.dim(),
+                                                num_to_sample, num_being_sampled, num_derivatives_input);
+
+  std::vector<double> grad_KG(num_to_sample*input_container.dim);
+  bool configure_for_gradients = true;
+
+  std::vector<ClosedInterval> domain_bounds_C(input_container.dim-num_fidelity);
+  CopyPylistToClosedIntervalVector(domain_bounds, input_container.dim-num_fidelity, domain_bounds_C);
+
+  std::vector<double> best_so_far_list(gaussian_process_mcmc.num_mcmc());
+  CopyPylistToVector(best_so_far, gaussian_process_mcmc.num_mcmc(), best_so_far_list);
+
+  TensorProductDomain domain(domain_bounds_C.data(), input_container.dim-num_fidelity);
+  const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
+
+  double knowledge_gradient;
+  {
+    // only C++ objects from here on: let other Python threads (e.g., other optimizer restarts) run meanwhile
+    ScopedGILRelease gil_release;
+    std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
+                                                                     num_pts, max_int_steps, domain, gradient_descent_parameters,
+                                                                     best_so_far_list.data(), &evaluator_vector);
+
+    std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
+                                                                            input_container.points_being_sampled.data(),
+                                                                            input_container.num_to_sample,
+                                                                            input_container.num_being_sampled,
+                                                                            num_pts, gaussian_process_mcmc.derivatives().data(),
+                                                                            gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
+                                                                            randomness_source.normal_rng_vec.data(), &state_vector);
+    knowledge_gradient = kg_evaluator.ComputeGradKnowledgeGradient(&kg_state, grad_KG.data());
+  }
+
+  boost::python::list output;
+  output.append(knowledge_gradient);
+  output.append(VectorToPylist(grad_KG));
+  return output;
+}
+
+/*!\rst
+  Stochastic gradient ascent of the knowledge gradient from the current point of ``kg_state`` (see
+  StochasticGradientAscentOptimization() in gpp_optimization.hpp), with the constraint chosen at runtime: none if
+  ``constraint_penalty`` is nullptr, a LinearConstraintPenalty otherwise.
+\endrst*/
+void StochasticOptimizationKnowledgeGradientMCMC(const KnowledgeGradientMCMCEvaluator<TensorProductDomain>& kg_evaluator,
+                                                 const StochasticGradientAscentParameters& gradient_ascent_parameters,
+                                                 const TensorProductDomain& domain,
+                                                 LinearConstraintPenalty const * constraint_penalty,
+                                                 double const * initial_gradient,
+                                                 KnowledgeGradientMCMCState<TensorProductDomain> * kg_state) {
+  if (constraint_penalty == nullptr) {
+    StochasticGradientAscentOptimization(kg_evaluator, gradient_ascent_parameters, domain, NullConstraintPenalty(),
+                                         initial_gradient, kg_state);
+  } else {
+    StochasticGradientAscentOptimization(kg_evaluator, gradient_ascent_parameters, domain, *constraint_penalty,
+                                         initial_gradient, kg_state);
+  }
+}
+
+/*!\rst
+  Extracts the C++ objects held by a python/cpp_wrappers/optimization._CppStochasticOptimizerParameters object.
+
+  \param
+    :stochastic_optimizer_parameters: _CppStochasticOptimizerParameters object
+  \output
+    :gradient_ascent_parameters[1]: the StochasticGradientAscentParameters
+    :constraint_penalty[1]: the LinearConstraintPenalty, nullptr if None
+\endrst*/
+void ExtractStochasticOptimizerParameters(const boost::python::object& stochastic_optimizer_parameters,
+                                          StochasticGradientAscentParameters const ** gradient_ascent_parameters,
+                                          LinearConstraintPenalty const ** constraint_penalty) {
+  *gradient_ascent_parameters = &boost::python::extract<StochasticGradientAscentParameters&>(stochastic_optimizer_parameters.attr("gradient_ascent_parameters"))();
+  const boost::python::object constraint_penalty_object = stochastic_optimizer_parameters.attr("constraint_penalty");
+  *constraint_penalty = nullptr;
+  if (!constraint_penalty_object.is_none()) {
+    *constraint_penalty = &boost::python::extract<LinearConstraintPenalty&>(constraint_penalty_object)();
+  }
+}
+
+/*!\rst
+  Optimize the knowledge gradient from ``points_to_sample`` by stochastic gradient ascent, with a single evaluator and
+  state for every step.  Same inputs as ComputeGradKnowledgeGradientMCMCWrapper(), and:
+
+  \param
+    :stochastic_optimizer_parameters: python/cpp_wrappers/optimization._CppStochasticOptimizerParameters
+      with the ``gradient_ascent_parameters`` and the ``constraint_penalty`` (a LinearConstraintPenalty, or None)
+    :initial_gradient: gradient of KG at ``points_to_sample`` if it is already known, empty list otherwise
+  \return
+    list with the optimized ``points_to_sample``, flattened with shape (num_to_sample, dim)
+\endrst*/
+boost::python::list StochasticOptimizationKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                                       const int num_fidelity,
+                                                                       const boost::python::object& optimizer_parameters,
+                                                                       const boost::python::list& domain_bounds,
+                                                                       const boost::python::list& discrete_pts,
+                                                                       const boost::python::list& points_to_sample,
+                                                                       const boost::python::list& points_being_sampled,
+                                                                       int num_pts, int num_to_sample, int num_being_sampled,
+                                                                       int max_int_steps, const boost::python::list& best_so_far,
+                                                                       RandomnessSourceContainer& randomness_source,
+                                                                       const boost::python::object& stochastic_optimizer_parameters,
+                                                                       const boost::python::list& initial_gradient) {
+  if (num_fidelity != 0) {
+    OL_THROW_EXCEPTION(InvalidValueException<int>, "Stochastic optimization does not support fidelity dimensions.",
+                       num_fidelity, 0);
+  }
+  int num_derivatives_input = 0;
+  const boost::python::list gradients;
+
+  PythonInterfaceInputContainer input_container_discrete(discrete_pts, gradients, gaussian_process_mcmc.dim()-num_fidelity,
+                                                         num_pts*gaussian_process_mcmc.num_mcmc(), num_derivatives_input);
+  PythonInterfaceInputContainer input_container(points_to_sample, points_being_sampled, gradients, gaussian_process_mcmc.dim(),
+                                                num_to_sample, num_being_sampled, num_derivatives_input);
+
+  std::vector<double> best_points_to_sample(num_to_sample*input_container.dim);
+  bool configure_for_gradients = true;
+
+  std::vector<ClosedInterval> domain_bounds_C(input_container.dim-num_fidelity);
+  CopyPylistToClosedIntervalVector(domain_bounds, input_container.dim-num_fidelity, domain_bounds_C);
+
+  std::vector<double> best_so_far_list(gaussian_process_mcmc.num_mcmc());
+  CopyPylistToVector(best_so_far, gaussian_process_mcmc.num_mcmc(), best_so_far_list);
+
+  std::vector<double> initial_gradient_C;
+  if (boost::python::len(initial_gradient) > 0) {
+    CopyPylistToVector(initial_gradient, num_to_sample*input_container.dim, initial_gradient_C);
+  }
+
+  TensorProductDomain domain(domain_bounds_C.data(), input_container.dim-num_fidelity);
+  const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
+
+  StochasticGradientAscentParameters const * gradient_ascent_parameters;
+  LinearConstraintPenalty const * constraint_penalty;
+  ExtractStochasticOptimizerParameters(stochastic_optimizer_parameters, &gradient_ascent_parameters, &constraint_penalty);
+
+  {
+    // only C++ objects from here on: let other Python threads (e.g., other optimizer restarts) run meanwhile
+    ScopedGILRelease gil_release;
+    std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator(gaussian_process_mcmc, num_fidelity, input_container_discrete.points_to_sample.data(),
+                                                                     num_pts, max_int_steps, domain, gradient_descent_parameters,
+                                                                     best_so_far_list.data(), &evaluator_vector);
+
+    std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+    KnowledgeGradientMCMCEvaluator<TensorProductDomain>::StateType kg_state(kg_evaluator, input_container.points_to_sample.data(),
+                                                                            input_container.points_being_sampled.data(),
+                                                                            input_container.num_to_sample,
+                                                                            input_container.num_being_sampled,
+                                                                            num_pts, gaussian_process_mcmc.derivatives().data(),
+                                                                            gaussian_process_mcmc.num_derivatives(), configure_for_gradients,
+                                                                            randomness_source.normal_rng_vec.data(), &state_vector);
+    double const * initial_gradient_pointer = initial_gradient_C.empty() ? nullptr : initial_gradient_C.data();
+    StochasticOptimizationKnowledgeGradientMCMC(kg_evaluator, *gradient_ascent_parameters, domain, constraint_penalty,
+                                                initial_gradient_pointer, &kg_state);
+    kg_state.GetCurrentPoint(best_points_to_sample.data());
+  }
+
+  return VectorToPylist(best_points_to_sample);
+}
+
+/*!\rst
+  Knowledge gradient of a fixed GaussianProcessMCMC, discrete set and inner optimizer, evaluated at varying points.
+
+  The KnowledgeGradientMCMCEvaluator (with its per-sample KnowledgeGradientEvaluator and their cached covariance
+  between the sampled and the discrete points) is built once, at construction, so each call only converts the points.
+  Calls are const and release the GIL, so Python threads can share one object.
+
+  .. WARNING:: The evaluator points into the GaussianProcessMCMC: it is invalidated if the GP is mutated
+    (e.g., by ``set_hyperparameters`` or ``add_sampled_points``); build a new one instead. Every call checks
+    GaussianProcessMCMC::num_modifications() and throws InvalidValueException if the GP changed since construction.
+\endrst*/
+class PersistentKnowledgeGradientMCMC {
+ public:
+  PersistentKnowledgeGradientMCMC(const boost::python::object& gaussian_process_mcmc_object, int num_fidelity,
+                                  const GradientDescentParameters& optimizer_parameters, const TensorProductDomain& domain,
+                                  double const * discrete_pts, int num_pts, int max_int_steps, double const * best_so_far)
+      : gaussian_process_mcmc_object_(gaussian_process_mcmc_object),
+        gaussian_process_mcmc_(boost::python::extract<GaussianProcessMCMC&>(gaussian_process_mcmc_object)()),
+        num_modifications_(gaussian_process_mcmc_.num_modifications()),
+        num_pts_(num_pts),
+        domain_(domain),
+        evaluator_vector_(),
+        kg_evaluator_(gaussian_process_mcmc_, num_fidelity, discrete_pts, num_pts, max_int_steps, domain_,
+                      optimizer_parameters, best_so_far, &evaluator_vector_) {
+  }
+
+  double ComputeKnowledgeGradient(const boost::python::list& points_to_sample,
+                                  const boost::python::list& points_being_sampled,
+                                  int num_to_sample, int num_being_sampled,
+                                  RandomnessSourceContainer& randomness_source) const {
+    CheckGaussianProcessMCMCUnchanged();
+    const PythonInterfaceInputContainer input_container(points_to_sample, points_being_sampled, boost::python::list(),
+                                                        gaussian_process_mcmc_.dim(), num_to_sample, num_being_sampled, 0);
+    bool configure_for_gradients = false;
+
+    double knowledge_gradient;
+    {
+      ScopedGILRelease gil_release;
+      std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+      KnowledgeGradientMCMCState<TensorProductDomain> kg_state(kg_evaluator_, input_container.points_to_sample.data(),
+                                                               input_container.points_being_sampled.data(),
+                                                               input_container.num_to_sample, input_container.num_being_sampled,
+                                                               num_pts_, gaussian_process_mcmc_.derivatives().data(),
+                                                               gaussian_process_mcmc_.num_derivatives(), configure_for_gradients,
+                                                               randomness_source.normal_rng_vec.data(), &state_vector);
+      knowledge_gradient = kg_evaluator_.ComputeKnowledgeGradient(&kg_state);
+    }
+    return knowledge_gradient;
+  }
+
+  boost::python::list ComputeGradKnowledgeGradient(const boost::python::list& points_to_sample,
+                                                   const boost::python::list& points_being_sampled,
+                                                   int num_to_sample, int num_being_sampled,
+                                                   RandomnessSourceContainer& randomness_source) const {
+    std::vector<double> grad_KG(num_to_sample*gaussian_process_mcmc_.dim());
+    EvaluateKnowledgeGradientAndGrad(points_to_sample, points_being_sampled, num_to_sample, num_being_sampled,
+                                     randomness_source, grad_KG.data());
+    return VectorToPylist(grad_KG);
+  }
+
+  boost::python::list ComputeKnowledgeGradientAndGrad(const boost::python::list& points_to_sample,
+                                                      const boost::python::list& points_being_sampled,
+                                                      int num_to_sample, int num_being_sampled,
+                                                      RandomnessSourceContainer& randomness_source) const {
+    std::vector<double> grad_KG(num_to_sample*gaussian_process_mcmc_.dim());
+    double knowledge_gradient = EvaluateKnowledgeGradientAndGrad(points_to_sample, points_being_sampled, num_to_sample,
+                                                                 num_being_sampled, randomness_source, grad_KG.data());
+
+    boost::python::list output;
+    output.append(knowledge_gradient);
+    output.append(VectorToPylist(grad_KG));
+    return output;
+  }
+
+  boost::python::list StochasticOptimization(const boost::python::list& points_to_sample,
+                                             const boost::python::list& points_being_sampled,
+                                             int num_to_sample, int num_being_sampled,
+                                             RandomnessSourceContainer& randomness_source,
+                                             const boost::python::object& stochastic_optimizer_parameters,
+                                             const boost::python::list& initial_gradient) const {
+    CheckGaussianProcessMCMCUnchanged();
+    if (kg_evaluator_.num_fidelity() != 0) {
+      OL_THROW_EXCEPTION(InvalidValueException<int>, "Stochastic optimization does not support fidelity dimensions.",
+                         kg_evaluator_.num_fidelity(), 0);
+    }
+    const PythonInterfaceInputContainer input_container(points_to_sample, points_being_sampled, boost::python::list(),
+                                                        gaussian_process_mcmc_.dim(), num_to_sample, num_being_sampled, 0);
+    std::vector<double> best_points_to_sample(num_to_sample*input_container.dim);
+    bool configure_for_gradients = true;
+
+    std::vector<double> initial_gradient_C;
+    if (boost::python::len(initial_gradient) > 0) {
+      CopyPylistToVector(initial_gradient, num_to_sample*input_container.dim, initial_gradient_C);
+    }
+
+    StochasticGradientAscentParameters const * gradient_ascent_parameters;
+    LinearConstraintPenalty const * constraint_penalty;
+    ExtractStochasticOptimizerParameters(stochastic_optimizer_parameters, &gradient_ascent_parameters, &constraint_penalty);
+
+    {
+      ScopedGILRelease gil_release;
+      std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+      KnowledgeGradientMCMCState<TensorProductDomain> kg_state(kg_evaluator_, input_container.points_to_sample.data(),
+                                                               input_container.points_being_sampled.data(),
+                                                               input_container.num_to_sample, input_container.num_being_sampled,
+                                                               num_pts_, gaussian_process_mcmc_.derivatives().data(),
+                                                               gaussian_process_mcmc_.num_derivatives(), configure_for_gradients,
+                                                               randomness_source.normal_rng_vec.data(), &state_vector);
+      double const * initial_gradient_pointer = initial_gradient_C.empty() ? nullptr : initial_gradient_C.data();
+      StochasticOptimizationKnowledgeGradientMCMC(kg_evaluator_, *gradient_ascent_parameters, domain_, constraint_penalty,
+                                                  initial_gradient_pointer, &kg_state);
+      kg_state.GetCurrentPoint(best_points_to_sample.data());
+    }
+
+    return VectorToPylist(best_points_to_sample);
+  }
+
+ private:
+  /*!\rst
+    Throws InvalidValueException if the GaussianProcessMCMC was mutated since construction, which invalidates
+    ``kg_evaluator_``.
+  \endrst*/
+  void CheckGaussianProcessMCMCUnchanged() const {
+    if (gaussian_process_mcmc_.num_modifications() != num_modifications_) {
+      OL_THROW_EXCEPTION(InvalidValueException<int>,
+                         "GaussianProcessMCMC was modified after the evaluator was built; build a new evaluator.",
+                         gaussian_process_mcmc_.num_modifications(), num_modifications_);
+    }
+  }
+
+  /*!\rst
+    Knowledge gradient and its gradient (written to ``grad_KG[num_to_sample][dim]``) from a single Monte Carlo pass.
+  \endrst*/
+  double EvaluateKnowledgeGradientAndGrad(const boost::python::list& points_to_sample,
+                                          const boost::python::list& points_being_sampled,
+                                          int num_to_sample, int num_being_sampled,
+                                          RandomnessSourceContainer& randomness_source,
+                                          double * restrict grad_KG) const {
+    CheckGaussianProcessMCMCUnchanged();
+    const PythonInterfaceInputContainer input_container(points_to_sample, points_being_sampled, boost::python::list(),
+                                                        gaussian_process_mcmc_.dim(), num_to_sample, num_being_sampled, 0);
+    bool configure_for_gradients = true;
+
+    double knowledge_gradient;
+    {
+      ScopedGILRelease gil_release;
+      std::vector<typename KnowledgeGradientEvaluator<TensorProductDomain>::StateType> state_vector;
+      KnowledgeGradientMCMCState<TensorProductDomain> kg_state(kg_evaluator_, input_container.points_to_sample.data(),
+                                                               input_container.points_being_sampled.data(),
+                                                               input_container.num_to_sample, input_container.num_being_sampled,
+                                                               num_pts_, gaussian_process_mcmc_.derivatives().data(),
+                                                               gaussian_process_mcmc_.num_derivatives(), configure_for_gradients,
+                                                               randomness_source.normal_rng_vec.data(), &state_vector);
+      knowledge_gradient = kg_evaluator_.ComputeGradKnowledgeGradient(&kg_state, grad_KG);
+    }
+    return knowledge_gradient;
+  }
+
+  //! the Python GaussianProcessMCMC, held so that it outlives the evaluator pointing into it
+  const boost::python::object gaussian_process_mcmc_object_;
+  const GaussianProcessMCMC& gaussian_process_mcmc_;
+  //! ``gaussian_process_mcmc_.num_modifications()`` when ``kg_evaluator_`` was built
+  const int num_modifications_;
+  const int num_pts_;
+  const TensorProductDomain domain_;
+  //! per-sample evaluators owned on behalf of ``kg_evaluator_``
+  std::vector<typename KnowledgeGradientState<TensorProductDomain>::EvaluatorType> evaluator_vector_;
+  KnowledgeGradientMCMCEvaluator<TensorProductDomain> kg_evaluator_;
+
+  OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(PersistentKnowledgeGradientMCMC);
+};
+
+/*!\rst
+  Surrogate "constructor" for PersistentKnowledgeGradientMCMC intended only for use by boost::python.
+\endrst*/
+PersistentKnowledgeGradientMCMC * make_knowledge_gradient_mcmc_evaluator(const boost::python::object& gaussian_process_mcmc_object,
+                                                                         const int num_fidelity,
+                                                                         const boost::python::object& optimizer_parameters,
+                                                                         const boost::python::list& domain_bounds,
+                                                                         const boost::python::list& discrete_pts,
+                                                                         int num_pts, int max_int_steps,
+                                                                         const boost::python::list& best_so_far) {
+  const GaussianProcessMCMC& gaussian_process_mcmc = boost::python::extract<GaussianProcessMCMC&>(gaussian_process_mcmc_object);
+  int num_derivatives_input = 0;
+  const boost::python::list gradients;
+
+  PythonInterfaceInputContainer input_container_discrete(discrete_pts, gradients, gaussian_process_mcmc.dim()-num_fidelity,
+                                                         num_pts*gaussian_process_mcmc.num_mcmc(), num_derivatives_input);
+
+  std::vector<ClosedInterval> domain_bounds_C(gaussian_process_mcmc.dim()-num_fidelity);
+  CopyPylistToClosedIntervalVector(domain_bounds, gaussian_process_mcmc.dim()-num_fidelity, domain_bounds_C);
+
+  std::vector<double> best_so_far_list(gaussian_process_mcmc.num_mcmc());
+  CopyPylistToVector(best_so_far, gaussian_process_mcmc.num_mcmc(), best_so_far_list);
+
+  TensorProductDomain domain(domain_bounds_C.data(), gaussian_process_mcmc.dim()-num_fidelity);
+  const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
+
+  return new PersistentKnowledgeGradientMCMC(gaussian_process_mcmc_object, num_fidelity, gradient_descent_parameters, domain,
+                                             input_container_discrete.points_to_sample.data(), num_pts, max_int_steps,
+                                             best_so_far_list.data());
+}
+
 /*!\rst
   Utility that dispatches KG optimization based on optimizer type and num_to_sample.
   This is just used to reduce copy-pasted code.
@@ -407,7 +837,100 @@ void ExportKnowldegeGradientMCMCFunctions() {
     :type param: int > 0
     :param num_sampled: number of already-sampled points
     :type num_sampled: int > 0
-          )%%");
+          )%%")
+      .def("set_hyperparameters", SetHyperparametersMCMCWrapper, R"%%(
+    Replace the hyperparameter samples in place; the sampled points are kept and not copied again.
+
+    :param hyperparameters_list: covariance hyperparameters (``\alpha``, then the length scales) of each sample
+    :type hyperparameters_list: list of float64 with shape (num_mcmc, dim + 1)
+    :param noise_variance_list: noise variance of each sample
+    :type noise_variance_list: list of float64 with shape (num_mcmc, num_derivatives + 1)
+    :param num_mcmc: number of samples, may differ from the current one
+    :type num_mcmc: int > 0
+          )%%")
+      .def("add_sampled_points", AddSampledPointsMCMCWrapper, R"%%(
+    Add the specified historical data to every GP of the sample.
+
+    :param new_points: coordinates of each new point to add
+    :type new_points: list of float64 with shape (num_new_points, dim)
+    :param new_points_value: function value (and derivatives) at each new point
+    :type new_points_value: list of float64 with shape (num_new_points, num_derivatives + 1)
+    :param num_new_points: number of new points to add
+    :type num_new_points: int
+          )%%")
+      .add_property("num_modifications", &GaussianProcessMCMC::num_modifications,
+                    "Return the number of calls to set_hyperparameters and add_sampled_points so far.");
+
+  boost::python::class_<PersistentKnowledgeGradientMCMC, boost::noncopyable>("KnowledgeGradientMCMCEvaluator", boost::python::no_init)
+      .def("__init__", boost::python::make_constructor(&make_knowledge_gradient_mcmc_evaluator), R"%%(
+    Constructor for a ``GPP.KnowledgeGradientMCMCEvaluator`` object, holding the discrete points and the inner
+    optimizer set up once for every later knowledge gradient evaluation.
+
+    The evaluator points into ``gaussian_process_mcmc``: it is invalidated if that GP is mutated
+    (``set_hyperparameters``, ``add_sampled_points``), after which its methods raise InvalidValueException;
+    build a new evaluator instead.
+
+    :param gaussian_process_mcmc: GaussianProcessMCMC object (holds the GP of each hyperparameter sample)
+    :type gaussian_process_mcmc: GPP.GaussianProcessMCMC
+    :param num_fidelity: number of fidelity dimensions (the last ones of a point)
+    :type num_fidelity: int >= 0
+    :param optimizer_parameters: parameters of the inner posterior mean optimization
+    :type optimizer_parameters: python/cpp_wrappers/optimization._CppOptimizerParameters with GradientDescentParameters
+    :param domain_bounds: [lower, upper] bound pairs of the inner optimization domain
+    :type domain_bounds: list of float64 with shape (dim - num_fidelity, 2)
+    :param discrete_pts: discrete points of each hyperparameter sample
+    :type discrete_pts: list of float64 with shape (num_mcmc, num_pts, dim - num_fidelity)
+    :param num_pts: number of discrete points per hyperparameter sample
+    :type num_pts: int >= 0
+    :param max_int_steps: number of MC integration points in KG
+    :type max_int_steps: int > 0
+    :param best_so_far: best known posterior mean of each hyperparameter sample
+    :type best_so_far: list of float64 with shape (num_mcmc, )
+          )%%")
+      .def("compute_knowledge_gradient", &PersistentKnowledgeGradientMCMC::ComputeKnowledgeGradient, R"%%(
+        Compute the knowledge gradient at points_to_sample; same value as ``compute_knowledge_gradient_mcmc``.
+
+        :param points_to_sample: points at which to evaluate KG
+        :type points_to_sample: list of float64 with shape (num_to_sample, dim)
+        :param points_being_sampled: points that are being sampled in concurrent experiments
+        :type points_being_sampled: list of float64 with shape (num_being_sampled, dim)
+        :param num_to_sample: number of potential future samples (i.e., the "q" in q,p-KG)
+        :type num_to_sample: int > 0
+        :param num_being_sampled: number of points being sampled concurrently (i.e., the p in q,p-KG)
+        :type num_being_sampled: int >= 0
+        :param randomness_source: object containing randomness sources
+        :type randomness_source: GPP.RandomnessSourceContainer
+        :return: computed KG
+        :rtype: float64
+      )%%")
+      .def("compute_grad_knowledge_gradient", &PersistentKnowledgeGradientMCMC::ComputeGradKnowledgeGradient, R"%%(
+        Compute the gradient of knowledge gradient wrt points_to_sample.
+
+        Takes the same arguments as compute_knowledge_gradient.
+
+        :return: gradient of KG wrt points_to_sample
+        :rtype: list of float64 with shape (num_to_sample, dim)
+      )%%")
+      .def("compute_knowledge_gradient_and_grad", &PersistentKnowledgeGradientMCMC::ComputeKnowledgeGradientAndGrad, R"%%(
+        Compute the knowledge gradient and its gradient wrt points_to_sample, from a single Monte Carlo pass.
+
+        Takes the same arguments as compute_knowledge_gradient.
+
+        :return: knowledge gradient and its gradient (wrt points_to_sample)
+        :rtype: list [float64, list of float64 with shape (num_to_sample, dim)]
+      )%%")
+      .def("stochastic_optimization", &PersistentKnowledgeGradientMCMC::StochasticOptimization, R"%%(
+        Optimize the knowledge gradient from points_to_sample, as ``stochastic_optimization_knowledge_gradient_mcmc``.
+
+        Takes the same arguments as compute_knowledge_gradient, and:
+
+        :param stochastic_optimizer_parameters: gradient ascent parameters and constraint penalty (or None)
+        :type stochastic_optimizer_parameters: python/cpp_wrappers/optimization._CppStochasticOptimizerParameters
+        :param initial_gradient: gradient of KG at points_to_sample if already known, else empty
+        :type initial_gradient: list of float64 with shape (num_to_sample, dim) or empty list
+        :return: the optimized points_to_sample
+        :rtype: list of float64 with shape (num_to_sample, dim)
+      )%%");
 
   boost::python::def("compute_knowledge_gradient_mcmc", ComputeKnowledgeGradientMCMCWrapper, R"%%(
     Compute knowledge gradient.
@@ -467,6 +990,54 @@ void ExportKnowldegeGradientMCMCFunctions() {
     :rtype: list of float64 with shape (num_to_sample, dim)
     )%%");
 
+  boost::python::def("compute_knowledge_gradient_and_grad_mcmc", ComputeKnowledgeGradientAndGradMCMCWrapper, R"%%(
+    Compute the knowledge gradient and its gradient at points_to_sample, from a single Monte Carlo pass
+    (the inner posterior mean optimizations are shared).
+
+    Takes the same arguments as compute_grad_knowledge_gradient_mcmc.
+
+    :return: knowledge gradient and its gradient (wrt points_to_sample); the value is the same as
+      compute_knowledge_gradient_mcmc's with the same randomness_source
+    :rtype: list [float64, list of float64 with shape (num_to_sample, dim)]
+    )%%");
+
+  boost::python::def("stochastic_optimization_knowledge_gradient_mcmc", StochasticOptimizationKnowledgeGradientMCMCWrapper, R"%%(
+    Optimize the knowledge gradient from points_to_sample by stochastic gradient ascent, in a single call: the evaluator and its state are built once for every step.
+
+    :param gaussian_process_mcmc: GaussianProcessMCMC object (holds points_sampled, values, noise_variance, derived quantities)
+    :type gaussian_process_mcmc: GPP.GaussianProcessMCMC (boost::python ctor wrapper around optimal_learning::GaussianProcessMCMC)
+    :param num_fidelity: number of fidelity dimensions, must be 0
+    :type num_fidelity: int
+    :param optimizer_parameters: python/cpp_wrappers/optimization._CppOptimizerParameters of the inner optimization
+    :type optimizer_parameters: _CppOptimizerParameters
+    :param domain_bounds: [lower, upper] bound pairs for each dimension
+    :type domain_bounds: list of float64 with shape (dim, 2)
+    :param discrete_pts: points to approximate the KG factor, for each hyperparameter sample
+    :type discrete_pts: list of float64 with shape (num_mcmc, num_pts, dim)
+    :param points_to_sample: initial guess
+    :type points_to_sample: list of float64 with shape (num_to_sample, dim)
+    :param points_being_sampled: points that are being sampled in concurrent experiments
+    :type points_being_sampled: list of float64 with shape (num_being_sampled, dim)
+    :param num_pts: number of points in discrete_pts, for each hyperparameter sample
+    :type num_pts: int > 0
+    :param num_to_sample: number of points to optimize (i.e., the "q" in q,p-KG)
+    :type num_to_sample: int > 0
+    :param num_being_sampled: number of points in points_being_sampled (i.e., the "p" in q,p-KG)
+    :type num_being_sampled: int >= 0
+    :param max_int_steps: number of MC integration points in KG
+    :type max_int_steps: int >= 0
+    :param best_so_far: best known value of objective so far, for each hyperparameter sample
+    :type best_so_far: list of float64 with length num_mcmc
+    :param randomness_source: object containing randomness sources; the normal RNG is used for the MC integration
+    :type randomness_source: GPP.RandomnessSourceContainer (C++ object)
+    :param stochastic_optimizer_parameters: python/cpp_wrappers/optimization._CppStochasticOptimizerParameters object
+    :type stochastic_optimizer_parameters: _CppStochasticOptimizerParameters
+    :param initial_gradient: gradient of KG at points_to_sample if it is already known, empty list otherwise
+    :type initial_gradient: list of float64 with shape (num_to_sample, dim)
+    :return: optimized points_to_sample
+    :rtype: list of float64 with shape (num_to_sample, dim)
+    )%%");
+
   boost::python::def("multistart_knowledge_gradient_mcmc_optimization", MultistartKnowledgeGradientMCMCOptimizationWrapper, R"%%(
     Optimize expected improvement (i.e., solve q,p-EI) over the specified domain using the specified optimization method.
     Can optimize for num_to_sample new points to sample (i.e., aka "q", experiments to run) simultaneously.
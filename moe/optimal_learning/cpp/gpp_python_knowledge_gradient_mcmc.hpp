@@ -18,6 +18,7 @@ namespace optimal_learning {
   1. knowledge gradient (and its gradient) evaluation (uesful for testing)
   2. multistart knowledge gradient optimization (main entry-point)
   3. knowledge gradient evaluation at a list of points (useful for testing, plotting)
+  4. a persistent knowledge gradient evaluator, set up once for repeated evaluations and optimizations
 
   These functions choose between monte-carlo and analytic KG evaluation automatically.
 \endrst*/
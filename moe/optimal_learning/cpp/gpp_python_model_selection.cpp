@@ -18,13 +18,18 @@
 // NOLINT-ing the C, C++ header includes as well; otherwise cpplint gets confused
 #include <algorithm>  // NOLINT(build/include_order)
 #include <limits>  // NOLINT(build/include_order)
+#include <memory>  // NOLINT(build/include_order)
 #include <string>  // NOLINT(build/include_order)
 #include <vector>  // NOLINT(build/include_order)
 
+#include <omp.h>  // NOLINT(build/include_order)
+
+#include <boost/python/class.hpp>  // NOLINT(build/include_order)
 #include <boost/python/def.hpp>  // NOLINT(build/include_order)
 #include <boost/python/dict.hpp>  // NOLINT(build/include_order)
 #include <boost/python/extract.hpp>  // NOLINT(build/include_order)
 #include <boost/python/list.hpp>  // NOLINT(build/include_order)
+#include <boost/python/make_constructor.hpp>  // NOLINT(build/include_order)
 #include <boost/python/object.hpp>  // NOLINT(build/include_order)
 
 #include "gpp_common.hpp"
@@ -376,9 +381,221 @@ boost::python::list RestartedGradientDescentHyperparameterOptimizationWrapper(co
 }
 
 
+/*!\rst
+  Log marginal likelihood of a fixed training set, evaluated at varying hyperparameters.
+
+  The training data are copied into C++ once, at construction (and by AddSampledPoints()), so each
+  evaluation only converts the hyperparameters. The covariance is MaternNu2p5, as in ComputeLogLikelihoodWrapper().
+  Batches of hyperparameters are evaluated in parallel, with one state object per thread.
+\endrst*/
+class PersistentLogMarginalLikelihood {
+ public:
+  PersistentLogMarginalLikelihood(const PythonInterfaceInputContainer& input_container)
+      : log_likelihood_eval_(input_container.points_sampled.data(), input_container.points_sampled_value.data(),
+                             input_container.derivatives.data(), input_container.num_derivatives,
+                             input_container.dim, input_container.num_sampled) {
+    MaternNu2p5 covariance(input_container.dim, input_container.alpha, input_container.lengths.data());
+    log_likelihood_states_.emplace_back(new LogMarginalLikelihoodState(log_likelihood_eval_, covariance,
+                                                                       input_container.noise_variance));
+  }
+
+  int dim() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return log_likelihood_eval_.dim();
+  }
+
+  int num_sampled() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return log_likelihood_eval_.num_sampled();
+  }
+
+  int num_derivatives() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return log_likelihood_eval_.num_derivatives();
+  }
+
+  int num_hyperparameters() const noexcept OL_PURE_FUNCTION OL_WARN_UNUSED_RESULT {
+    return log_likelihood_states_[0]->num_hyperparameters;
+  }
+
+  double ComputeLogLikelihood(const boost::python::list& hyperparameters) {
+    std::vector<double> hyperparameters_C(num_hyperparameters());
+    CopyPylistToVector(hyperparameters, num_hyperparameters(), hyperparameters_C);
+    log_likelihood_states_[0]->SetupState(log_likelihood_eval_, hyperparameters_C.data());
+    return log_likelihood_eval_.ComputeLogLikelihood(*log_likelihood_states_[0]);
+  }
+
+  void ReserveStates(int num_states) {
+    while (static_cast<int>(log_likelihood_states_.size()) < num_states) {
+      const LogMarginalLikelihoodState& state = *log_likelihood_states_[0];
+      log_likelihood_states_.emplace_back(new LogMarginalLikelihoodState(log_likelihood_eval_, *state.covariance_ptr,
+                                                                         state.noise_variance));
+    }
+  }
+
+  /*!\rst
+    Computes the log likelihood and its gradient with the state_index-th state (see ReserveStates()), without
+    holding the GIL: Python threads using distinct states run in parallel.
+  \endrst*/
+  boost::python::list ComputeLogLikelihoodAndGrad(const boost::python::list& hyperparameters, int state_index) {
+    if (state_index < 0 || state_index >= static_cast<int>(log_likelihood_states_.size())) {
+      OL_THROW_EXCEPTION(BoundsException<int>, "Invalid state index.", state_index, 0,
+                         static_cast<int>(log_likelihood_states_.size()) - 1);
+    }
+    std::vector<double> hyperparameters_C(num_hyperparameters());
+    CopyPylistToVector(hyperparameters, num_hyperparameters(), hyperparameters_C);
+
+    std::vector<double> grad_log_likelihood(num_hyperparameters());
+    double log_likelihood;
+    {
+      ScopedGILRelease gil_release;
+      LogMarginalLikelihoodState * log_likelihood_state = log_likelihood_states_[state_index].get();
+      log_likelihood_state->SetupState(log_likelihood_eval_, hyperparameters_C.data());
+      log_likelihood = log_likelihood_eval_.ComputeLogLikelihood(*log_likelihood_state);
+      log_likelihood_eval_.ComputeGradLogLikelihood(log_likelihood_state, grad_log_likelihood.data());
+    }
+
+    boost::python::list output;
+    output.append(log_likelihood);
+    output.append(VectorToPylist(grad_log_likelihood));
+    return output;
+  }
+
+  boost::python::list ComputeLogLikelihoodBatch(const boost::python::list& hyperparameters, int num_batch,
+                                                int max_num_threads) {
+    std::vector<double> hyperparameters_C(num_batch*num_hyperparameters());
+    CopyPylistToVector(hyperparameters, num_batch*num_hyperparameters(), hyperparameters_C);
+    max_num_threads = std::max(1, std::min(max_num_threads, num_batch));
+    ReserveStates(max_num_threads);
+
+    std::vector<double> log_likelihood(num_batch);
+    // Python objects are only touched outside of the parallel region
+#pragma omp parallel for num_threads(max_num_threads) schedule(static) if (num_batch > 1)
+    for (int i = 0; i < num_batch; ++i) {
+      LogMarginalLikelihoodState * log_likelihood_state = log_likelihood_states_[omp_get_thread_num()].get();
+      log_likelihood_state->SetupState(log_likelihood_eval_, hyperparameters_C.data() + i*num_hyperparameters());
+      log_likelihood[i] = log_likelihood_eval_.ComputeLogLikelihood(*log_likelihood_state);
+    }
+    return VectorToPylist(log_likelihood);
+  }
+
+  void AddSampledPoints(const boost::python::list& new_points, const boost::python::list& new_points_value,
+                        int num_new_points) {
+    std::vector<double> new_points_C(dim()*num_new_points);
+    std::vector<double> new_points_value_C(num_new_points*(1 + num_derivatives()));
+    CopyPylistToVector(new_points, dim()*num_new_points, new_points_C);
+    CopyPylistToVector(new_points_value, num_new_points*(1 + num_derivatives()), new_points_value_C);
+    log_likelihood_eval_.AddSampledPoints(new_points_C.data(), new_points_value_C.data(), num_new_points);
+  }
+
+  OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(PersistentLogMarginalLikelihood);
+
+ private:
+  LogMarginalLikelihoodEvaluator log_likelihood_eval_;
+  // one state per thread; the first one also serves single evaluations
+  std::vector<std::unique_ptr<LogMarginalLikelihoodState>> log_likelihood_states_;
+};
+
+/*!\rst
+  Surrogate "constructor" for PersistentLogMarginalLikelihood intended only for use by boost::python.
+\endrst*/
+PersistentLogMarginalLikelihood * make_log_marginal_likelihood(const boost::python::list& points_sampled,
+                                                               const boost::python::list& points_sampled_value,
+                                                               const boost::python::list& derivatives,
+                                                               int num_derivatives, int dim, int num_sampled) {
+  const int num_to_sample = 0;
+  const boost::python::list points_to_sample_dummy;
+  // placeholder hyperparameters (all ones); every evaluation sets its own
+  boost::python::list hyperparameters, lengths, noise_variance;
+  hyperparameters.append(1.0);
+  for (int i = 0; i < dim; ++i) {
+    lengths.append(1.0);
+  }
+  hyperparameters.append(lengths);
+  for (int i = 0; i < num_derivatives + 1; ++i) {
+    noise_variance.append(1.0);
+  }
+  PythonInterfaceInputContainer input_container(hyperparameters, points_sampled, points_sampled_value, noise_variance,
+                                                points_to_sample_dummy, derivatives, num_derivatives, dim, num_sampled, num_to_sample);
+  return new PersistentLogMarginalLikelihood(input_container);
+}
+
 }  // end unnamed namespace
 
 void ExportModelSelectionFunctions() {
+  boost::python::class_<PersistentLogMarginalLikelihood, boost::noncopyable>("LogMarginalLikelihood", boost::python::no_init)
+      .def("__init__", boost::python::make_constructor(&make_log_marginal_likelihood), R"%%(
+    Constructor for a ``GPP.LogMarginalLikelihood`` object, holding the training data in C++.
+
+    The covariance is the same as in ``compute_log_likelihood``.
+
+    :param points_sampled: points that have already been sampled
+    :type points_sampled: list of float64 with shape (num_sampled, dim)
+    :param points_sampled_value: values of the already-sampled points
+    :type points_sampled_value: list of float64 with shape (num_sampled, num_derivatives + 1)
+    :param derivatives: indexes of the dimensions with observed derivatives
+    :type derivatives: list of int with shape (num_derivatives, )
+    :param num_derivatives: number of observed derivatives
+    :type num_derivatives: int >= 0
+    :param dim: the spatial dimension of a point (i.e., number of independent params in experiment)
+    :type dim: int > 0
+    :param num_sampled: number of already-sampled points
+    :type num_sampled: int > 0
+          )%%")
+      .add_property("dim", &PersistentLogMarginalLikelihood::dim, "Return the number of spatial dimensions.")
+      .add_property("num_sampled", &PersistentLogMarginalLikelihood::num_sampled, "Return the number of sampled points.")
+      .def("compute_log_likelihood", &PersistentLogMarginalLikelihood::ComputeLogLikelihood, R"%%(
+        Computes the log marginal likelihood of the held training data at the given hyperparameters.
+
+        :param hyperparameters: signal variance ``\alpha``, the ``dim`` length scales, then the ``num_derivatives + 1`` noise variances
+        :type hyperparameters: list of float64 with shape (dim + num_derivatives + 2, )
+        :return: computed log marginal likelihood of prior
+        :rtype: float64
+      )%%")
+      .def("compute_log_likelihood_and_grad", &PersistentLogMarginalLikelihood::ComputeLogLikelihoodAndGrad, R"%%(
+        Computes the log marginal likelihood of the held training data and its gradient wrt the hyperparameters.
+
+        The GIL is released during the computation, so Python threads can call this concurrently as long as each
+        one uses its own ``state_index``.
+
+        :param hyperparameters: laid out as in ``compute_log_likelihood``
+        :type hyperparameters: list of float64 with shape (dim + num_derivatives + 2, )
+        :param state_index: which evaluation state to use, see ``reserve_states``
+        :type state_index: int in [0, number of reserved states)
+        :return: the log marginal likelihood, then its gradient wrt each hyperparameter
+        :rtype: list of [float64, list of float64 with shape (dim + num_derivatives + 2, )]
+      )%%")
+      .def("reserve_states", &PersistentLogMarginalLikelihood::ReserveStates, R"%%(
+        Makes sure that at least ``num_states`` evaluation states exist (there is always one).
+
+        Must not be called while another thread is inside ``compute_log_likelihood_and_grad``.
+
+        :param num_states: number of states needed
+        :type num_states: int > 0
+      )%%")
+      .def("compute_log_likelihood_batch", &PersistentLogMarginalLikelihood::ComputeLogLikelihoodBatch, R"%%(
+        Computes the log marginal likelihood of the held training data at each set of hyperparameters.
+
+        Equivalent to calling ``compute_log_likelihood`` on each row, but the loop runs in C++ and is multithreaded.
+
+        :param hyperparameters: one row per set, laid out as in ``compute_log_likelihood``
+        :type hyperparameters: list of float64 with shape (num_batch, dim + num_derivatives + 2)
+        :param num_batch: number of sets of hyperparameters
+        :type num_batch: int > 0
+        :param max_num_threads: max number of threads to use
+        :type max_num_threads: int >= 1
+        :return: log marginal likelihood at each set of hyperparameters, in the same order
+        :rtype: list of float64 with shape (num_batch, )
+      )%%")
+      .def("add_sampled_points", &PersistentLogMarginalLikelihood::AddSampledPoints, R"%%(
+        Add the specified (point, fcn value) historical data to the held training data.
+
+        :param new_points: coordinates of each new point to add
+        :type new_points: list of float64 with shape (num_new_points, dim)
+        :param new_points_value: function value at each new point
+        :type new_points_value: list of float64 with shape (num_new_points, num_derivatives + 1)
+        :param num_new_points: number of new points to add
+        :type num_new_points: int
+      )%%")
+      ;
+
   boost::python::def("compute_log_likelihood", ComputeLogLikelihoodWrapper, R"%%(
     Computes the specified log likelihood measure of model fit using the given
     hyperparameters.
@@ -43,6 +43,23 @@ class BasePrior(object):
         """
         pass
 
+    def lnprob_batch(self, thetas):
+        """
+        Returns the log probability of each row of thetas.
+        Subclasses can override it with a vectorized version.
+
+        Parameters
+        ----------
+        thetas : (N, D) numpy array
+            N hyperparameter configurations in log space.
+
+        Returns
+        -------
+        (N,) np.array
+            The log probability of each configuration
+        """
+        return np.array([self.lnprob(theta) for theta in thetas], dtype=float)
+
     def sample_from_prior(self, n_samples):
         """
         Returns N samples from the prior.
@@ -76,6 +93,19 @@ class BasePrior(object):
         """
         pass
 
+    def bounds(self):
+        """
+        Returns the support of the prior, e.g. for bounded optimizers.
+        Subclasses with a bounded support override it.
+
+        Returns
+        -------
+        list of (float or None, float or None), or None
+            The (lower, upper) bounds of each hyperparameter in log space,
+            None where unbounded; None if the prior is unbounded.
+        """
+        return None
+
 
 class TophatPrior(BasePrior):
 
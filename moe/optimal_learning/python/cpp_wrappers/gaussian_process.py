@@ -338,6 +338,24 @@ class GaussianProcess(GaussianProcessInterface):
             num_to_add,
         )
 
+    def set_hyperparameters(self, covariance_function, noise_variance):
+        r"""Replace the covariance function and the noise variance of this GP, keeping its data (not sent to C++ again).
+
+        Also forces recomputation of all derived quantities for GP to remain consistent.
+
+        :param covariance_function: covariance object encoding assumptions about the GP's behavior on our data
+        :type covariance_function: :class:`moe.optimal_learning.python.interfaces.covariance_interface.CovarianceInterface` subclass
+        :param noise_variance: noise variance of the function values and of each derivative
+        :type noise_variance: array of float64 with shape (num_derivatives + 1, )
+
+        """
+        self._covariance = copy.deepcopy(covariance_function)
+        self._noise_variance = copy.deepcopy(noise_variance)
+        self._gaussian_process.set_hyperparameters(
+            cpp_utils.cppify(self._covariance.hyperparameters),
+            cpp_utils.cppify(self._noise_variance),
+        )
+
     def sample_point_from_gp(self, point_to_sample, noise_variance=0.0):
         r"""Sample a function value from a Gaussian Process prior, provided a point at which to sample.
 
@@ -19,6 +19,7 @@ import numpy
 import moe.build.GPP as C_GP
 from moe.optimal_learning.python.constant import DEFAULT_EXPECTED_IMPROVEMENT_MC_ITERATIONS, DEFAULT_MAX_NUM_THREADS
 import moe.optimal_learning.python.cpp_wrappers.cpp_utils as cpp_utils
+import moe.optimal_learning.python.cpp_wrappers.optimization as cpp_optimization
 from moe.optimal_learning.python.interfaces.optimization_interface import OptimizableInterface
 
 
@@ -244,6 +245,42 @@ class GaussianProcessMCMC(object):
         """
         return copy.deepcopy(self._historical_data)
 
+    def set_hyperparameters(self, hyperparameters_list, noise_variance_list):
+        """Replace the hyperparameter samples in place, keeping the sampled points (which are not sent to C++ again).
+
+        :param hyperparameters_list: covariance hyperparameters of each sample
+        :type hyperparameters_list: array of float64 with shape (num_mcmc, dim + 1)
+        :param noise_variance_list: noise variance of each sample
+        :type noise_variance_list: array of float64 with shape (num_mcmc, num_derivatives + 1)
+
+        """
+        self._hyperparameters_list = copy.deepcopy(hyperparameters_list)
+        self._noise_variance_list = copy.deepcopy(noise_variance_list)
+        self._num_mcmc = hyperparameters_list.shape[0]
+        self._gaussian_process_mcmc.set_hyperparameters(
+            cpp_utils.cppify(self._hyperparameters_list),
+            cpp_utils.cppify(self._noise_variance_list),
+            self._num_mcmc,
+        )
+
+    def add_sampled_points(self, sampled_points):
+        r"""Add sampled point(s) (point, value, noise) to the prior data of every GP of the sample.
+
+        Only the new points are sent to C++.
+
+        :param sampled_points: :class:`moe.optimal_learning.python.SamplePoint` objects to load
+          into the GP (containing point, function value, and noise variance)
+        :type sampled_points: list of :class:`~moe.optimal_learning.python.SamplePoint` objects (or SamplePoint-like iterables)
+
+        """
+        num_sampled_prev = self.num_sampled
+        self._historical_data.append_sample_points(sampled_points)
+        self._gaussian_process_mcmc.add_sampled_points(
+            cpp_utils.cppify(self._historical_data.points_sampled[num_sampled_prev:, ...]),
+            cpp_utils.cppify(self._historical_data.points_sampled_value[num_sampled_prev:]),
+            self.num_sampled - num_sampled_prev,
+        )
+
 def multistart_knowledge_gradient_mcmc_optimization(
         kg_optimizer,
         inner_optimizer,
@@ -413,6 +450,37 @@ class KnowledgeGradientMCMC(OptimizableInterface):
             self._randomness = randomness
 
         self.objective_type = None  # Not used for KG, but the field is expected in C++
+        self._evaluator = None
+        self._evaluator_num_modifications = None
+
+    def create_evaluator(self):
+        """Set up the C++ evaluator once, for all later evaluations and optimizations of KG.
+
+        The discrete points, the inner optimizer and the covariance between the sampled and the discrete points
+        are then converted and computed once instead of at every call. Copies of this object share the evaluator.
+
+        .. Note:: The evaluator is invalidated if ``gaussian_process_mcmc`` is mutated (``set_hyperparameters``,
+          ``add_sampled_points``): it is then rebuilt before its next use.
+
+        """
+        self._evaluator_num_modifications = self._gaussian_process_mcmc._gaussian_process_mcmc.num_modifications
+        self._evaluator = C_GP.KnowledgeGradientMCMCEvaluator(
+            self._gaussian_process_mcmc._gaussian_process_mcmc,
+            self._num_fidelity,
+            self._inner_optimizer.optimizer_parameters,
+            [float(x) for x in cpp_utils.cppify(self._inner_optimizer.domain.domain_bounds)],
+            cpp_utils.cppify(self._discrete_pts_list),
+            self.discrete,
+            self._num_mc_iterations,
+            cpp_utils.cppify(self._best_so_far_list),
+        )
+
+    def _get_evaluator(self):
+        """Return the C++ evaluator (None if not created), rebuilt first if ``gaussian_process_mcmc`` was mutated."""
+        num_modifications = self._gaussian_process_mcmc._gaussian_process_mcmc.num_modifications
+        if self._evaluator is not None and self._evaluator_num_modifications != num_modifications:
+            self.create_evaluator()
+        return self._evaluator
 
     @property
     def dim(self):
@@ -552,6 +620,15 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         :rtype: float64
 
         """
+        evaluator = self._get_evaluator()
+        if evaluator is not None:
+            return evaluator.compute_knowledge_gradient(
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._randomness,
+            )
 
         knowledge_gradient_mcmc = C_GP.compute_knowledge_gradient_mcmc(
             self._gaussian_process_mcmc._gaussian_process_mcmc,
@@ -600,6 +677,17 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         :rtype: array of float64 with shape (num_to_sample, dim)
 
         """
+        evaluator = self._get_evaluator()
+        if evaluator is not None:
+            grad_knowledge_gradient_mcmc = evaluator.compute_grad_knowledge_gradient(
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._randomness,
+            )
+            return cpp_utils.uncppify(grad_knowledge_gradient_mcmc, (self.num_to_sample, self.dim))
+
         grad_knowledge_gradient_mcmc = C_GP.compute_grad_knowledge_gradient_mcmc(
             self._gaussian_process_mcmc._gaussian_process_mcmc,
             self._num_fidelity,
@@ -618,6 +706,100 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         return cpp_utils.uncppify(grad_knowledge_gradient_mcmc, (self.num_to_sample, self.dim))
     compute_grad_objective_function = compute_grad_knowledge_gradient_mcmc
 
+    def compute_knowledge_gradient_and_grad_mcmc(self):
+        r"""Compute the knowledge gradient and its gradient at ``points_to_sample`` with a single Monte-Carlo pass.
+
+        The gradient computation already solves the inner posterior mean problems needed by the knowledge gradient,
+        so this costs about as much as :meth:`compute_grad_knowledge_gradient_mcmc` alone. The value is the same as
+        :meth:`compute_knowledge_gradient_mcmc`'s.
+
+        :return: the knowledge gradient and its gradient wrt ``points_to_sample``
+        :rtype: tuple of (float64, array of float64 with shape (num_to_sample, dim))
+
+        """
+        evaluator = self._get_evaluator()
+        if evaluator is not None:
+            knowledge_gradient_mcmc, grad_knowledge_gradient_mcmc = evaluator.compute_knowledge_gradient_and_grad(
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._randomness,
+            )
+        else:
+            knowledge_gradient_mcmc, grad_knowledge_gradient_mcmc = C_GP.compute_knowledge_gradient_and_grad_mcmc(
+                self._gaussian_process_mcmc._gaussian_process_mcmc,
+                self._num_fidelity,
+                self._inner_optimizer.optimizer_parameters,
+                cpp_utils.cppify(self._inner_optimizer.domain.domain_bounds),
+                cpp_utils.cppify(self._discrete_pts_list),
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.discrete,
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._num_mc_iterations,
+                cpp_utils.cppify(self._best_so_far_list),
+                self._randomness,
+            )
+        return knowledge_gradient_mcmc, cpp_utils.uncppify(grad_knowledge_gradient_mcmc, (self.num_to_sample, self.dim))
+
+    compute_kg_and_grad = compute_knowledge_gradient_and_grad_mcmc
+
+    def stochastic_optimization(self, gradient_ascent_parameters, constraint_penalty=None, initial_gradient=None):
+        r"""Optimize the knowledge gradient from ``points_to_sample`` by stochastic gradient ascent.
+
+        The whole optimization runs in C++ with a single evaluator, instead of one call per step.
+        ``points_to_sample`` is set to the result.
+
+        :param gradient_ascent_parameters: stochastic gradient ascent to run
+        :type gradient_ascent_parameters: cpp_wrappers.optimization.StochasticGradientAscentParameters
+        :param constraint_penalty: linear constraint on the points, if any: gradient steps do not leave it
+        :type constraint_penalty: C_GP.LinearConstraintPenalty
+        :param initial_gradient: gradient of the knowledge gradient at ``points_to_sample``, if already known
+          (e.g., from :meth:`compute_knowledge_gradient_and_grad_mcmc`)
+        :type initial_gradient: array of float64 with shape (num_to_sample, dim)
+        :return: the optimized points
+        :rtype: array of float64 with shape (num_to_sample, dim)
+
+        """
+        stochastic_optimizer_parameters = cpp_optimization._CppStochasticOptimizerParameters(
+            gradient_ascent_parameters=gradient_ascent_parameters,
+            constraint_penalty=constraint_penalty,
+        )
+        initial_gradient = cpp_utils.cppify(initial_gradient) if initial_gradient is not None else []
+        evaluator = self._get_evaluator()
+        if evaluator is not None:
+            best_points_to_sample = evaluator.stochastic_optimization(
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._randomness,
+                stochastic_optimizer_parameters,
+                initial_gradient,
+            )
+        else:
+            best_points_to_sample = C_GP.stochastic_optimization_knowledge_gradient_mcmc(
+                self._gaussian_process_mcmc._gaussian_process_mcmc,
+                self._num_fidelity,
+                self._inner_optimizer.optimizer_parameters,
+                cpp_utils.cppify(self._inner_optimizer.domain.domain_bounds),
+                cpp_utils.cppify(self._discrete_pts_list),
+                cpp_utils.cppify(self._points_to_sample),
+                cpp_utils.cppify(self._points_being_sampled),
+                self.discrete,
+                self.num_to_sample,
+                self.num_being_sampled,
+                self._num_mc_iterations,
+                cpp_utils.cppify(self._best_so_far_list),
+                self._randomness,
+                stochastic_optimizer_parameters,
+                initial_gradient,
+            )
+        self.set_current_point(cpp_utils.uncppify(best_points_to_sample, (self.num_to_sample, self.dim)))
+        return self.get_current_point()
+
     def compute_hessian_objective_function(self, **kwargs):
         """We do not currently support computation of the (spatial) hessian of knowledge gradient."""
         raise NotImplementedError('Currently we cannot compute the hessian of knowledge gradient.')
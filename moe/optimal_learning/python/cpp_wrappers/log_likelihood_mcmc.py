@@ -53,17 +53,63 @@ Again, we can maximize this quanitity over hyperparameters to help us choose the
 from __future__ import print_function
 
 from builtins import object
+from concurrent.futures import ThreadPoolExecutor
 import copy
+import queue
 
 import numpy
 import emcee
 from scipy import optimize
 
 import moe.build.GPP as C_GP
+from moe.optimal_learning.python.constant import DEFAULT_MAX_NUM_THREADS
 from moe.optimal_learning.python.cpp_wrappers import cpp_utils
 from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponential
 from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
 from moe.optimal_learning.python.cpp_wrappers.knowledge_gradient_mcmc import GaussianProcessMCMC
+from moe.optimal_learning.python.hamiltonian_monte_carlo import HamiltonianMonteCarlo
+
+
+def integrated_autocorr_time(chain):
+    r"""Estimate the integrated autocorrelation time of an ensemble chain, in steps.
+
+    The estimate is computed per hyperparameter with ``emcee.autocorr.integrated_time`` and the slowest one is
+    returned. It is biased low on chains shorter than ~50 autocorrelation times, so callers should prefer an estimate
+    from a longer chain when they have one.
+
+    :param chain: samples of each walker
+    :type chain: array of float64 with shape (num_steps, num_walkers, num_hyperparameters)
+    :return: autocorrelation time of the chain, ``nan`` if a walker never moved
+    :rtype: float64
+
+    """
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        # tol=0: the short chain check is left to the caller
+        tau = emcee.autocorr.integrated_time(chain, tol=0)
+    return numpy.max(tau)
+
+
+def split_rhat(chain):
+    r"""Compute the split :math:`\hat{R}` (Gelman et al., Bayesian Data Analysis, 11.4) of an ensemble chain.
+
+    Every walker is split in two halves and the halves are compared as independent chains; values close to 1
+    mean that the walkers agree with each other and with themselves over time.
+
+    :param chain: samples of each walker
+    :type chain: array of float64 with shape (num_steps, num_walkers, num_hyperparameters)
+    :return: largest split R-hat over the hyperparameters, ``nan`` if a walker never moved
+    :rtype: float64
+
+    """
+    half = chain.shape[0] // 2
+    halves = numpy.concatenate((chain[:half], chain[half:2*half]), axis=1)
+    chain_means = numpy.mean(halves, axis=0)
+    between = half * numpy.var(chain_means, axis=0, ddof=1)
+    within = numpy.mean(numpy.var(halves, axis=0, ddof=1), axis=0)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        rhat = numpy.sqrt(((half - 1.0) / half * within + between / half) / within)
+    return numpy.max(rhat)
+
 
 class GaussianProcessLogLikelihoodMCMC(object):
 
@@ -88,7 +134,9 @@ class GaussianProcessLogLikelihoodMCMC(object):
     """
 
     def __init__(self, historical_data, derivatives, prior, chain_length, burnin_steps, n_hypers,
-                 log_likelihood_type=C_GP.LogLikelihoodTypes.log_marginal_likelihood, noisy = True, rng = None):
+                 log_likelihood_type=C_GP.LogLikelihoodTypes.log_marginal_likelihood, noisy = True, rng = None,
+                 sampler='emcee', target_effective_samples=None, convergence_check_interval=50, max_split_rhat=None,
+                 num_multistarts=8):
         """Construct a LogLikelihood object that knows how to call C++ for evaluation of member functions.
 
         :param covariance_function: covariance object encoding assumptions about the GP's behavior on our data
@@ -98,6 +146,24 @@ class GaussianProcessLogLikelihoodMCMC(object):
         :type historical_data: :class:`moe.optimal_learning.python.data_containers.HistoricalData` object
         :param log_likelihood_type: enum specifying which log likelihood measure to compute
         :type log_likelihood_type: GPP.LogLikelihoodTypes
+        :param sampler: hyperparameter sampler used by train(): 'emcee' (affine-invariant ensemble, ``chain_length``
+          and ``burnin_steps`` ensemble moves) or 'hmc' (Hamiltonian Monte Carlo with the analytic gradients, one chain
+          per hyperparameter sample, ``chain_length`` and ``burnin_steps`` HMC transitions), 'map' (the ``n_hypers``
+          best local maxima of the posterior, see :meth:`optimize`) or 'laplace' (``n_hypers`` samples of the Laplace
+          approximation at the maximum a posteriori)
+        :type sampler: str
+        :param target_effective_samples: if given, each train() stops the 'emcee' chain as soon as it holds this many
+          effective samples, i.e. num_walkers * num_steps / autocorrelation time; ``chain_length`` becomes the upper
+          cap. The autocorrelation time is first estimated on the burn-in chain and then on any longer chain, see
+          :func:`integrated_autocorr_time`. None always runs ``chain_length`` steps
+        :type target_effective_samples: int > 0 or None
+        :param convergence_check_interval: number of steps between two convergence checks of the chain
+        :type convergence_check_interval: int > 0
+        :param max_split_rhat: if given, a converged chain must also have a split R-hat (see :func:`split_rhat`) below
+          this value; walkers stuck in a secondary mode keep it high
+        :type max_split_rhat: float64 > 1
+        :param num_multistarts: number of L-BFGS-B starts of the 'map' and 'laplace' samplers
+        :type num_multistarts: int > 0
 
         """
         self._historical_data = copy.deepcopy(historical_data)
@@ -112,6 +178,7 @@ class GaussianProcessLogLikelihoodMCMC(object):
         self.burned = False
         self.burnin_steps = burnin_steps
         self._models = []
+        self._gaussian_process_mcmc = None
         self.noisy = noisy
 
         if rng is None:
@@ -121,6 +188,35 @@ class GaussianProcessLogLikelihoodMCMC(object):
         self.n_hypers = n_hypers
         self.n_chains = max(n_hypers, 2*(self._historical_data.dim+1+1+self._num_derivatives))
 
+        # The emcee target is evaluated many times per train() on the same data, so it is kept in C++
+        self._log_likelihood_eval = None
+        if self.objective_type == C_GP.LogLikelihoodTypes.log_marginal_likelihood:
+            self._log_likelihood_eval = C_GP.LogMarginalLikelihood(
+                    cpp_utils.cppify(self._points_sampled),
+                    cpp_utils.cppify(self._points_sampled_value),
+                    cpp_utils.cppify(self._derivatives), self._num_derivatives,
+                    self.dim,
+                    self._num_sampled,
+                    )
+
+        if sampler not in ('emcee', 'hmc', 'map', 'laplace'):
+            raise ValueError("Unknown hyperparameter sampler: {}".format(sampler))
+        if sampler != 'emcee' and self._log_likelihood_eval is None:
+            raise ValueError("The '{}' sampler needs the log marginal likelihood gradient".format(sampler))
+        self.sampler = sampler
+        self._hmc = None
+        self.num_multistarts = num_multistarts
+        self._map_hypers = None
+
+        if target_effective_samples is not None and sampler != 'emcee':
+            raise ValueError("The convergence diagnostics need the walkers of the 'emcee' sampler")
+        self.target_effective_samples = target_effective_samples
+        self.convergence_check_interval = convergence_check_interval
+        self.max_split_rhat = max_split_rhat
+        self._autocorr_time = None
+        # Number of steps run by the last train(), after the burn-in
+        self.last_chain_length = 0
+
     @property
     def dim(self):
         """Return the number of spatial dimensions."""
@@ -184,10 +280,14 @@ class GaussianProcessLogLikelihoodMCMC(object):
             hyperparameter specified in the kernel.
         """
 
-        if do_optimize:
+        if do_optimize and self.sampler == 'hmc':
+          self._sample_hmc()
+        elif do_optimize and self.sampler in ('map', 'laplace'):
+          self.hypers = self._find_map(laplace=(self.sampler == 'laplace'))
+        elif do_optimize:
           # We have one walker for each hyperparameter configuration
           sampler = emcee.EnsembleSampler(self.n_chains, 1 + self.dim + self._num_derivatives + 1,
-                                            self.compute_log_likelihood)
+                                            self.compute_log_likelihood_batch, vectorize=True)
 
           # Do a burn-in in the first iteration
           if not self.burned:
@@ -199,12 +299,19 @@ class GaussianProcessLogLikelihoodMCMC(object):
             # Run MCMC sampling
             self.p0, _, _ = sampler.run_mcmc(self.p0, self.burnin_steps,
                                              rstate0=self.rng)
+            if self.target_effective_samples is not None:
+                # The burn-in is the longest chain we get, skip its transient first half
+                self._autocorr_time = integrated_autocorr_time(sampler.get_chain(discard=self.burnin_steps // 2))
 
             self.burned = True
 
           # Start sampling
-          pos, _, _ = sampler.run_mcmc(self.p0, self.chain_length,
-                                       rstate0=self.rng, skip_initial_state_check=True)
+          if self.target_effective_samples is None:
+            pos, _, _ = sampler.run_mcmc(self.p0, self.chain_length,
+                                         rstate0=self.rng, skip_initial_state_check=True)
+            self.last_chain_length = self.chain_length
+          else:
+            pos = self._run_until_converged(sampler)
 
           # Save the current position, it will be the start point in
           # the next iteration
@@ -214,65 +321,219 @@ class GaussianProcessLogLikelihoodMCMC(object):
           self.hypers = sampler.chain[numpy.random.choice(self.n_chains, self.n_hypers), -1]
 
         self.is_trained = True
-        self._models = []
         hypers_list = []
         noises_list = []
         for sample in self.hypers:
             if numpy.any((-20 > sample) + (sample > 20)):
                 continue
             sample = numpy.exp(sample)
-            # Instantiate a GP for each hyperparameter configuration
             cov_hyps = sample[:(self.dim+1)]
             hypers_list.append(cov_hyps)
-            se = SquareExponential(cov_hyps)
             if self.noisy:
                 noise = sample[(self.dim+1):]
             else:
                 noise = numpy.array((1+self._num_derivatives)*[1.e-8])
             noises_list.append(noise)
-            model = GaussianProcess(se, noise,
-                                    self._historical_data,
-                                    self.derivatives)
-            self._models.append(model)
 
-        self._gaussian_process_mcmc = GaussianProcessMCMC(numpy.array(hypers_list), numpy.array(noises_list),
-                                                          self._historical_data, self.derivatives)
+        # A GP for each hyperparameter configuration. Existing GPs only get the new hyperparameters: their data is
+        # neither copied nor sent to C++ again
+        if len(self._models) == len(hypers_list):
+            for model, cov_hyps, noise in zip(self._models, hypers_list, noises_list):
+                model.set_hyperparameters(SquareExponential(cov_hyps), noise)
+        else:
+            self._models = [GaussianProcess(SquareExponential(cov_hyps), noise, self._historical_data, self.derivatives)
+                            for cov_hyps, noise in zip(hypers_list, noises_list)]
+
+        self._hypers_list = numpy.array(hypers_list)
+        self._noises_list = numpy.array(noises_list)
+        if self._gaussian_process_mcmc is None:
+            self._gaussian_process_mcmc = GaussianProcessMCMC(self._hypers_list, self._noises_list,
+                                                              self._historical_data, self.derivatives)
+        else:
+            self._gaussian_process_mcmc.set_hyperparameters(self._hypers_list, self._noises_list)
 
-    def optimize(self, do_optimize=True, **kwargs):
+    def set_hypers(self, hypers):
+        """Use the given hyperparameter samples (log scale), e.g. drawn by another sampler, without sampling.
 
-        if self.prior is None:
-            self.p0 = numpy.random.rand(1 + self.dim + self._num_derivatives + 1)
-        else:
-            self.p0 = self.prior.sample_from_prior(1)
+        :param hypers: hyperparameter samples
+        :type hypers: array of float64 with shape (num_samples, num_hyperparameters)
 
-        self.hypers = [optimize.minimize(self.nll, self.p0.ravel()).x]
+        """
+        self.hypers = numpy.array(hypers, dtype=float, ndmin=2)
+        self.train(do_optimize=False)
 
-        self.is_trained = True
-        self._models = []
-        hypers_list = []
-        noises_list = []
-        for sample in self.hypers:
-            print(sample)
-            if numpy.any((-20 > sample) + (sample > 20)):
-                continue
-            sample = numpy.exp(sample)
-            # Instantiate a GP for each hyperparameter configuration
-            cov_hyps = sample[:(self.dim+1)]
-            hypers_list.append(cov_hyps)
-            se = SquareExponential(cov_hyps)
-            if self.noisy:
-                noise = sample[(self.dim+1):]
+    def get_chain_state(self):
+        """Return what train() needs to continue the current chain, e.g. in another process.
+
+        :return: chain state, to be passed to :meth:`set_chain_state`
+        :rtype: dict
+
+        """
+        return {
+            'p0': numpy.copy(self.p0) if self.burned else None,
+            'burned': self.burned,
+            'step_size': self._hmc.step_size if self._hmc is not None else None,
+            'autocorr_time': self._autocorr_time,
+        }
+
+    def set_chain_state(self, state):
+        """Continue the chain saved by :meth:`get_chain_state` instead of starting with a burn-in.
+
+        :param state: chain state returned by :meth:`get_chain_state`
+        :type state: dict
+
+        """
+        self.burned = state['burned']
+        if self.burned:
+            self.p0 = numpy.copy(state['p0'])
+        if state['step_size'] is not None:
+            self._hmc = HamiltonianMonteCarlo(self.compute_log_likelihood_and_grad, step_size=state['step_size'],
+                                              rng=self.rng)
+        self._autocorr_time = state['autocorr_time']
+
+    def _run_until_converged(self, sampler):
+        """Extend the chain of sampler from self.p0 until it reaches the target effective samples or chain_length."""
+        sampler.reset()
+        steps = min(self.convergence_check_interval, self.chain_length)
+        pos, _, _ = sampler.run_mcmc(self.p0, steps, rstate0=self.rng, skip_initial_state_check=True)
+        while True:
+            chain = sampler.get_chain()
+            autocorr_time = integrated_autocorr_time(chain)
+            if autocorr_time * 50 <= steps:
+                # Long enough to trust its own estimate
+                self._autocorr_time = autocorr_time
+            elif self._autocorr_time is not None:
+                autocorr_time = max(autocorr_time, self._autocorr_time)
+            converged = self.n_chains * steps / autocorr_time >= self.target_effective_samples
+            if converged and self.max_split_rhat is not None:
+                converged = split_rhat(chain) <= self.max_split_rhat
+            if converged or steps >= self.chain_length:
+                break
+            block = min(self.convergence_check_interval, self.chain_length - steps)
+            pos, _, _ = sampler.run_mcmc(None, block, skip_initial_state_check=True)
+            steps += block
+        self.last_chain_length = steps
+        return pos
+
+    def _sample_hmc(self):
+        """Sample self.hypers with Hamiltonian Monte Carlo, one chain per hyperparameter configuration."""
+        if self._hmc is None:
+            self._hmc = HamiltonianMonteCarlo(self.compute_log_likelihood_and_grad, rng=self.rng)
+
+        # Do a burn-in in the first iteration, it also tunes the step size
+        if not self.burned:
+            if self.prior is None:
+                self.p0 = numpy.random.rand(self.n_hypers, 1 + self.dim + self._num_derivatives + 1)
             else:
-                noise = numpy.array((1+self._num_derivatives)*[1.e-8])
-            noises_list.append(noise)
-            model = GaussianProcess(se, noise,
-                                    self._historical_data,
-                                    self.derivatives)
-            self._models.append(model)
+                self.p0 = self.prior.sample_from_prior(self.n_hypers)
+            self.p0, _ = self._hmc.run(self.p0, self.burnin_steps, adapt_step_size=True)
+            self.burned = True
+
+        # Continue the chains from their current position
+        self.p0, _ = self._hmc.run(self.p0, self.chain_length)
+        self.last_chain_length = self.chain_length
+        self.hypers = self.p0.copy()
+
+    def optimize(self, do_optimize=True, laplace=False, max_num_threads=DEFAULT_MAX_NUM_THREADS, **kwargs):
+        """Set the models to the maximum a posteriori hyperparameters, instead of sampling them with MCMC.
+
+        See :meth:`_find_map`; the 'map' and 'laplace' samplers make train() do the same.
+
+        :param do_optimize: False keeps the current hyperparameters and only rebuilds the models
+        :type do_optimize: bool
+        :param laplace: draw the ``n_hypers`` samples from the Laplace approximation at the maximum a posteriori
+        :type laplace: bool
+        :param max_num_threads: max number of L-BFGS-B starts running at once
+        :type max_num_threads: int > 0
 
-        self._gaussian_process_mcmc = GaussianProcessMCMC(numpy.array(hypers_list), numpy.array(noises_list),
-                                                          self._historical_data, self.derivatives)
+        """
+        if do_optimize:
+            self.hypers = self._find_map(laplace=laplace, max_num_threads=max_num_threads)
+        self.train(do_optimize=False)
+
+    def _hyperparameter_bounds(self):
+        """Bounds of each (log scale) hyperparameter: the hard [-20, 20] box, intersected with the prior support."""
+        bounds = numpy.array([[-20.0, 20.0]] * (1 + self.dim + self._num_derivatives + 1))
+        prior_bounds = self.prior.bounds() if self.prior is not None else None
+        if prior_bounds is not None:
+            for bound, (lower, upper) in zip(bounds, prior_bounds):
+                bound[0] = bound[0] if lower is None else max(bound[0], lower)
+                bound[1] = bound[1] if upper is None else min(bound[1], upper)
+        return bounds
+
+    def _negative_log_likelihood_and_grad(self, hyps, state_index):
+        log_likelihood, grad = self.compute_log_likelihood_and_grad(hyps, state_index)
+        if not numpy.isfinite(log_likelihood):
+            return numpy.inf, numpy.zeros(hyps.shape[0])
+        return -log_likelihood, -grad
+
+    def _find_map(self, laplace=False, max_num_threads=DEFAULT_MAX_NUM_THREADS):
+        r"""Maximize the log posterior (:meth:`compute_log_likelihood`) with multistart bounded L-BFGS-B.
+
+        The starts are ``num_multistarts`` prior samples, plus the last maximum found; each one runs in its own
+        thread with its own C++ evaluation state, the C++ gradient computation runs without the GIL.
+
+        :param laplace: draw the samples from the gaussian with the inverse of the negative Hessian at the maximum
+          as covariance (clipped to the bounds); otherwise return the ``n_hypers`` best local maxima
+        :type laplace: bool
+        :param max_num_threads: max number of L-BFGS-B starts running at once
+        :type max_num_threads: int > 0
+        :return: ``n_hypers`` hyperparameter samples (log scale)
+        :rtype: array of float64 with shape (n_hypers, num_hyperparameters)
 
+        """
+        bounds = self._hyperparameter_bounds()
+        num_hyperparameters = bounds.shape[0]
+        if self.prior is None:
+            starts = numpy.random.rand(self.num_multistarts, num_hyperparameters)
+        else:
+            starts = self.prior.sample_from_prior(self.num_multistarts)
+        if self._map_hypers is not None:
+            starts = numpy.vstack((self._map_hypers, starts))
+        starts = numpy.clip(starts, bounds[:, 0], bounds[:, 1])
+
+        num_threads = max(1, min(max_num_threads, starts.shape[0]))
+        self._log_likelihood_eval.reserve_states(num_threads)
+        free_states = queue.Queue()
+        for state_index in range(num_threads):
+            free_states.put(state_index)
+
+        def maximize(start):
+            state_index = free_states.get()
+            try:
+                result = optimize.minimize(self._negative_log_likelihood_and_grad, start, args=(state_index,),
+                                           jac=True, method='L-BFGS-B', bounds=bounds)
+            finally:
+                free_states.put(state_index)
+            return result.x, -result.fun
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            maxima, values = zip(*executor.map(maximize, starts))
+        order = numpy.argsort(values)[::-1]
+        self._map_hypers = maxima[order[0]]
+
+        if not laplace:
+            return numpy.array([maxima[i] for i in order[numpy.arange(self.n_hypers) % len(order)]])
+        return self._sample_laplace(self._map_hypers, bounds)
+
+    def _sample_laplace(self, mode, bounds, step=1.0e-4):
+        """Draw n_hypers samples from the Laplace approximation at mode; coordinates at a bound stay fixed."""
+        free = numpy.flatnonzero((mode - step > bounds[:, 0]) & (mode + step < bounds[:, 1]))
+        # Hessian of the log posterior by central differences of its analytic gradient
+        hessian = numpy.zeros((free.shape[0], free.shape[0]))
+        for row, i in enumerate(free):
+            shift = numpy.zeros(mode.shape[0])
+            shift[i] = step
+            grad_plus = self.compute_log_likelihood_and_grad(mode + shift)[1]
+            grad_minus = self.compute_log_likelihood_and_grad(mode - shift)[1]
+            hessian[row] = (grad_plus[free] - grad_minus[free]) / (2.0 * step)
+        # Covariance from the symmetrized negative Hessian, its directions of non positive curvature get a variance of
+        # 100 (log scale)
+        eigenvalues, eigenvectors = numpy.linalg.eigh(-0.5 * (hessian + hessian.T))
+        covariance = numpy.dot(eigenvectors / numpy.maximum(eigenvalues, 1.0e-2), eigenvectors.T)
+        samples = numpy.tile(mode, (self.n_hypers, 1))
+        samples[:, free] = self.rng.multivariate_normal(mode[free], covariance, self.n_hypers)
+        return numpy.clip(samples, bounds[:, 0], bounds[:, 1])
 
     def compute_log_likelihood(self, hyps0):
         r"""Compute the objective_type measure at the specified hyperparameters.
@@ -303,6 +564,8 @@ class GaussianProcessLogLikelihoodMCMC(object):
 
         if posterior == -numpy.inf:
             return -numpy.inf
+        elif self._log_likelihood_eval is not None:
+            return posterior + self._log_likelihood_eval.compute_log_likelihood(cpp_utils.cppify(hyps))
         else:
             val = posterior + C_GP.compute_log_likelihood(
                     cpp_utils.cppify(self._points_sampled),
@@ -316,6 +579,77 @@ class GaussianProcessLogLikelihoodMCMC(object):
                     )
             return val
 
+    def compute_log_likelihood_and_grad(self, hyps0, state_index=0):
+        r"""Compute the measure of :meth:`compute_log_likelihood` and its gradient wrt the (log scale) hyperparameters.
+
+        :param hyps0: hyperparameters (log scale)
+        :type hyps0: array of float64 with shape (num_hyperparameters, )
+        :param state_index: C++ evaluation state to use; concurrent calls from different threads need distinct ones
+        :type state_index: int >= 0
+        :return: value of log_likelihood evaluated at hyperparameters and its gradient; the gradient is zero where the
+          value is ``-inf``
+        :rtype: tuple of (float64, array of float64 with shape (num_hyperparameters, ))
+
+        """
+        hyps = numpy.array(hyps0, dtype=float)
+        grad = numpy.zeros(hyps.shape[0])
+        if numpy.any((-20 > hyps) + (hyps > 20)):
+            return -numpy.inf, grad
+        if not self.noisy:
+            hyps[(self.dim+1):] = numpy.log((1+self._num_derivatives)*[1.e-8])
+
+        posterior = 1
+        if self.prior is not None:
+            posterior = self.prior.lnprob(hyps)
+            if posterior == -numpy.inf:
+                return -numpy.inf, grad
+            grad += self.prior.gradient(hyps)
+
+        log_likelihood, grad_log_likelihood = self._log_likelihood_eval.compute_log_likelihood_and_grad(
+            cpp_utils.cppify(numpy.exp(hyps)), state_index)
+        # chain rule for the log scale: d/d(log h) = h * d/dh
+        grad += numpy.exp(hyps) * numpy.array(grad_log_likelihood)
+        if not self.noisy:
+            # the noise is fixed, the value does not depend on its coordinates
+            grad[(self.dim+1):] = 0.0
+        return posterior + log_likelihood, grad
+
+    def compute_log_likelihood_batch(self, hyps0, max_num_threads=DEFAULT_MAX_NUM_THREADS):
+        r"""Compute the objective_type measure at each row of hyperparameters, e.g. at every walker of the ensemble.
+
+        Same values as calling :meth:`compute_log_likelihood` on each row; the log likelihoods are computed
+        in parallel in C++.
+
+        :param hyps0: hyperparameters (log scale), one row per walker
+        :type hyps0: array of float64 with shape (num_walkers, num_hyperparameters)
+        :param max_num_threads: max number of threads to use
+        :type max_num_threads: int > 0
+        :return: value of log_likelihood evaluated at each row of hyperparameters
+        :rtype: array of float64 with shape (num_walkers, )
+
+        """
+        hyps0 = numpy.asarray(hyps0, dtype=float)
+        if self._log_likelihood_eval is None:
+            return numpy.array([self.compute_log_likelihood(hyps) for hyps in hyps0])
+
+        hyps = hyps0.copy()
+        log_likelihood = numpy.full(hyps.shape[0], -numpy.inf)
+        bounded = ~numpy.any((-20 > hyps) + (hyps > 20), axis=1)
+        if not self.noisy:
+            hyps[:, (self.dim+1):] = numpy.log((1+self._num_derivatives)*[1.e-8])
+
+        posterior = numpy.ones(hyps.shape[0])
+        if self.prior is not None and numpy.any(bounded):
+            posterior[bounded] = self.prior.lnprob_batch(hyps[bounded])
+
+        valid = bounded & (posterior != -numpy.inf)
+        num_valid = int(numpy.count_nonzero(valid))
+        if num_valid > 0:
+            log_likelihood[valid] = posterior[valid] + numpy.array(
+                self._log_likelihood_eval.compute_log_likelihood_batch(
+                    cpp_utils.cppify(numpy.exp(hyps[valid])), num_valid, max_num_threads))
+        return log_likelihood
+
     def nll(self, hyps):
         result = self.compute_log_likelihood(hyps)
         return -result
@@ -331,7 +665,26 @@ class GaussianProcessLogLikelihoodMCMC(object):
 
         """
         # TODO(GH-159): When C++ can pass back numpy arrays, we can stop keeping a duplicate in self._historical_data.
+        num_sampled = self._num_sampled
         self._historical_data.append_sample_points(sampled_points)
+        if self._log_likelihood_eval is not None:
+            self._log_likelihood_eval.add_sampled_points(
+                    cpp_utils.cppify(self._points_sampled[num_sampled:]),
+                    cpp_utils.cppify(self._points_sampled_value[num_sampled:]),
+                    self._num_sampled - num_sampled,
+                    )
         if len(self.models) > 0:
             for model in self._models:
-                model.add_sampled_points(sampled_points)
\ No newline at end of file
+                model.add_sampled_points(sampled_points)
+        # Keep the models usable without a new train(): same hyperparameters, conditioned on all the data
+        if self._gaussian_process_mcmc is not None:
+            self._gaussian_process_mcmc.add_sampled_points(sampled_points)
+
+    def compute_mean_log_likelihood(self):
+        r"""Compute the mean measure of :meth:`compute_log_likelihood` over the current hyperparameter samples.
+
+        :return: mean log posterior of self.hypers on the current data
+        :rtype: float64
+
+        """
+        return numpy.mean(self.compute_log_likelihood_batch(self.hypers))
\ No newline at end of file
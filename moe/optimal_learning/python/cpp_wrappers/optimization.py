@@ -183,6 +183,13 @@ by just evaluating the objective at numerous points).  For sufficiently complex
 can have exceptionally poor convergence characteristics or run too slowly.  In cases where these more advanced techniques
 fail, we commonly fall back to 'dumb' search.
 
+**2d. STOCHASTIC OPTIMIZATION**
+
+When the objective is itself a Monte Carlo estimate (e.g., q,p-KG), its gradient is noisy and the convergence tests
+of GD are meaningless. StochasticGradientAscentOptimization() takes a fixed number of steps with a decreasing learning
+rate instead. It works one point at a time (limiting each point's update to the domain) and takes a constraint,
+e.g., LinearConstraintPenalty, that keeps points inside a region the domain cannot express.
+
 """
 from builtins import object
 import collections
@@ -273,6 +280,61 @@ class GradientDescentParameters(
         super(GradientDescentParameters, self).__init__(*args, **kwargs)
 
 
+class StochasticGradientAscentParameters(
+    C_GP.StochasticGradientAscentParameters
+):
+
+    """Container to hold parameters that specify the behavior of stochastic gradient ascent in a C++-readable form.
+
+    See :func:`~moe.optimal_learning.python.cpp_wrappers.optimization.StochasticGradientAscentParameters.__init__` docstring for more information.
+
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        r"""Build a StochasticGradientAscentParameters (C++ object) via its ctor.
+
+        .. Note:: See gpp_optimizer_parameters.hpp for more details.
+
+        Exactly ``num_steps`` steps are taken, the i-th one being ``pre_mult * (i+1)^{-\gamma} * gradient`` for
+        ``i = first_step, ..., first_step + num_steps - 1``: there is no tolerance since the gradient is noisy.
+
+        :param num_steps: number of gradient ascent steps (suggest: 50-100)
+        :type num_steps: int >= 0
+        :param first_step: index of the first step in the learning rate schedule, to continue a previous ascent (0 otherwise)
+        :type first_step: int >= 0
+        :param gamma: exponent controlling rate of step size decrease (suggest: 0.5-0.9)
+        :type gamma: float64 > 0.0
+        :param pre_mult: scaling factor for step size (suggest: 0.1-1.0)
+        :type pre_mult: float64 > 0.0
+        :param max_relative_change: max change allowed per step (as a relative fraction of current distance to wall)
+        :type max_relative_change: float64 in [0, 1]
+
+        """
+        super(StochasticGradientAscentParameters, self).__init__(*args, **kwargs)
+
+
+class _CppStochasticOptimizerParameters(object):
+
+    r"""Container for parameters that specify a stochastic optimization (gradient ascent) in C++.
+
+    This object is *internal*: it is built by the objective functions that support stochastic optimization,
+    e.g., :meth:`~moe.optimal_learning.python.cpp_wrappers.knowledge_gradient_mcmc.KnowledgeGradientMCMC.stochastic_optimization`.
+
+    :ivar gradient_ascent_parameters: (*StochasticGradientAscentParameters*) stochastic gradient ascent to run
+    :ivar constraint_penalty: (*C_GP.LinearConstraintPenalty* or None) constraint on the points, if any
+
+    """
+
+    __slots__ = ('gradient_ascent_parameters', 'constraint_penalty', )
+
+    def __init__(self, gradient_ascent_parameters=None, constraint_penalty=None):
+        """Construct CppStochasticOptimizerParameters that specifies stochastic optimization behavior to C++."""
+        self.gradient_ascent_parameters = gradient_ascent_parameters
+        self.constraint_penalty = constraint_penalty
+
+
 class _CppOptimizerParameters(object):
 
     r"""Container for parameters that specify what & how to optimize in C++.
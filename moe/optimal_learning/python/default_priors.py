@@ -35,6 +35,40 @@ class DefaultPrior(BasePrior):
             lp += self.horseshoe.lnprob(theta[-i])
         return lp
 
+    def lnprob_batch(self, thetas):
+        # Same terms as lnprob, added in the same order, for all the rows at once
+        thetas = numpy.asarray(thetas, dtype=float)
+        lp = self.ln_prior.lnprob(thetas[:, 0])
+        lengthscales = thetas[:, 1:-self.num_noise]
+        outside = numpy.any((lengthscales < self.tophat.min) | (lengthscales > self.tophat.max), axis=1)
+        lp = lp + numpy.where(outside, -numpy.inf, 0.0)
+        for i in range(self.num_noise, 0, -1):
+            noise = thetas[:, -i]
+            with numpy.errstate(divide='ignore'):
+                horseshoe = numpy.log(numpy.log(1 + 3.0 * (self.horseshoe.scale / noise) ** 2))
+            lp = lp + numpy.where(noise == 0.0, numpy.inf, horseshoe)
+        return lp
+
+    def gradient(self, theta):
+        # Derivative of each term of lnprob. The horseshoe term is differentiated as it is computed
+        # in lnprob (directly in theta), not with HorseshoePrior.gradient.
+        theta = numpy.asarray(theta, dtype=float)
+        grad = numpy.zeros(theta.shape[0])
+        # Covariance amplitude
+        grad[0] = self.ln_prior.gradient(theta[0])
+        # Lengthscales: the tophat is flat inside its bounds
+        # Noise
+        scale_sq = 3.0 * self.horseshoe.scale ** 2
+        for i in range(self.num_noise, 0, -1):
+            ratio = 1 + scale_sq / theta[-i] ** 2
+            grad[-i] = -2.0 * scale_sq / theta[-i] ** 3 / (ratio * numpy.log(ratio))
+        return grad
+
+    def bounds(self):
+        # Only the tophat on the lengthscales has a bounded support
+        return ([(None, None)] + [(self.tophat.min, self.tophat.max)] * (self.n_dims - self.num_noise - 1) +
+                [(None, None)] * self.num_noise)
+
     def sample_from_prior(self, n_samples):
         p0 = numpy.zeros([n_samples, self.n_dims])
         # Covariance amplitude
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Hamiltonian Monte Carlo sampler for GP hyperparameters.
+
+Each transition draws a gaussian momentum, integrates the Hamiltonian dynamics with a leapfrog integrator
+(unit mass matrix) and accepts the end point with the Metropolis rule. The gradient of the log density lets
+a single transition travel far, so far fewer steps are needed than with random-walk or ensemble samplers.
+
+During burn-in the step size is tuned by dual averaging (Hoffman & Gelman 2014, Algorithm 5) so that the
+mean acceptance probability approaches ``target_accept``; afterwards it is kept fixed.
+
+"""
+from builtins import object
+from builtins import range
+
+import numpy
+
+
+class HamiltonianMonteCarlo(object):
+
+    r"""Sampler for a density given as ``log_prob_and_grad(x) -> (log_prob, grad_log_prob)``.
+
+    ``log_prob`` may be ``-numpy.inf`` outside of the support: trajectories that leave it are rejected.
+
+    """
+
+    def __init__(self, log_prob_and_grad, num_leapfrog_steps=10, step_size=0.1, target_accept=0.8, rng=None):
+        """Construct a HamiltonianMonteCarlo sampler.
+
+        :param log_prob_and_grad: log density (up to a constant) and its gradient at a point
+        :type log_prob_and_grad: callable
+        :param num_leapfrog_steps: max number of leapfrog steps per transition; each transition draws its own
+          number uniformly in [1, num_leapfrog_steps] to avoid periodic trajectories
+        :type num_leapfrog_steps: int > 0
+        :param step_size: initial leapfrog step size
+        :type step_size: float64 > 0
+        :param target_accept: mean acceptance probability targeted by the step size adaptation
+        :type target_accept: float64 in (0, 1)
+        :param rng: source of randomness
+        :type rng: numpy.random.RandomState
+
+        """
+        self.log_prob_and_grad = log_prob_and_grad
+        self.num_leapfrog_steps = num_leapfrog_steps
+        self.step_size = step_size
+        self.target_accept = target_accept
+        self.rng = numpy.random.RandomState() if rng is None else rng
+        self.num_evaluations = 0
+
+    def _evaluate(self, position):
+        self.num_evaluations += 1
+        log_prob, grad = self.log_prob_and_grad(position)
+        return log_prob, numpy.asarray(grad, dtype=float)
+
+    def _transition(self, position, log_prob, grad, step_size):
+        """Run one HMC transition; return the new state and the acceptance probability."""
+        momentum = self.rng.randn(position.shape[0])
+        initial_energy = log_prob - 0.5*numpy.dot(momentum, momentum)
+
+        new_position = position.copy()
+        new_log_prob, new_grad = log_prob, grad
+        new_momentum = momentum + 0.5*step_size*new_grad
+        num_steps = self.rng.randint(1, self.num_leapfrog_steps + 1)
+        for step in range(num_steps):
+            new_position = new_position + step_size*new_momentum
+            new_log_prob, new_grad = self._evaluate(new_position)
+            if not numpy.isfinite(new_log_prob):
+                break
+            if step < num_steps - 1:
+                new_momentum = new_momentum + step_size*new_grad
+
+        accept_prob = 0.0
+        if numpy.isfinite(new_log_prob):
+            new_momentum = new_momentum + 0.5*step_size*new_grad
+            energy_change = new_log_prob - 0.5*numpy.dot(new_momentum, new_momentum) - initial_energy
+            accept_prob = 1.0 if energy_change >= 0.0 else numpy.exp(energy_change)
+
+        if self.rng.rand() < accept_prob:
+            return new_position, new_log_prob, new_grad, accept_prob
+        return position, log_prob, grad, accept_prob
+
+    def run(self, positions, num_steps, adapt_step_size=False):
+        """Advance one chain from each starting position by num_steps transitions.
+
+        :param positions: starting point of each chain
+        :type positions: array of float64 with shape (num_chains, dim)
+        :param num_steps: number of transitions per chain
+        :type num_steps: int >= 0
+        :param adapt_step_size: tune the step size during these transitions (burn-in only)
+        :type adapt_step_size: bool
+        :return: last point of each chain and the mean acceptance probability
+        :rtype: tuple of (array of float64 with shape (num_chains, dim), float64)
+
+        """
+        positions = numpy.array(positions, dtype=float, ndmin=2)
+        states = [self._evaluate(position) for position in positions]
+
+        # dual averaging state (Hoffman & Gelman 2014, section 3.2)
+        mu = numpy.log(10.0*self.step_size)
+        log_step_size_bar = 0.0
+        accept_error_bar = 0.0
+        gamma, t0, kappa = 0.05, 10.0, 0.75
+
+        step_size = self.step_size
+        total_accept = 0.0
+        for iteration in range(1, num_steps + 1):
+            iteration_accept = 0.0
+            for i in range(positions.shape[0]):
+                positions[i], log_prob, grad, accept_prob = self._transition(positions[i], states[i][0], states[i][1],
+                                                                             step_size)
+                states[i] = (log_prob, grad)
+                iteration_accept += accept_prob
+            iteration_accept /= positions.shape[0]
+            total_accept += iteration_accept
+
+            if adapt_step_size:
+                weight = 1.0/(iteration + t0)
+                accept_error_bar = (1.0 - weight)*accept_error_bar + weight*(self.target_accept - iteration_accept)
+                log_step_size = mu - numpy.sqrt(iteration)/gamma*accept_error_bar
+                step_size = numpy.exp(log_step_size)
+                weight = iteration**(-kappa)
+                log_step_size_bar = weight*log_step_size + (1.0 - weight)*log_step_size_bar
+
+        if adapt_step_size and num_steps > 0:
+            self.step_size = numpy.exp(log_step_size_bar)
+        return positions, total_accept/max(num_steps, 1)
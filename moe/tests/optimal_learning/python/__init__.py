@@ -19,6 +19,7 @@ This package includes:
   a well-behaved source of random data to unit tests.
 * :mod:`moe.tests.optimal_learning.python.gaussian_process_test_utils`: utilities for constructing a random domain, covariance, and GaussianProcess
 * :mod:`moe.tests.optimal_learning.python.geometry_utils_test`: tests for :mod:`moe.optimal_learning.python.geometry_utils`
+* :mod:`moe.tests.optimal_learning.python.hamiltonian_monte_carlo_test`: tests for :mod:`moe.optimal_learning.python.hamiltonian_monte_carlo`
 
 **Subpackages**
 
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Test the C++ FiniteDomain nearest-point searches."""
+import multiprocessing
+
+import numpy
+
+import moe.build.GPP as C_GP
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+def _batch_query_in_child(finite_domain, points, queue):
+    """Run a multithreaded batch query and send its result back to the parent."""
+    queue.put(finite_domain.find_k_nearest_distances_and_indexes_from_points(points, 3, 4))
+
+
+class TestFiniteDomain(OptimalLearningTestCase):
+
+    """Test the k-d tree searches of the C++ FiniteDomain against brute force."""
+
+    dim = 3
+    num_points = 200
+    num_queries = 7
+
+    def _build_domain(self):
+        numpy.random.seed(3141)
+        data = numpy.random.uniform(-1.0, 1.0, size=(self.num_points, self.dim))
+        queries = numpy.random.uniform(-1.0, 1.0, size=(self.num_queries, self.dim))
+        return data, C_GP.FiniteDomain(data.tolist(), self.dim), queries
+
+    def test_batch_query_matches_brute_force(self):
+        """Check the k nearest points of each query against a full sort of the distances."""
+        data, finite_domain, queries = self._build_domain()
+        k = 5
+        distances, indexes = finite_domain.find_k_nearest_distances_and_indexes_from_points(
+            queries.flatten().tolist(), k, 4)
+        distances = numpy.array(distances).reshape(self.num_queries, k)
+        indexes = numpy.array(indexes).reshape(self.num_queries, k)
+        for query, query_distances, query_indexes in zip(queries, distances, indexes):
+            truth = numpy.linalg.norm(data - query, axis=1)
+            numpy.testing.assert_array_equal(query_indexes, numpy.argsort(truth, kind='stable')[:k])
+            self.assert_vector_within_relative(query_distances, truth[query_indexes], 1.0e-14)
+
+    def test_batch_query_in_forked_child(self):
+        """Check that a batch query returns in a child forked after the parent used OpenMP."""
+        _, finite_domain, queries = self._build_domain()
+        points = queries.flatten().tolist()
+        # Start the OpenMP threads in the parent before forking
+        expected = finite_domain.find_k_nearest_distances_and_indexes_from_points(points, 3, 4)
+
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        child = context.Process(target=_batch_query_in_child, args=(finite_domain, points, queue))
+        child.start()
+        child.join(60)
+        hung = child.is_alive()
+        if hung:
+            child.kill()
+        assert not hung
+        assert child.exitcode == 0
+        assert queue.get(timeout=10) == expected
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Test that a C++ GaussianProcess updated with new points matches one built from all the points at once."""
+import numpy
+
+import moe.build.GPP as C_GP
+from moe.optimal_learning.python.cpp_wrappers import cpp_utils
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class TestGaussianProcessAddSampledPoints(OptimalLearningTestCase):
+
+    """Compare a GP extended by ``add_sampled_points`` (incremental cholesky update) with a GP rebuilt from scratch."""
+
+    dim = 3
+    num_initial = 30
+    batch_sizes = (1, 2, 5, 1, 13)
+    num_to_sample = 4
+    hyperparameters = numpy.array([1.0, 0.4, 0.5, 0.6])
+    tolerance = 1.0e-11
+
+    def _build_data(self, derivatives):
+        """Return all the sampled points, their values (function value, then each derivative) and points to predict."""
+        numpy.random.seed(2718)
+        num_sampled = self.num_initial + sum(self.batch_sizes)
+        points_sampled = numpy.random.uniform(0.0, 1.0, size=(num_sampled, self.dim))
+        points_sampled_value = numpy.empty((num_sampled, len(derivatives) + 1))
+        points_sampled_value[:, 0] = numpy.sin(3.0 * points_sampled).sum(axis=1)
+        points_sampled_value[:, 1:] = 3.0 * numpy.cos(3.0 * points_sampled[:, derivatives])
+        points_to_sample = numpy.random.uniform(0.0, 1.0, size=(self.num_to_sample, self.dim))
+        return points_sampled, points_sampled_value, points_to_sample
+
+    def _build_gaussian_process(self, points_sampled, points_sampled_value, derivatives):
+        return C_GP.GaussianProcess(
+            cpp_utils.cppify_hyperparameters(self.hyperparameters),
+            cpp_utils.cppify(points_sampled),
+            cpp_utils.cppify(points_sampled_value),
+            cpp_utils.cppify([1.0e-3] * (len(derivatives) + 1)),
+            list(derivatives), len(derivatives),
+            self.dim,
+            points_sampled.shape[0],
+        )
+
+    def assert_arrays_within_relative(self, value, truth):
+        """Check ``value`` against ``truth``, relative to the largest entry of ``truth``."""
+        value = numpy.asarray(value)
+        truth = numpy.asarray(truth)
+        assert value.shape == truth.shape
+        self.assert_scalar_within_absolute(numpy.max(numpy.fabs(value - truth)) / numpy.max(numpy.fabs(truth)), 0.0,
+                                           self.tolerance)
+
+    def _assert_same_predictions(self, gaussian_process, reference, points_to_sample):
+        """Check the mean, variance and their gradients of gaussian_process against reference."""
+        points = cpp_utils.cppify(points_to_sample)
+        num_to_sample = points_to_sample.shape[0]
+        self.assert_arrays_within_relative(gaussian_process.compute_mean_of_points(points, num_to_sample),
+                                           reference.compute_mean_of_points(points, num_to_sample))
+        self.assert_arrays_within_relative(gaussian_process.compute_variance_of_points(points, num_to_sample),
+                                           reference.compute_variance_of_points(points, num_to_sample))
+        self.assert_arrays_within_relative(gaussian_process.compute_grad_mean_of_points(points, num_to_sample),
+                                           reference.compute_grad_mean_of_points(points, num_to_sample))
+        self.assert_arrays_within_relative(
+            gaussian_process.compute_grad_variance_of_points(points, num_to_sample, num_to_sample),
+            reference.compute_grad_variance_of_points(points, num_to_sample, num_to_sample),
+        )
+
+    def test_add_sampled_points(self):
+        """Check predictions after each batch of new points, with and without derivative observations."""
+        for derivatives in ([], [0, 2]):
+            points_sampled, points_sampled_value, points_to_sample = self._build_data(derivatives)
+            gaussian_process = self._build_gaussian_process(points_sampled[:self.num_initial],
+                                                            points_sampled_value[:self.num_initial], derivatives)
+            end = self.num_initial
+            for batch_size in self.batch_sizes:
+                begin, end = end, end + batch_size
+                gaussian_process.add_sampled_points(cpp_utils.cppify(points_sampled[begin:end]),
+                                                    cpp_utils.cppify(points_sampled_value[begin:end]), batch_size)
+                reference = self._build_gaussian_process(points_sampled[:end], points_sampled_value[:end], derivatives)
+                assert gaussian_process.num_sampled == end
+                self._assert_same_predictions(gaussian_process, reference, points_to_sample)
+
+    def test_add_sampled_points_near_existing_points(self):
+        """Check the update when new points nearly duplicate sampled ones, where the new cholesky block is smallest."""
+        points_sampled, points_sampled_value, points_to_sample = self._build_data([])
+        new_points = points_sampled[:5] + 1.0e-4
+        new_points_value = points_sampled_value[:5] + 1.0e-3
+        gaussian_process = self._build_gaussian_process(points_sampled, points_sampled_value, [])
+        gaussian_process.add_sampled_points(cpp_utils.cppify(new_points), cpp_utils.cppify(new_points_value), 5)
+        reference = self._build_gaussian_process(numpy.vstack((points_sampled, new_points)),
+                                                 numpy.vstack((points_sampled_value, new_points_value)), [])
+        self._assert_same_predictions(gaussian_process, reference, points_to_sample)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Test the C++ knowledge gradient of a GP hyperparameter sample against its reference computations."""
+import copy
+
+import numpy
+import pytest
+
+import moe.build.GPP as C_GP
+from moe.optimal_learning.python import data_containers
+from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient, knowledge_gradient_mcmc
+from moe.optimal_learning.python.cpp_wrappers import optimization as cpp_optimization
+from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponential
+from moe.optimal_learning.python.cpp_wrappers.domain import TensorProductDomain
+from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
+from moe.optimal_learning.python.geometry_utils import ClosedInterval
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class TestKnowledgeGradientMCMC(OptimalLearningTestCase):
+
+    """Test the fused value and gradient call, the persistent evaluator and the native ascent of KnowledgeGradientMCMC."""
+
+    dim = 2
+    num_sampled = 12
+    num_to_sample = 2
+    num_discrete = 15
+    hyperparameters_list = numpy.array([[1.0, 0.3, 0.4], [0.8, 0.5, 0.2]])
+    noise_variance_list = numpy.array([[1.0e-3], [2.0e-3]])
+    tolerance = 1.0e-12
+
+    def _build_gaussian_process_mcmc(self):
+        numpy.random.seed(1414)
+        points_sampled = numpy.random.uniform(0.0, 1.0, size=(self.num_sampled, self.dim))
+        historical_data = data_containers.HistoricalData(dim=self.dim)
+        historical_data.append_sample_points([data_containers.SamplePoint(point, numpy.sin(3.0 * point).sum())
+                                              for point in points_sampled])
+        return knowledge_gradient_mcmc.GaussianProcessMCMC(self.hyperparameters_list, self.noise_variance_list,
+                                                           historical_data, [])
+
+    def _build_knowledge_gradient(self, gaussian_process_mcmc):
+        """Build the q-KG of gaussian_process_mcmc, with the same discretization and inner optimizer as qaliboo."""
+        historical_data = gaussian_process_mcmc.get_historical_data_copy()
+        gaussian_process_list = [GaussianProcess(SquareExponential(hyperparameters), noise_variance, historical_data, [])
+                                 for hyperparameters, noise_variance in zip(self.hyperparameters_list,
+                                                                            self.noise_variance_list)]
+        domain = TensorProductDomain([ClosedInterval(0.0, 1.0)] * self.dim)
+        inner_optimizer = cpp_optimization.GradientDescentOptimizer(
+            domain,
+            knowledge_gradient.PosteriorMean(gaussian_process_list[0], 0),
+            cpp_optimization.GradientDescentParameters(
+                num_multistarts=5, max_num_steps=6, max_num_restarts=3, num_steps_averaged=3, gamma=0.0,
+                pre_mult=1.0, max_relative_change=0.2, tolerance=1.0e-10),
+        )
+        discrete_pts_list = [domain.generate_uniform_random_points_in_domain(self.num_discrete)
+                             for _ in gaussian_process_list]
+        kg = knowledge_gradient_mcmc.KnowledgeGradientMCMC(
+            gaussian_process_mcmc=gaussian_process_mcmc,
+            gaussian_process_list=gaussian_process_list,
+            num_fidelity=0,
+            inner_optimizer=inner_optimizer,
+            discrete_pts_list=discrete_pts_list,
+            num_to_sample=self.num_to_sample,
+            num_mc_iterations=2**5,
+            points_to_sample=numpy.random.uniform(0.0, 1.0, size=(self.num_to_sample, self.dim)),
+        )
+        # every call restarts from the most recent seed, so all computations use the same Monte Carlo samples
+        kg._randomness.SetExplicitNormalRNGSeed(314)
+        kg._randomness.SetExplicitUniformGeneratorSeed(271)
+        return kg
+
+    def _compute_separately(self, kg):
+        return kg.compute_knowledge_gradient_mcmc(), kg.compute_grad_knowledge_gradient_mcmc()
+
+    def _assert_same_result(self, value, grad, truth_value, truth_grad):
+        self.assert_scalar_within_relative(value, truth_value, self.tolerance)
+        self.assert_vector_within_relative(grad, truth_grad, self.tolerance)
+
+    def test_fused_value_and_grad(self):
+        """Check that the fused call returns the value and gradient of the two separate calls."""
+        kg = self._build_knowledge_gradient(self._build_gaussian_process_mcmc())
+        for _ in range(3):
+            value, grad = kg.compute_knowledge_gradient_and_grad_mcmc()
+            self._assert_same_result(value, grad, *self._compute_separately(kg))
+            kg.set_current_point(numpy.random.uniform(0.0, 1.0, size=(self.num_to_sample, self.dim)))
+
+    def _build_knowledge_gradient_with_evaluator(self, gaussian_process_mcmc):
+        """Return a KG with a C++ evaluator and a copy of it without one, which uses the free functions."""
+        kg = self._build_knowledge_gradient(gaussian_process_mcmc)
+        reference = copy.copy(kg)
+        kg.create_evaluator()
+        return kg, reference
+
+    def _assert_same_as_reference(self, kg, reference):
+        points_to_sample = numpy.random.uniform(0.0, 1.0, size=(self.num_to_sample, self.dim))
+        kg.set_current_point(points_to_sample)
+        reference.set_current_point(points_to_sample)
+        self._assert_same_result(*(self._compute_separately(kg) + self._compute_separately(reference)))
+
+    def test_evaluator(self):
+        """Check the persistent evaluator against the free functions, which set everything up at every call."""
+        kg, reference = self._build_knowledge_gradient_with_evaluator(self._build_gaussian_process_mcmc())
+        for _ in range(3):
+            self._assert_same_as_reference(kg, reference)
+
+    def test_evaluator_after_gaussian_process_update(self):
+        """Check that a stale evaluator raises, and that KnowledgeGradientMCMC rebuilds its own."""
+        gaussian_process_mcmc = self._build_gaussian_process_mcmc()
+        kg, reference = self._build_knowledge_gradient_with_evaluator(gaussian_process_mcmc)
+        new_point = numpy.full(self.dim, 0.5)
+        updates = (
+            lambda: gaussian_process_mcmc.add_sampled_points([data_containers.SamplePoint(new_point, 0.3)]),
+            lambda: gaussian_process_mcmc.set_hyperparameters(self.hyperparameters_list[::-1],
+                                                              self.noise_variance_list[::-1]),
+        )
+        for update in updates:
+            stale_evaluator = kg._evaluator
+            update()
+            with pytest.raises(C_GP.InvalidValueException):
+                stale_evaluator.compute_knowledge_gradient(kg.get_current_point().flatten().tolist(), [],
+                                                           self.num_to_sample, 0, kg._randomness)
+            self._assert_same_as_reference(kg, reference)
+            assert kg._evaluator is not stale_evaluator
+
+    def test_stochastic_optimization(self):
+        """Check the native ascent, which reuses one state, against steps from freshly built states."""
+        kg, reference = self._build_knowledge_gradient_with_evaluator(self._build_gaussian_process_mcmc())
+        domain = kg._inner_optimizer.domain
+        initial_point = kg.get_current_point()
+        for num_steps in (1, 2, 5):
+            kg.set_current_point(initial_point)
+            gradient_ascent_parameters = cpp_optimization.StochasticGradientAscentParameters(
+                num_steps=num_steps, first_step=0, gamma=0.7, pre_mult=1.0, max_relative_change=0.5)
+            best_points_to_sample = kg.stochastic_optimization(gradient_ascent_parameters)
+
+            points_to_sample = numpy.copy(initial_point)
+            for i in range(num_steps):
+                reference.set_current_point(points_to_sample)
+                step = reference.compute_grad_knowledge_gradient_mcmc() * (i + 1.0)**-0.7
+                for point, point_step in zip(points_to_sample, step):
+                    point += domain.compute_update_restricted_to_domain(0.5, point, point_step)
+            self.assert_vector_within_relative(best_points_to_sample, points_to_sample, self.tolerance)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Test the C++ log marginal likelihood that keeps its training data between evaluations, and the MCMC model on it."""
+import numpy
+from scipy import optimize
+
+import moe.build.GPP as C_GP
+from moe.optimal_learning.python import data_containers, default_priors
+from moe.optimal_learning.python.cpp_wrappers import cpp_utils, log_likelihood_mcmc
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+def _matern_log_marginal_likelihood(points_sampled, points_sampled_value, hyperparameters):
+    """Log marginal likelihood with a Matern 5/2 covariance, computed from its definition."""
+    dim = points_sampled.shape[1]
+    alpha, lengths, noise_variance = hyperparameters[0], hyperparameters[1:dim + 1], hyperparameters[dim + 1]
+    scaled_points = points_sampled / lengths
+    norm_squared = ((scaled_points[:, numpy.newaxis, :] - scaled_points[numpy.newaxis, :, :])**2).sum(axis=2)
+    matern_arg = numpy.sqrt(5.0 * norm_squared)
+    covariance = alpha * (1.0 + matern_arg + 5.0 / 3.0 * norm_squared) * numpy.exp(-matern_arg)
+    # the C++ likelihood adds a jitter of 1.0e-6 to the noise
+    covariance += (noise_variance + 1.0e-6) * numpy.eye(points_sampled.shape[0])
+    centered_value = points_sampled_value - points_sampled_value.mean()
+    _, log_determinant = numpy.linalg.slogdet(covariance)
+    return (-0.5 * centered_value.dot(numpy.linalg.solve(covariance, centered_value)) - 0.5 * log_determinant -
+            0.5 * points_sampled.shape[0] * numpy.log(2.0 * numpy.pi))
+
+
+def _build_historical_data(num_sampled, dim, seed):
+    """Return a noisy sample of a smooth function at num_sampled uniform points of the unit hypercube."""
+    random_state = numpy.random.RandomState(seed)
+    points_sampled = random_state.uniform(0.0, 1.0, size=(num_sampled, dim))
+    historical_data = data_containers.HistoricalData(dim)
+    historical_data.append_sample_points([data_containers.SamplePoint(point, numpy.sin(3.0 * point).sum(), 1.0e-3)
+                                          for point in points_sampled])
+    return historical_data
+
+
+class TestPersistentLogMarginalLikelihood(OptimalLearningTestCase):
+
+    """Test ``C_GP.LogMarginalLikelihood`` against the functions that copy the training data on every call."""
+
+    dim = 3
+    num_sampled = 25
+    num_hyperparameter_sets = 5
+    tolerance = 1.0e-12
+
+    def _build_data(self, derivatives):
+        """Return sampled points, their values (with one gradient entry per derivative) and hyperparameter sets."""
+        numpy.random.seed(8642)
+        points_sampled = numpy.random.uniform(-1.0, 1.0, size=(self.num_sampled, self.dim))
+        points_sampled_value = numpy.empty((self.num_sampled, len(derivatives) + 1))
+        points_sampled_value[:, 0] = numpy.sin(points_sampled).sum(axis=1)
+        points_sampled_value[:, 1:] = numpy.cos(points_sampled[:, derivatives])
+        hyperparameters = numpy.random.uniform(0.2, 2.0, size=(self.num_hyperparameter_sets,
+                                                               self.dim + len(derivatives) + 2))
+        hyperparameters[:, self.dim + 1:] *= 1.0e-2
+        return points_sampled, points_sampled_value, hyperparameters
+
+    def _build_log_likelihood(self, points_sampled, points_sampled_value, derivatives):
+        return C_GP.LogMarginalLikelihood(
+            cpp_utils.cppify(points_sampled),
+            cpp_utils.cppify(points_sampled_value),
+            list(derivatives), len(derivatives),
+            self.dim,
+            points_sampled.shape[0],
+        )
+
+    def _compute_log_likelihood(self, points_sampled, points_sampled_value, derivatives, hyperparameters):
+        """Compute the log marginal likelihood with a fresh copy of the training data."""
+        return C_GP.compute_log_likelihood(
+            cpp_utils.cppify(points_sampled),
+            cpp_utils.cppify(points_sampled_value),
+            self.dim,
+            points_sampled.shape[0],
+            C_GP.LogLikelihoodTypes.log_marginal_likelihood,
+            cpp_utils.cppify_hyperparameters(hyperparameters[:self.dim + 1]),
+            list(derivatives), len(derivatives),
+            cpp_utils.cppify(hyperparameters[self.dim + 1:]),
+        )
+
+    def test_log_likelihood(self):
+        """Check repeated evaluations against compute_log_likelihood, with and without derivative observations."""
+        for derivatives in ([], [0, 2]):
+            points_sampled, points_sampled_value, hyperparameter_sets = self._build_data(derivatives)
+            log_likelihood = self._build_log_likelihood(points_sampled, points_sampled_value, derivatives)
+            for hyperparameters in hyperparameter_sets:
+                self.assert_scalar_within_relative(
+                    log_likelihood.compute_log_likelihood(cpp_utils.cppify(hyperparameters)),
+                    self._compute_log_likelihood(points_sampled, points_sampled_value, derivatives, hyperparameters),
+                    self.tolerance,
+                )
+
+    def test_log_likelihood_and_grad(self):
+        """Check the value and gradient of every state against compute_hyperparameter_grad_log_likelihood."""
+        for derivatives in ([], [1]):
+            points_sampled, points_sampled_value, hyperparameter_sets = self._build_data(derivatives)
+            log_likelihood = self._build_log_likelihood(points_sampled, points_sampled_value, derivatives)
+            log_likelihood.reserve_states(2)
+            for i, hyperparameters in enumerate(hyperparameter_sets):
+                value, grad = log_likelihood.compute_log_likelihood_and_grad(cpp_utils.cppify(hyperparameters), i % 2)
+                self.assert_scalar_within_relative(
+                    value,
+                    self._compute_log_likelihood(points_sampled, points_sampled_value, derivatives, hyperparameters),
+                    self.tolerance,
+                )
+                expected_grad = C_GP.compute_hyperparameter_grad_log_likelihood(
+                    cpp_utils.cppify(points_sampled),
+                    cpp_utils.cppify(points_sampled_value),
+                    self.dim,
+                    self.num_sampled,
+                    C_GP.LogLikelihoodTypes.log_marginal_likelihood,
+                    cpp_utils.cppify_hyperparameters(hyperparameters[:self.dim + 1]),
+                    list(derivatives), len(derivatives),
+                    cpp_utils.cppify(hyperparameters[self.dim + 1:]),
+                )
+                self.assert_vector_within_relative(numpy.array(grad), numpy.array(expected_grad), self.tolerance)
+
+    def test_add_sampled_points(self):
+        """Check that adding points in several steps gives the log likelihood of all the points."""
+        for derivatives in ([], [2]):
+            points_sampled, points_sampled_value, hyperparameter_sets = self._build_data(derivatives)
+            log_likelihood = self._build_log_likelihood(points_sampled[:10], points_sampled_value[:10], derivatives)
+            for begin, end in ((10, 11), (11, 18), (18, self.num_sampled)):
+                log_likelihood.add_sampled_points(
+                    cpp_utils.cppify(points_sampled[begin:end]),
+                    cpp_utils.cppify(points_sampled_value[begin:end]),
+                    end - begin,
+                )
+                for hyperparameters in hyperparameter_sets:
+                    self.assert_scalar_within_relative(
+                        log_likelihood.compute_log_likelihood(cpp_utils.cppify(hyperparameters)),
+                        self._compute_log_likelihood(points_sampled[:end], points_sampled_value[:end], derivatives,
+                                                     hyperparameters),
+                        self.tolerance,
+                    )
+            assert log_likelihood.num_sampled == self.num_sampled
+
+    def test_log_likelihood_batch(self):
+        """Check that a multithreaded batch gives exactly the value of each row evaluated alone."""
+        for derivatives in ([], [0]):
+            points_sampled, points_sampled_value, _ = self._build_data(derivatives)
+            hyperparameter_sets = numpy.random.uniform(0.2, 2.0, size=(23, self.dim + len(derivatives) + 2))
+            log_likelihood = self._build_log_likelihood(points_sampled, points_sampled_value, derivatives)
+            expected = [log_likelihood.compute_log_likelihood(cpp_utils.cppify(hyperparameters))
+                        for hyperparameters in hyperparameter_sets]
+            for max_num_threads in (1, 4):
+                batch = log_likelihood.compute_log_likelihood_batch(cpp_utils.cppify(hyperparameter_sets),
+                                                                     hyperparameter_sets.shape[0], max_num_threads)
+                assert batch == expected
+
+    def test_grad_after_add_sampled_points(self):
+        """Check gradients of states used for values only, and of states whose data grew since their last gradient."""
+        points_sampled, points_sampled_value, hyperparameter_sets = self._build_data([])
+        log_likelihood = self._build_log_likelihood(points_sampled[:10], points_sampled_value[:10], [])
+        # the batch sets up states that never computed a gradient
+        log_likelihood.compute_log_likelihood_batch(cpp_utils.cppify(hyperparameter_sets), len(hyperparameter_sets), 3)
+        for end in (10, 17, 24):
+            if end > 10:
+                log_likelihood.add_sampled_points(cpp_utils.cppify(points_sampled[end - 7:end]),
+                                                  cpp_utils.cppify(points_sampled_value[end - 7:end]), 7)
+            for state_index, hyperparameters in zip((0, 1, 2), hyperparameter_sets):
+                _, grad = log_likelihood.compute_log_likelihood_and_grad(cpp_utils.cppify(hyperparameters),
+                                                                         state_index)
+                expected_grad = C_GP.compute_hyperparameter_grad_log_likelihood(
+                    cpp_utils.cppify(points_sampled[:end]),
+                    cpp_utils.cppify(points_sampled_value[:end]),
+                    self.dim,
+                    end,
+                    C_GP.LogLikelihoodTypes.log_marginal_likelihood,
+                    cpp_utils.cppify_hyperparameters(hyperparameters[:self.dim + 1]),
+                    [], 0,
+                    cpp_utils.cppify(hyperparameters[self.dim + 1:]),
+                )
+                self.assert_vector_within_relative(numpy.array(grad), numpy.array(expected_grad), self.tolerance)
+
+    def test_log_likelihood_of_square_differences(self):
+        """Check the covariance built from cached squared differences against the Matern 5/2 definition."""
+        points_sampled, points_sampled_value, hyperparameter_sets = self._build_data([])
+        log_likelihood = self._build_log_likelihood(points_sampled[:12], points_sampled_value[:12], [])
+        log_likelihood.add_sampled_points(cpp_utils.cppify(points_sampled[12:]),
+                                          cpp_utils.cppify(points_sampled_value[12:]), self.num_sampled - 12)
+        for hyperparameters in hyperparameter_sets:
+            self.assert_scalar_within_relative(
+                log_likelihood.compute_log_likelihood(cpp_utils.cppify(hyperparameters)),
+                _matern_log_marginal_likelihood(points_sampled, points_sampled_value[:, 0], hyperparameters),
+                1.0e-10,
+            )
+
+
+class TestChainDiagnostics(OptimalLearningTestCase):
+
+    """Test the convergence diagnostics of the emcee chain and the early stop of train() they drive."""
+
+    def test_split_rhat(self):
+        """Check that split R-hat is close to 1 for iid chains and large when the chains drift between halves."""
+        chain = numpy.random.RandomState(2718).randn(1000, 8, 3)
+        self.assert_scalar_within_absolute(log_likelihood_mcmc.split_rhat(chain), 1.0, 0.01)
+        chain[500:, :, 1] += 3.0
+        assert log_likelihood_mcmc.split_rhat(chain) > 1.5
+
+    def test_integrated_autocorr_time(self):
+        """Check the autocorrelation time of iid chains and of an AR(1) process, (1 + phi) / (1 - phi)."""
+        random_state = numpy.random.RandomState(2718)
+        self.assert_scalar_within_relative(
+            log_likelihood_mcmc.integrated_autocorr_time(random_state.randn(1000, 8, 3)), 1.0, 0.1)
+        phi = 0.8
+        chain = numpy.empty((5000, 8, 1))
+        chain[0] = random_state.randn(8, 1)
+        for step in range(1, chain.shape[0]):
+            chain[step] = phi * chain[step - 1] + random_state.randn(8, 1)
+        self.assert_scalar_within_relative(log_likelihood_mcmc.integrated_autocorr_time(chain),
+                                           (1.0 + phi) / (1.0 - phi), 0.2)
+
+    def test_train_stops_at_target_effective_samples(self):
+        """Check that train() stops the chain at a convergence check once it holds the target effective samples."""
+        numpy.random.seed(1414)
+        model = log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(
+            historical_data=_build_historical_data(30, 2, 1414),
+            derivatives=[],
+            prior=default_priors.DefaultPrior(1 + 2 + 1, 1),
+            chain_length=1000,
+            burnin_steps=500,
+            n_hypers=1,
+            rng=numpy.random.RandomState(1414),
+            target_effective_samples=50,
+            convergence_check_interval=50,
+        )
+        model.train()
+        assert model.last_chain_length < model.chain_length
+        assert model.last_chain_length % model.convergence_check_interval == 0
+        assert model.n_chains * model.last_chain_length / model._autocorr_time >= model.target_effective_samples
+
+
+class TestMaximumAPosteriori(OptimalLearningTestCase):
+
+    """Test the multistart, multithreaded search of the maximum a posteriori hyperparameters and the Laplace samples."""
+
+    def _build_model(self, sampler, n_hypers):
+        numpy.random.seed(1732)
+        return log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(
+            historical_data=_build_historical_data(30, 2, 1732),
+            derivatives=[],
+            prior=default_priors.DefaultPrior(1 + 2 + 1, 1),
+            chain_length=10,
+            burnin_steps=10,
+            n_hypers=n_hypers,
+            rng=numpy.random.RandomState(1732),
+            sampler=sampler,
+        )
+
+    def test_map(self):
+        """Check the maximum against single threaded L-BFGS-B runs on the log posterior, from a grid of starts."""
+        model = self._build_model('map', 4)
+        model.train()
+        bounds = model._hyperparameter_bounds()
+
+        def negative_log_posterior_and_grad(hyperparameters):
+            value, grad = model.compute_log_likelihood_and_grad(hyperparameters)
+            return -value, -grad
+
+        starts = numpy.random.RandomState(1732).uniform(numpy.maximum(bounds[:, 0], -5.0),
+                                                        numpy.minimum(bounds[:, 1], 5.0),
+                                                        size=(20, bounds.shape[0]))
+        best = min((optimize.minimize(negative_log_posterior_and_grad, start, jac=True, method='L-BFGS-B',
+                                      bounds=bounds) for start in starts), key=lambda result: result.fun)
+        self.assert_scalar_within_relative(model.compute_log_likelihood(model._map_hypers), -best.fun, 1.0e-6)
+        for value, expected in zip(model._map_hypers, best.x):
+            self.assert_scalar_within_absolute(value, expected, 1.0e-3)
+        assert model.hypers.shape == (model.n_hypers, bounds.shape[0])
+        assert numpy.array_equal(model.hypers[0], model._map_hypers)
+
+    def test_laplace(self):
+        """Check that the Laplace samples are finite, within the bounds and centred on the maximum."""
+        model = self._build_model('laplace', 200)
+        model.train()
+        bounds = model._hyperparameter_bounds()
+        assert model.hypers.shape == (model.n_hypers, bounds.shape[0])
+        assert numpy.all(numpy.isfinite(model.hypers))
+        assert numpy.all((bounds[:, 0] <= model.hypers) & (model.hypers <= bounds[:, 1]))
+        standard_error = model.hypers.std(axis=0) / numpy.sqrt(model.n_hypers)
+        assert numpy.all(standard_error > 0.0)
+        assert numpy.all(numpy.abs(model.hypers.mean(axis=0) - model._map_hypers) < 4.0 * standard_error)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Test the Hamiltonian Monte Carlo sampler of GP hyperparameters."""
+import numpy
+
+from moe.optimal_learning.python.hamiltonian_monte_carlo import HamiltonianMonteCarlo
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class TestHamiltonianMonteCarlo(OptimalLearningTestCase):
+
+    """Test HamiltonianMonteCarlo on densities whose samples are known."""
+
+    covariance = numpy.array([[1.0, 0.8], [0.8, 1.0]])
+    num_chains = 10
+
+    def _gaussian_log_prob_and_grad(self, point):
+        precision = numpy.linalg.inv(self.covariance)
+        return -0.5 * point.dot(precision).dot(point), -precision.dot(point)
+
+    def test_correlated_gaussian(self):
+        """Check the step size adaptation and the covariance of the samples of a correlated 2-D gaussian."""
+        hmc = HamiltonianMonteCarlo(self._gaussian_log_prob_and_grad, rng=numpy.random.RandomState(314))
+        positions = hmc.rng.randn(self.num_chains, 2)
+        positions, _ = hmc.run(positions, 300, adapt_step_size=True)
+        step_size = hmc.step_size
+
+        samples = []
+        accept_probs = []
+        for _ in range(400):
+            positions, accept_prob = hmc.run(positions, 1)
+            samples.append(positions.copy())
+            accept_probs.append(accept_prob)
+        samples = numpy.concatenate(samples)
+
+        assert hmc.step_size == step_size
+        self.assert_scalar_within_absolute(numpy.mean(accept_probs), hmc.target_accept, 0.05)
+        self.assert_vector_within_relative(numpy.cov(samples.T).ravel(), self.covariance.ravel(), 0.1)
+        for mean in samples.mean(axis=0):
+            self.assert_scalar_within_absolute(mean, 0.0, 0.1)
+
+    def test_rejects_infinite_log_prob(self):
+        """Check that trajectories ending where the log density is -inf are never accepted."""
+        start = numpy.array([0.3, -0.2])
+
+        def log_prob_and_grad(point):
+            # the starting point is the whole support
+            if numpy.array_equal(point, start):
+                return 0.0, numpy.ones(2)
+            return -numpy.inf, numpy.zeros(2)
+
+        hmc = HamiltonianMonteCarlo(log_prob_and_grad, rng=numpy.random.RandomState(271))
+        positions, mean_accept_prob = hmc.run(numpy.tile(start, (3, 1)), 20)
+        assert mean_accept_prob == 0.0
+        numpy.testing.assert_array_equal(positions, numpy.tile(start, (3, 1)))
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Tests for the qaliboo package built on optimal_learning."""
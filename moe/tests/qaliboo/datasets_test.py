@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Test the cached CSV columns of qaliboo.datasets."""
+import importlib
+
+import pandas
+import pytest
+
+from qaliboo import datasets
+
+
+CSV = """name,value,flag,maybe_flag,label
+a,1.5,True,True,
+b,,False,,q
+,3.0,True,False,r
+"""
+
+
+class TestReadCsv(object):
+
+    """Test that datasets.read_csv gives the frame of pandas.read_csv, before and after the cache is written."""
+
+    @pytest.fixture
+    def cached_datasets(self, tmp_path, monkeypatch):
+        """The datasets module with its cache in a temporary directory."""
+        monkeypatch.setenv('QALIBOO_DATASET_CACHE', str(tmp_path / 'cache'))
+        yield importlib.reload(datasets)
+        monkeypatch.undo()
+        importlib.reload(datasets)
+
+    def test_round_trip(self, cached_datasets, tmp_path):
+        """Check string, missing and bool columns (a bool column with missing values is an object column)."""
+        csv_file = tmp_path / 'data.csv'
+        csv_file.write_text(CSV)
+        expected = pandas.read_csv(csv_file)
+        for _ in range(2):
+            pandas.testing.assert_frame_equal(cached_datasets.read_csv(str(csv_file)), expected)
+        assert len(list((tmp_path / 'cache').iterdir())) == 1
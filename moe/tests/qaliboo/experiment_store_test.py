@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Test the SQLite experiment store of qaliboo."""
+import json
+import os
+import sqlite3
+
+import pytest
+
+from qaliboo import datasets
+from qaliboo.experiment_store import ExperimentStore
+from qaliboo.pakman import PAKMAN
+
+
+class TestExperimentStore(object):
+
+    """Test the rows an ExperimentStore writes, and when it writes them."""
+
+    dat = os.path.join(os.path.dirname(datasets.__file__), 'scaledQuery26.csv')
+
+    @staticmethod
+    def _count(path, table):
+        """Number of rows of table, read by a connection of its own as another process would."""
+        with sqlite3.connect(path) as connection:
+            return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    def test_run(self, tmp_path):
+        """Check the run, evaluation, iteration and timing rows, flushed by write_info and close."""
+        path = str(tmp_path / 'store.sqlite')
+        store = ExperimentStore(path, 'ScaledQuery26', {'n_restarts': 15, 'batch_size': 2}, self.dat, seed=7)
+        store.write_init([0, 1, 2])
+        store.write_history(-1, [0, 1, 2])
+        store.write_timings(0, {'acquisition': 1.5, 'training': 0.5})
+        store.write_history(0, [5, 8])
+        assert self._count(path, 'evaluations') == 0
+
+        store.write_info(0, 2, 5, 3.0, 0, 0.1, 0.2)
+        assert self._count(path, 'evaluations') == 5
+        assert self._count(path, 'iterations') == 1
+        assert self._count(path, 'timings') == 2
+
+        store.write_history(1, [9])
+        assert self._count(path, 'evaluations') == 5
+        store.close()
+
+        with sqlite3.connect(path) as connection:
+            runs = connection.execute('SELECT run_id, problem, configuration, seed, finished_at FROM runs').fetchall()
+            assert len(runs) == 1
+            run_id, problem, configuration, seed, finished_at = runs[0]
+            assert (problem, seed) == ('ScaledQuery26', 7)
+            assert configuration == json.dumps({'batch_size': 2, 'n_restarts': 15})
+            assert finished_at is not None
+
+            evaluations = connection.execute('SELECT run_id, iteration, dat_index, row FROM evaluations '
+                                             'ORDER BY iteration, dat_index').fetchall()
+            assert [(iteration, dat_index) for _, iteration, dat_index, _ in evaluations] == [
+                (-1, 0), (-1, 1), (-1, 2), (0, 5), (0, 8), (1, 9)]
+            assert all(evaluation[0] == run_id for evaluation in evaluations)
+            data = datasets.read_csv(self.dat)
+            assert json.loads(evaluations[3][3]) == data.iloc[5].to_dict()
+
+            iterations = connection.execute('SELECT iteration, points_evaluated, n_evaluations FROM iterations')
+            assert iterations.fetchall() == [(0, 2, 5)]
+            assert sorted(connection.execute('SELECT iteration, name, seconds FROM timings').fetchall()) == [
+                (0, 'acquisition', 1.5), (0, 'training', 0.5)]
+
+    def test_store_requires_save(self, tmp_path):
+        """Check that PAKMAN refuses an experiment store it would not write."""
+        with pytest.raises(ValueError):
+            PAKMAN(experiment_store=str(tmp_path / 'store.sqlite'), save=False)
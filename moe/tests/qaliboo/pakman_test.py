@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Test the acquisition function optimization of PAKMAN."""
+import numpy as np
+import pytest
+
+from qaliboo.datasets import Dataset
+from qaliboo.pakman import PAKMAN
+from qaliboo.precomputed_functions import _PrecomputedFunction
+
+
+def _build_pakman(**kwargs):
+    """PAKMAN on ScaledQuery26, seeded, with the given arguments."""
+    objective_func = _PrecomputedFunction(dataset=Dataset(csv_file='scaledQuery26.csv', param_cols=['#vm', 'ram'],
+                                                          target_col='cost', time_col='time', Realtime_col='time'))
+    np.random.seed(11)
+    # The maximum a posteriori hyperparameters do not depend on the unseeded random state of emcee
+    return PAKMAN(n_initial_points=5, batch_size=2, objective_func=objective_func, domain=objective_func,
+                  objective_func_name='ScaledQuery26', hyperparameter_sampler='map', **kwargs)
+
+
+class _CountingKG(object):
+
+    """Stand-in for the knowledge gradient that counts its evaluations; ascents leave the point where it is."""
+
+    def __init__(self):
+        # Shared by the copies of each restart
+        self.n_evaluations = [0]
+        self.points = []
+        self._point = None
+
+    def set_current_point(self, point):
+        self._point = np.array(point)
+        self.points.append(self._point)
+
+    def stochastic_optimization(self, gradient_ascent_parameters, constraint_penalty=None, initial_gradient=None):
+        # Every step evaluates the gradient, but the first one when it is given
+        self.n_evaluations[0] += gradient_ascent_parameters.num_steps - (initial_gradient is not None)
+        return self._point
+
+    def compute_kg_and_grad(self):
+        self.n_evaluations[0] += 1
+        return self.value(self._point), np.zeros(self._point.shape)
+
+    @staticmethod
+    def value(point):
+        return -np.sum(point**2)
+
+
+class TestMultistartOptimization(object):
+
+    """Test that the restarts of the acquisition function optimization do not depend on the threads running them."""
+
+    @staticmethod
+    def _next_points(n_optimization_threads):
+        """Next points of a seeded PAKMAN, optimized on n_optimization_threads threads."""
+        pakman = _build_pakman(n_restarts=6, n_optimization_threads=n_optimization_threads)
+        kg = pakman.acquisition_function(2)
+        return pakman.multistart_optimization(kg, 2)
+
+    def test_threads(self):
+        """Check that 1 and 4 threads give the same next points."""
+        assert np.array_equal(self._next_points(1), self._next_points(4))
+
+
+class TestRaceRestarts(object):
+
+    """Test the successive halving of the restarts under a budget of KG evaluations."""
+
+    @pytest.mark.parametrize('kg_evaluation_budget', [30, 100])
+    def test_budget(self, kg_evaluation_budget):
+        """Check that the race stays within the budget and picks the restart with the best KG."""
+        pakman = _build_pakman(n_restarts=15, kg_evaluation_budget=kg_evaluation_budget)
+        kg = _CountingKG()
+        next_points = pakman.multistart_optimization(kg, 2)
+        assert 0 < kg.n_evaluations[0] <= kg_evaluation_budget
+        assert np.array_equal(next_points, max(kg.points, key=_CountingKG.value))
+
+    def test_budget_too_small(self):
+        """Check that budgets below one step and one score per restart are rejected."""
+        for kg_evaluation_budget in (0, 29):
+            with pytest.raises(ValueError):
+                PAKMAN(n_restarts=15, kg_evaluation_budget=kg_evaluation_budget)
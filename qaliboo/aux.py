@@ -1,8 +1,16 @@
 import pandas as pd
+import numpy as np
+import atexit
 import json
+import logging
+import queue
+import threading
 from qaliboo import machine_learning_models
+from qaliboo import datasets
 import os
 import datetime
+
+_log = logging.getLogger(__name__)
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/query26_vm_ram.csv' 
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/ligen_synth_table.csv'
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/stereomatch10.csv'
@@ -37,7 +45,7 @@ def create_result_folder(sub_folder):
 
 def csv_init(result_folder, dat_indices, dat):
     dataset_csv_path = dat
-    df = pd.read_csv(dataset_csv_path)
+    df = datasets.read_csv(dataset_csv_path)
     new_df = pd.DataFrame({'dat_index': dat_indices})
     new_df = df.iloc[dat_indices, :]
     output_csv_path = f'{result_folder}/init.csv'
@@ -45,7 +53,7 @@ def csv_init(result_folder, dat_indices, dat):
 
 def csv_history(result_folder, iter_values, dat_indices, dat):
     dataset_csv_path = dat
-    df = pd.read_csv(dataset_csv_path)
+    df = datasets.read_csv(dataset_csv_path)
     output_csv_path = os.path.join(result_folder, 'history.csv')
     if os.path.exists(output_csv_path):
         existing_df = pd.read_csv(output_csv_path)
@@ -85,6 +93,158 @@ def csv_info(iteration, q, evaluation_count, global_time, unfeasible_points, map
     updated_df.to_csv(output_csv_path, index=False)
 
 
+class ResultWriter:
+    """
+    Appends the results of a run to the CSV files of its result folder.
+
+    Files are opened once and each call appends only its own rows, taken
+    from the dataset loaded at construction. Every call is flushed, so the
+    rows written before a crash are preserved.
+    """
+
+    def __init__(self, result_folder, dat):
+        self._result_folder = result_folder
+        self._dataset = datasets.read_csv(dat)
+        self._files = {}
+
+    def _append(self, file_name, new_df):
+        if file_name not in self._files:
+            self._files[file_name] = open(os.path.join(self._result_folder, file_name), 'a', newline='')
+        f = self._files[file_name]
+        new_df.to_csv(f, header=f.tell() == 0, index=False)
+        f.flush()
+
+    def _rows(self, dat_indices):
+        return self._dataset.iloc[np.asarray(dat_indices, dtype=int), :]
+
+    def write_init(self, dat_indices):
+        self._append('init.csv', self._rows(dat_indices))
+
+    def write_history(self, iter_values, dat_indices):
+        selected_rows_df = self._rows(dat_indices).copy()
+        selected_rows_df.insert(0, 'index', iter_values)
+        self._append('history.csv', selected_rows_df)
+
+    def write_info(self, iteration, q, evaluation_count, global_time, unfeasible_points, mape, error):
+        data = {
+            'iteration': [iteration],
+            'points_evaluated':[q],
+            'n_evaluations': [evaluation_count],
+            'unfeasible_points':[unfeasible_points],
+            'optimizer_time': [global_time],
+            'mape': [mape],
+            'error': [error]
+        }
+        self._append('info.csv', pd.DataFrame(data))
+
+    def write_timings(self, iteration, timings):
+        """
+        Timings are only kept by the experiment store: in result folders,
+        execution_times.csv belongs to save_execution_time().
+        """
+
+    def __getstate__(self):
+        # Open files stay with the process that created the writer
+        state = self.__dict__.copy()
+        state['_files'] = {}
+        return state
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BackgroundResultWriter:
+    """
+    Runs the calls of a ResultWriter, or of an
+    experiment_store.ExperimentStore, in a background thread.
+
+    Calls are queued and return immediately. The queue is bounded, so a
+    stalled disk eventually slows the caller down instead of growing memory.
+    close() waits until everything queued has been written, and re-raises
+    the first error met by the thread, unless another exception is already
+    being handled by the caller.
+    """
+
+    _STOP = object()
+
+    def __init__(self, writer, max_queued=64):
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+        self._thread.start()
+        # Do not lose queued rows if the owner never closes the writer
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            func, args = item
+            if self._error is None:
+                try:
+                    func(*args)
+                except Exception as e:
+                    self._error = e
+
+    def submit(self, func, *args):
+        """Queue func(*args) to be run by the writer thread"""
+        if self._error is not None:
+            raise self._error
+        self._queue.put((func, args))
+
+    def write_init(self, *args):
+        self.submit(self._writer.write_init, *args)
+
+    def write_history(self, *args):
+        self.submit(self._writer.write_history, *args)
+
+    def write_info(self, *args):
+        self.submit(self._writer.write_info, *args)
+
+    def write_timings(self, *args):
+        self.submit(self._writer.write_timings, *args)
+
+    def __getstate__(self):
+        # Worker processes never write, they only need a picklable object
+        return {'_writer': self._writer, '_queue': None, '_error': None, '_thread': None}
+
+    def close(self, raise_error=True):
+        """
+        Waits for the queued calls and closes the writer.
+
+        Args:
+            raise_error (bool): Re-raise the first error met by the thread; if False it is only logged,
+                so that it does not mask an exception the caller is propagating.
+        """
+        if self._thread is None:
+            return
+        atexit.unregister(self.close)
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+        self._writer.close()
+        if self._error is not None:
+            if raise_error:
+                raise self._error
+            _log.error('Results could not be written', exc_info=self._error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(raise_error=exc_type is None)
+
+
 def csv_result_XGB(iteration, q, min_evaluated, evaluation_count, global_time, unfeasible_points, best_point, result_file):
     # Creare un DataFrame con i nuovi dati
     data = {
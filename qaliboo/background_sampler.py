@@ -0,0 +1,102 @@
+import multiprocessing
+import queue
+
+import numpy as np
+
+from moe.optimal_learning.python.cpp_wrappers import log_likelihood_mcmc
+
+# libgomp does not survive a fork once the parent used OpenMP, and the sampler runs OpenMP code
+_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _sample_hyperparameters(kwargs, chain_state, seed, data_queue, result_queue):
+    """
+    Body of the background process: resample the hyperparameters every time new points arrive.
+    """
+    # The spawned process starts from fresh entropy; the model draws its own rng from the global one
+    np.random.seed(seed)
+    gp_loglikelihood = log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(**kwargs)
+    gp_loglikelihood.set_chain_state(chain_state)
+    while True:
+        # Wait for new points, then take everything that is already queued
+        sampled_points = [data_queue.get()]
+        while True:
+            try:
+                sampled_points.append(data_queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in sampled_points:
+            return
+        gp_loglikelihood.add_sampled_points([pt for points in sampled_points for pt in points])
+        gp_loglikelihood.train()
+        result_queue.put((gp_loglikelihood._num_sampled, gp_loglikelihood.hypers))
+
+
+class BackgroundHyperparameterSampler:
+    """
+    Runs the hyperparameter MCMC of a GaussianProcessLogLikelihoodMCMC in a separate process.
+
+    The process keeps its own copy of the data, resamples as soon as new points
+    are sent and returns each completed set of hyperparameter samples, tagged
+    with the number of points it was trained on.
+    """
+
+    def __init__(self, kwargs, gp_loglikelihood, seed, max_staleness=None):
+        """
+        Args:
+            kwargs (dict): Arguments of GaussianProcessLogLikelihoodMCMC, with the current historical_data.
+            gp_loglikelihood (GaussianProcessLogLikelihoodMCMC): Trained model whose chain is continued.
+            seed (int): Seed of the random numbers of the process, in [0, 2**32).
+            max_staleness (int): Largest number of evaluated points the hyperparameters in use may not have
+                been trained on; None never waits for the sampler.
+        """
+        self._max_staleness = max_staleness
+        self._num_sampled = gp_loglikelihood._num_sampled
+        self._data_queue = _CONTEXT.Queue()
+        self._result_queue = _CONTEXT.Queue()
+        self._process = _CONTEXT.Process(target=_sample_hyperparameters,
+                                         args=(kwargs, gp_loglikelihood.get_chain_state(), seed,
+                                               self._data_queue, self._result_queue),
+                                         daemon=True)
+        self._process.start()
+
+    def add_sampled_points(self, sampled_points):
+        self._data_queue.put(list(sampled_points))
+
+    def latest_hypers(self, num_sampled):
+        """
+        Most recent hyperparameter samples, waiting for fresher ones if they are too stale.
+
+        Args:
+            num_sampled (int): Number of points the model has now.
+
+        Returns:
+            The hyperparameter samples (log scale), or None if there is nothing newer than the last ones returned.
+        """
+        hypers = None
+        while True:
+            try:
+                self._num_sampled, hypers = self._result_queue.get_nowait()
+                continue
+            except queue.Empty:
+                pass
+            if self._max_staleness is None or num_sampled - self._num_sampled <= self._max_staleness:
+                return hypers
+            try:
+                self._num_sampled, hypers = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError('The background hyperparameter sampler stopped')
+
+    @property
+    def num_sampled(self):
+        """Number of points the last returned hyperparameters were trained on"""
+        return self._num_sampled
+
+    def close(self):
+        # A training in progress is of no use anymore
+        self._data_queue.put(None)
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
@@ -3,18 +3,120 @@
 The module contains three data sets and some auxiliary classes
 to load and read them.
 """
+import functools
+import hashlib
+import json
 import logging
+import os
+import shutil
+import tempfile
 
 import pandas as pd
 import numpy as np
-import os
-from typing import List
+from numpy.typing import ArrayLike
+from typing import Dict, List
 
 
 _log = logging.getLogger(__name__)
 _log.setLevel(logging.DEBUG)
 
 
+# Where the binary copies of the CSV files are kept, see load_columns()
+CACHE_DIR = os.environ.get('QALIBOO_DATASET_CACHE',
+                           os.path.join(os.path.dirname(__file__), '.cache'))
+# Part of the cache directory names: bump it when the layout of the cache changes
+_CACHE_VERSION = 3
+
+
+def _write_columns_cache(csv_file: str, cache_path: str) -> pd.DataFrame:
+    data = pd.read_csv(csv_file)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Written aside and renamed, so concurrent processes never see a partial cache
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path))
+    for i, column in enumerate(data.columns):
+        values = data[column].to_numpy()
+        if values.dtype == object:
+            missing = data[column].isna().to_numpy()
+            if not all(isinstance(value, str) for value in values[~missing]):
+                # Other objects (e.g. bools with missing values) are kept as they are, with None for the missing ones
+                with open(os.path.join(tmp_path, f'{i}.json'), 'w') as f:
+                    json.dump([None if m else value.item() if isinstance(value, np.generic) else value
+                               for value, m in zip(values, missing)], f)
+                continue
+            # Strings are stored as a fixed width array, the missing values in a separate mask
+            if missing.any():
+                np.save(os.path.join(tmp_path, f'{i}.missing.npy'), missing)
+            values = np.where(missing, '', values).astype(str)
+        np.save(os.path.join(tmp_path, f'{i}.npy'), values)
+    with open(os.path.join(tmp_path, 'columns.json'), 'w') as f:
+        json.dump([[column, str(dtype)] for column, dtype in data.dtypes.items()], f)
+    try:
+        os.rename(tmp_path, cache_path)
+    except OSError:
+        # Another process completed the same cache first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return data
+
+
+def _load_column(cache_path: str, i: int, dtype: str):
+    json_path = os.path.join(cache_path, f'{i}.json')
+    if os.path.exists(json_path):
+        with open(json_path) as f:
+            return np.array([np.nan if value is None else value for value in json.load(f)], dtype=object)
+    # Plain ndarray view of the map, so that pandas does not propagate the memmap subclass
+    values = np.load(os.path.join(cache_path, f'{i}.npy'), mmap_mode='r').view(np.ndarray)
+    if values.dtype.kind != 'U':
+        return values
+    # Strings come back with the dtype and the NaN entries of pd.read_csv
+    values = values.astype(object)
+    missing_path = os.path.join(cache_path, f'{i}.missing.npy')
+    if os.path.exists(missing_path):
+        values[np.load(missing_path)] = np.nan
+    return values if dtype == 'object' else pd.array(values, dtype=dtype)
+
+
+def load_columns(csv_file: str) -> Dict[str, ArrayLike]:
+    """
+    Loads the columns of a CSV file, the numeric ones as read-only memory-mapped arrays.
+
+    The first load converts the CSV into one file per column, in a
+    directory of CACHE_DIR keyed by the content hash of the CSV.
+    Later loads map those files instead of parsing the CSV again.
+    The other columns are loaded in memory, with the dtype and the
+    missing values (NaN) of pd.read_csv.
+
+    Args:
+        csv_file (str): Path to the CSV file.
+
+    Returns:
+        Dict[str, ArrayLike]: The columns of the file, in order, by name.
+    """
+    with open(csv_file, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(csv_file))[0]
+    cache_path = os.path.join(CACHE_DIR, f'{name}-{digest}-v{_CACHE_VERSION}')
+    if not os.path.isdir(cache_path):
+        try:
+            _write_columns_cache(csv_file, cache_path)
+        except OSError as e:
+            _log.warning(f'Cannot cache {csv_file} in {CACHE_DIR}: {e}')
+            data = pd.read_csv(csv_file)
+            return {column: data[column].array for column in data.columns}
+    with open(os.path.join(cache_path, 'columns.json')) as f:
+        columns = json.load(f)
+    return {column: _load_column(cache_path, i, dtype) for i, (column, dtype) in enumerate(columns)}
+
+
+def read_csv(csv_file: str) -> pd.DataFrame:
+    """
+    Same frame as pd.read_csv, backed by the columns of load_columns().
+
+    The numeric columns are read-only memory maps: copy the frame before
+    writing to it in place.
+    """
+    return pd.DataFrame(load_columns(csv_file), copy=False)
+
+
 class Dataset:
 
     def __init__(self, csv_file: str, param_cols: List[str], target_col:str, 
@@ -37,7 +139,7 @@ class Dataset:
         self._reduce_to_unique = reduce_to_unique
         
         self._csv_file = os.path.join(os.path.dirname(__file__), csv_file)
-        self._data = pd.read_csv(self._csv_file)
+        self._data = read_csv(self._csv_file)
         self._datatime = self._data[[time_col]]
         
         if self._Realtime_col is not None:
@@ -54,7 +156,15 @@ class Dataset:
                                 f'leaving {n_rows} rows')
                 logging.info(f'Dropping {n_init_rows - n_rows} rows')
             self._data = unique_data
-       
+
+        # Contiguous float64 copies of the columns used on the evaluation hot path,
+        # the DataFrames above are kept for reporting
+        self._X_array = np.ascontiguousarray(self._data[param_cols].to_numpy(dtype=float))
+        self._y_array = np.ascontiguousarray(self._data[target_col].to_numpy(dtype=float))
+        self._time_array = np.ascontiguousarray(self._datatime[time_col].to_numpy(dtype=float))
+        self._real_time_array = None
+        if self._Realtime_col is not None:
+            self._real_time_array = np.ascontiguousarray(self._dataRealtime[Realtime_col].to_numpy(dtype=float))
 
     @property
     def X(self):
@@ -74,6 +184,22 @@ class Dataset:
         if self._Realtime_col == None: return None
         return self._dataRealtime[self._Realtime_col]
     
+    @property
+    def X_array(self) -> np.ndarray:
+        return self._X_array
+
+    @property
+    def y_array(self) -> np.ndarray:
+        return self._y_array
+
+    @property
+    def time_array(self) -> np.ndarray:
+        return self._time_array
+
+    @property
+    def real_time_array(self) -> np.ndarray:
+        return self._real_time_array
+
     @property
     def folder(self):
         return os.path.dirname(__file__)
@@ -83,77 +209,94 @@ class Dataset:
         return self._csv_file
 
 
-LiGenTot = Dataset(
-    csv_file='ligen_synth_table.csv',
-    param_cols = ['ALIGN_SPLIT',
-                  'OPTIMIZE_SPLIT',
-                  'OPTIMIZE_REPS',
-                  'CUDA_THREADS',
-                  'N_RESTART',
-                  'CLIPPING',
-                  'SIM_THRESH',
-                  'BUFFER_SIZE'],
-    target_col='RMSD^3*TIME',
-    time_col = 'RMSD_0.75',
-    Realtime_col='TIME_TOTAL',
-    reduce_to_unique=False
-)
-ScaledLiGenTot = Dataset(
-    csv_file='scaledligentot.csv',
-    param_cols = ['ALIGN_SPLIT',
-                  'OPTIMIZE_SPLIT',
-                  'OPTIMIZE_REPS',
-                  'CUDA_THREADS',
-                  'N_RESTART',
-                  'CLIPPING',
-                  'SIM_THRESH',
-                  'BUFFER_SIZE'],
-    target_col='RMSD^3*TIME',
-    time_col = 'RMSD_0.75',
-    Realtime_col='TIME_TOTAL',
-    reduce_to_unique=False
-)
-
-Query26 = Dataset(
-    csv_file='query26_vm_ram.csv',
-    param_cols=['#vm', 'ram'],
-    target_col='cost',
-    time_col = 'time',
-    Realtime_col='time',
-    reduce_to_unique=False
-)
-ScaledQuery26 = Dataset(
-    csv_file='scaledQuery26.csv',
-    param_cols=['#vm', 'ram'],
-    target_col='cost',
-    time_col = 'time',
-    Realtime_col = 'time',
-    reduce_to_unique=False
-)
-
-StereoMatch = Dataset(
-    csv_file='stereomatch.csv',
-    param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
-    target_col='cost',
-    time_col = 'exec_time_ms',
-    Realtime_col = 'exec_time_ms',
-    reduce_to_unique=False
-)
-
-ScaledStereoMatch = Dataset(
-    csv_file='scaledstereomatch.csv',
-    param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
-    target_col='cost',
-    time_col = 'exec_time_ms',
-    Realtime_col = 'exec_time_ms',
-    reduce_to_unique=False
-)
-
-ScaledStereoMatch10 = Dataset(
-    csv_file='scaledstereomatch10.csv',
-    param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
-    target_col='cost',
-    time_col = 'exec_time_s',
-    Realtime_col = 'exec_time_s',
-    reduce_to_unique=False
-)
\ No newline at end of file
+# Datasets are parsed only when first accessed, see load()
+_DATASETS = {
+    'LiGenTot': dict(
+        csv_file='ligen_synth_table.csv',
+        param_cols = ['ALIGN_SPLIT',
+                      'OPTIMIZE_SPLIT',
+                      'OPTIMIZE_REPS',
+                      'CUDA_THREADS',
+                      'N_RESTART',
+                      'CLIPPING',
+                      'SIM_THRESH',
+                      'BUFFER_SIZE'],
+        target_col='RMSD^3*TIME',
+        time_col = 'RMSD_0.75',
+        Realtime_col='TIME_TOTAL',
+        reduce_to_unique=False
+    ),
+    'ScaledLiGenTot': dict(
+        csv_file='scaledligentot.csv',
+        param_cols = ['ALIGN_SPLIT',
+                      'OPTIMIZE_SPLIT',
+                      'OPTIMIZE_REPS',
+                      'CUDA_THREADS',
+                      'N_RESTART',
+                      'CLIPPING',
+                      'SIM_THRESH',
+                      'BUFFER_SIZE'],
+        target_col='RMSD^3*TIME',
+        time_col = 'RMSD_0.75',
+        Realtime_col='TIME_TOTAL',
+        reduce_to_unique=False
+    ),
+    'Query26': dict(
+        csv_file='query26_vm_ram.csv',
+        param_cols=['#vm', 'ram'],
+        target_col='cost',
+        time_col = 'time',
+        Realtime_col='time',
+        reduce_to_unique=False
+    ),
+    'ScaledQuery26': dict(
+        csv_file='scaledQuery26.csv',
+        param_cols=['#vm', 'ram'],
+        target_col='cost',
+        time_col = 'time',
+        Realtime_col = 'time',
+        reduce_to_unique=False
+    ),
+    'StereoMatch': dict(
+        csv_file='stereomatch.csv',
+        param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
+        target_col='cost',
+        time_col = 'exec_time_ms',
+        Realtime_col = 'exec_time_ms',
+        reduce_to_unique=False
+    ),
+    'ScaledStereoMatch': dict(
+        csv_file='scaledstereomatch.csv',
+        param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
+        target_col='cost',
+        time_col = 'exec_time_ms',
+        Realtime_col = 'exec_time_ms',
+        reduce_to_unique=False
+    ),
+    'ScaledStereoMatch10': dict(
+        csv_file='scaledstereomatch10.csv',
+        param_cols=['confidence', 'hypo_step', 'max_arm_length', 'num_threads'],
+        target_col='cost',
+        time_col = 'exec_time_s',
+        Realtime_col = 'exec_time_s',
+        reduce_to_unique=False
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load(name: str) -> Dataset:
+    """Build the named dataset on first access and cache it"""
+    if name not in _DATASETS:
+        raise KeyError(f'Unknown dataset {name}, choose one of {list(_DATASETS)}')
+    return Dataset(**_DATASETS[name])
+
+
+def __getattr__(name):
+    if name in _DATASETS:
+        return load(name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_DATASETS))
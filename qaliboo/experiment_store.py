@@ -0,0 +1,163 @@
+import datetime
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+from qaliboo import datasets
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    problem TEXT NOT NULL,
+    configuration TEXT NOT NULL,
+    seed INTEGER,
+    dataset TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_problem_configuration_seed ON runs (problem, configuration, seed);
+
+CREATE TABLE IF NOT EXISTS iterations (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    iteration INTEGER NOT NULL,
+    points_evaluated INTEGER,
+    n_evaluations INTEGER,
+    unfeasible_points INTEGER,
+    optimizer_time REAL,
+    mape REAL,
+    error REAL,
+    PRIMARY KEY (run_id, iteration)
+);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    iteration INTEGER NOT NULL,
+    dat_index INTEGER NOT NULL,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evaluations_run_iteration ON evaluations (run_id, iteration);
+
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    iteration INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_run_iteration ON timings (run_id, iteration);
+"""
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+def _native(value):
+    # sqlite3 only binds Python scalars
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def connect(path, timeout=60.0):
+    """
+    Open the experiment store at path, creating its tables if needed.
+
+    Args:
+        path (str): SQLite file shared by all the runs.
+        timeout (float): Seconds to wait for a concurrent writer to release the file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+    # Several runs can write the same store at once
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+class ExperimentStore:
+    """
+    Records a run in a SQLite experiment store, in place of a result folder.
+
+    It has the same interface as aux.ResultWriter, so it can be wrapped in an
+    aux.BackgroundResultWriter. Rows are kept in memory and written in a
+    single transaction when the iteration ends with write_info, or on close.
+    Dataset rows are stored as JSON objects in evaluations.row, and the
+    initial design is the iteration -1.
+    """
+
+    def __init__(self, path, problem, configuration, dat, seed=None):
+        """
+        Args:
+            path (str): SQLite file of the store.
+            problem (str): Name of the optimized problem.
+            configuration (dict): Optimizer settings of the run, stored as sorted JSON
+                so that runs with the same settings share the same key.
+            dat (str): CSV file of the dataset the evaluated indexes refer to.
+            seed (int): Random seed of the run, if known.
+        """
+        self._path = path
+        self._dataset = datasets.read_csv(dat)
+        self._connection = connect(path)
+        self._pending = {'evaluations': [], 'iterations': [], 'timings': []}
+        with self._connection:
+            cursor = self._connection.execute(
+                'INSERT INTO runs (problem, configuration, seed, dataset, started_at) VALUES (?, ?, ?, ?, ?)',
+                (problem, json.dumps(configuration, sort_keys=True), _native(seed), dat, _now()))
+        self.run_id = cursor.lastrowid
+
+    def write_init(self, dat_indices):
+        # The initial design is already recorded as iteration -1 of the history
+        pass
+
+    def write_history(self, iter_values, dat_indices):
+        dat_indices = np.asarray(dat_indices, dtype=int)
+        records = self._dataset.iloc[dat_indices, :].to_dict('records')
+        self._pending['evaluations'] += [(self.run_id, int(iter_values), int(i), json.dumps(record))
+                                         for i, record in zip(dat_indices, records)]
+
+    def write_timings(self, iteration, timings):
+        self._pending['timings'] += [(self.run_id, int(iteration), name, float(seconds))
+                                     for name, seconds in timings.items()]
+
+    def write_info(self, iteration, q, evaluation_count, global_time, unfeasible_points, mape, error):
+        self._pending['iterations'].append(
+            (self.run_id, int(iteration), _native(q), _native(evaluation_count), _native(unfeasible_points),
+             _native(global_time), _native(mape), _native(error)))
+        self.flush()
+
+    def flush(self):
+        """Write the pending rows in one transaction"""
+        pending, self._pending = self._pending, {'evaluations': [], 'iterations': [], 'timings': []}
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO evaluations (run_id, iteration, dat_index, row) VALUES (?, ?, ?, ?)',
+                pending['evaluations'])
+            self._connection.executemany(
+                'INSERT INTO iterations (run_id, iteration, points_evaluated, n_evaluations, unfeasible_points, '
+                'optimizer_time, mape, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                pending['iterations'])
+            self._connection.executemany(
+                'INSERT INTO timings (run_id, iteration, name, seconds) VALUES (?, ?, ?, ?)',
+                pending['timings'])
+
+    def __getstate__(self):
+        # The connection stays with the process that opened it
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
+    def close(self):
+        if self._connection is None:
+            return
+        self.flush()
+        with self._connection:
+            self._connection.execute('UPDATE runs SET finished_at = ? WHERE run_id = ?', (_now(), self.run_id))
+        self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -11,6 +11,7 @@ from scipy import spatial
 from typing import Tuple
 
 from moe.optimal_learning.python import geometry_utils
+from moe.optimal_learning.python.constant import DEFAULT_MAX_NUM_THREADS
 
 from moe.build import GPP as C_GP
 
@@ -135,6 +136,12 @@ class FiniteDomain(_AbstractFiniteDomain):
         distances, indexes = self._kdtree.query(point, k=k, workers=4)  # TODO: Decide the number of returned points k
         return distances, indexes, self._data[indexes]
 
+    def find_distances_indexes_closest_points_batch(self, points: np.ndarray, k: int = 30,
+                                                    max_num_threads: int = DEFAULT_MAX_NUM_THREADS):
+        distances, indexes = self._kdtree.query(np.atleast_2d(points), k=[i + 1 for i in range(k)],
+                                                workers=max_num_threads)
+        return distances, indexes, self._data[indexes]
+
     def find_distance_index_closest_point(self, point: np.ndarray) -> np.ndarray:
         return self.find_distances_indexes_closest_points(point, k=1)
 
@@ -239,10 +246,28 @@ class CPPFiniteDomain(_AbstractFiniteDomain):
         return output_update
 
     def find_distances_indexes_closest_points(self, point: np.ndarray, k=30) -> Tuple[float, int, np.ndarray]:
-        point_as_list = np.array(point).flatten().tolist()  # TODO: Multiple opposed cast, use something smarter
-        distances, indexes = self._cpp_finite_domain.find_distances_and_indexes_from_point(point_as_list)
+        point_as_list = np.array(point, dtype=float).flatten().tolist()
+        distances, indexes = self._cpp_finite_domain.find_k_nearest_distances_and_indexes_from_point(point_as_list, k)
         distances, indexes = np.array(distances), np.array(indexes)
-        return distances[:k], indexes[:k], self._data[indexes][:k]
+        return distances, indexes, self._data[indexes]
+
+    def find_distances_indexes_closest_points_batch(self, points: np.ndarray, k=30,
+                                                    max_num_threads: int = DEFAULT_MAX_NUM_THREADS):
+        """Batch version of find_distances_indexes_closest_points
+
+        :param points: query points
+        :type points: array of float64 with shape (n_queries, dim)
+        :param k: number of neighbours returned for each query
+        :return: distances and indexes with shape (n_queries, k), ordered from closest
+            to furthest, and the corresponding points with shape (n_queries, k, dim)
+        """
+        points = np.atleast_2d(np.array(points, dtype=float))
+        distances, indexes = self._cpp_finite_domain.find_k_nearest_distances_and_indexes_from_points(
+            points.flatten().tolist(), k, max_num_threads)
+        n_queries = points.shape[0]
+        distances = np.array(distances).reshape(n_queries, -1)
+        indexes = np.array(indexes, dtype=int).reshape(n_queries, -1)
+        return distances, indexes, self._data[indexes]
 
     def find_distance_index_closest_point(self, point: np.ndarray) -> np.ndarray:
         distances, indexes, closest_point = self.find_distances_indexes_closest_points(point, 1)
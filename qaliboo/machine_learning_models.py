@@ -1,6 +1,8 @@
 from sklearn.linear_model import Ridge, Lasso
 import numpy as np 
 
+from moe.build import GPP as C_GP
+
 class ML_model:
 
     def __init__(self, X_data, y_data, X_ub = None, X_lb = None, typemodel='ridge'):
@@ -124,6 +126,17 @@ class ML_model:
         if self.out_pred_ratio(X) > 0: return 0
         else: return 1
     
+    def linear_constraint_penalty(self):
+        """
+        The model and its bounds as a C++ LinearConstraintPenalty, for the acquisition function optimizers.
+        It accepts the points check_inside accepts.
+        """
+        coefficients = np.ravel(self.model.coef_)
+        return C_GP.LinearConstraintPenalty(coefficients.tolist(), float(np.ravel(self.model.intercept_)[0]),
+                                            -np.inf if self._X_lb is None else float(self._X_lb),
+                                            np.inf if self._X_ub is None else float(self._X_ub),
+                                            coefficients.shape[0])
+
     def check_inside(self, x):
         """
         Check if prediction of the point is inside the bounds.
@@ -1,3 +1,4 @@
+import copy
 import logging
 import time
 import numpy as np
@@ -11,13 +12,17 @@ from moe.optimal_learning.python import default_priors
 from moe.optimal_learning.python import random_features
 from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as KG
 from examples import  auxiliary
-from qaliboo import SGA as sga
 from qaliboo.machine_learning_models import ML_model
 import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from moe.build import GPP as C_GP
 from qaliboo import aux
-from qaliboo import simulated_annealing as SA 
+from qaliboo.experiment_store import ExperimentStore
+from qaliboo.background_sampler import BackgroundHyperparameterSampler
 from sklearn.metrics import mean_absolute_percentage_error as mape
 import datetime
+import math
+import os
 
 logging.basicConfig(level=logging.NOTSET)
 _log = logging.getLogger(__name__)
@@ -26,7 +31,12 @@ _log.setLevel(logging.DEBUG)
 class PAKMAN:
     def __init__(self, n_initial_points: int = 10, n_iterations: int = 30, batch_size:int = 4,
                  m_domain_discretization: int= 30, objective_func = None, domain=None, objective_func_name=None, lb: float=None, 
-                 ub: float=None, dub:float=None, nm:bool=False, uniform_sample:bool=True, n_restarts:int = 15, save:bool=False, timeout=0.0):
+                 ub: float=None, dub:float=None, nm:bool=False, uniform_sample:bool=True, n_restarts:int = 15, save:bool=False, timeout=0.0,
+                 experiment_store:str=None, seed:int=None, hyperparameter_sampler:str='emcee',
+                 mcmc_effective_samples:int=None, refresh_evaluations:int=1, refresh_seconds:float=None,
+                 refresh_likelihood_drop:float=None, background_hyperparameters:bool=False,
+                 max_hyperparameter_staleness:int=None, n_optimization_threads:int=1,
+                 kg_evaluation_budget:int=None):
         """
         Initializes an instance of PAKMAN.
 
@@ -42,7 +52,34 @@ class PAKMAN:
             uniform_sample (bool): True if domain is to be uniformly sampled (False if sample from the global optimum).
             n_restarts (int): Number of restarts for optimization.
             save (bool): True if the results have to be saved
+            experiment_store (str): SQLite file where the results are saved, instead of a result folder.
+                Requires save=True.
+            seed (int): Random seed of the run, recorded in the experiment store.
+            hyperparameter_sampler (str): Sampler of the GP hyperparameters: MCMC with 'emcee' or 'hmc', or the
+                faster 'map' (maximum a posteriori) and 'laplace' (Laplace approximation around it).
+            mcmc_effective_samples (int): If given, each 'emcee' training stops once the chain holds this many
+                effective samples, running at most the default chain length.
+            refresh_evaluations (int): Resample the GP hyperparameters every refresh_evaluations new evaluations.
+                In between, the current hyperparameter samples are only conditioned on the new points.
+            refresh_seconds (float): Also resample once this many seconds went by since the last resampling.
+            refresh_likelihood_drop (float): Also resample once the mean log likelihood per point of the current
+                hyperparameters dropped by more than this since the last resampling.
+            background_hyperparameters (bool): True if the GP hyperparameters are resampled in a background process,
+                in place of the refresh policy; the models use the last completed samples. The script running
+                PAKMAN must guard its entry point with `if __name__ == '__main__':`.
+            max_hyperparameter_staleness (int): Largest number of evaluated points the hyperparameters in use
+                may not have been trained on, waiting for the background process if needed; None never waits.
+            n_optimization_threads (int): Number of threads running the restarts of the acquisition function
+                optimization in parallel. The result does not depend on it.
+            kg_evaluation_budget (int): If given, the restarts race by successive halving: all of them take a few
+                gradient ascent steps, the worst half is dropped, and so on, using at most this many KG evaluations
+                (values and gradients) per acquisition optimization. It must allow one step and one score per
+                restart, 2*n_restarts. None runs every restart to completion.
         """
+        if experiment_store is not None and not save:
+            raise ValueError('experiment_store is only written when save=True')
+        if kg_evaluation_budget is not None and (kg_evaluation_budget <= 0 or kg_evaluation_budget < 2*n_restarts):
+            raise ValueError('kg_evaluation_budget must allow one step and one score per restart, 2*n_restarts')
         self._n_initial_points = n_initial_points
         self._n_iterations = n_iterations
         self._q = batch_size
@@ -54,7 +91,10 @@ class PAKMAN:
         self._nm = nm
         self._uniform_sample = uniform_sample
         self._n_restarts=n_restarts
+        self._n_optimization_threads = n_optimization_threads
+        self._kg_evaluation_budget = kg_evaluation_budget
         self._save=save
+        self._result_writer = None
         if objective_func_name is None:
             self._dat = objective_func.dataset.csv_file
         else: 
@@ -74,6 +114,8 @@ class PAKMAN:
             max_relative_change=0.2, tolerance=1.0e-10)
 
         self._global_time=0
+        # ML time of the dataset rows already evaluated in this run, by row index
+        self._ml_time_memo = {}
 
         #initial_points_array= self._domain.sample_points_in_domain(n_initial_points)
         initial_points_array = self._domain.generate_uniform_random_points_in_domain(n_initial_points)
@@ -99,24 +141,57 @@ class PAKMAN:
                 dub = ub
             
             self._ml_model = ML_model(X_data=initial_points_array, 
-                        y_data=np.array([objective_func.evaluate_time(pt) for pt in initial_points_array]), 
+                        y_data=np.array([self._ml_time(pt, idx) for pt, idx in zip(initial_points_array, initial_points_index)]), 
                         X_ub=dub,
                         X_lb=lb) 
             
         # Initialize the Gaussian Process
-        self._gp_loglikelihood = log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(
-            historical_data=initial_data,
+        # HMC transitions are gradient-driven and mix in far fewer steps than the ensemble sampler
+        chain_length, burnin_steps = (50, 200) if hyperparameter_sampler == 'hmc' else (1000, 2000)
+        gp_loglikelihood_kwargs = dict(
             derivatives=objective_func.derivatives,  # Questo valore quando passato è 0
             prior=default_priors.DefaultPrior(1 + objective_func.dim + objective_func.n_observations, objective_func.n_observations),
-            chain_length=1000,
-            burnin_steps=2000,
+            chain_length=chain_length,
+            burnin_steps=burnin_steps,
             n_hypers=1,
-            noisy=True
+            noisy=True,
+            sampler=hyperparameter_sampler,
+            target_effective_samples=mcmc_effective_samples
         )
+        self._gp_loglikelihood = log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(
+            historical_data=initial_data, **gp_loglikelihood_kwargs)
         self._gp_loglikelihood.train()
 
-        
-        if self._save:
+        self._background_sampler = None
+        if background_hyperparameters:
+            # Drawn from the global state, which the run seed determines, so the process is reproducible too
+            self._background_sampler = BackgroundHyperparameterSampler(
+                dict(gp_loglikelihood_kwargs, historical_data=initial_data), self._gp_loglikelihood,
+                np.random.randint(np.iinfo(np.int32).max), max_hyperparameter_staleness)
+
+        # Hyperparameter refresh policy, see update_gp_loglikelihood
+        self._refresh_evaluations = refresh_evaluations
+        self._refresh_seconds = refresh_seconds
+        self._refresh_likelihood_drop = refresh_likelihood_drop
+        self._mark_refresh()
+
+        if self._save and experiment_store is not None:
+            configuration = {'n_initial_points': n_initial_points, 'n_iterations': n_iterations, 'batch_size': batch_size,
+                             'm_domain_discretization': m_domain_discretization, 'lb': lb, 'ub': ub, 'dub': dub, 'nm': nm,
+                             'uniform_sample': uniform_sample, 'n_restarts': n_restarts, 'timeout': timeout,
+                             'hyperparameter_sampler': hyperparameter_sampler,
+                             'mcmc_effective_samples': mcmc_effective_samples,
+                             'refresh_evaluations': refresh_evaluations, 'refresh_seconds': refresh_seconds,
+                             'refresh_likelihood_drop': refresh_likelihood_drop,
+                             'background_hyperparameters': background_hyperparameters,
+                             'max_hyperparameter_staleness': max_hyperparameter_staleness,
+                             'n_optimization_threads': n_optimization_threads,
+                             'kg_evaluation_budget': kg_evaluation_budget}
+            problem = objective_func_name if objective_func_name is not None else os.path.basename(self._dat)
+            store = ExperimentStore(experiment_store, problem, configuration, self._dat, seed)
+            self._result_writer = aux.BackgroundResultWriter(store)
+            self._result_writer.write_history(-1, initial_points_index)
+        elif self._save:
             if ub is not None and nm:
                 result_folder = f'./results_asynch/{objective_func_name}/{dub}/NM/timeout_{timeout}'
             elif ub is not None:
@@ -125,8 +200,10 @@ class PAKMAN:
                 result_folder = f'./results_asynch/{objective_func_name}/NM_noUB/{dub}/timeout_{timeout}'
 
             self._result_folder = aux.create_result_folder(result_folder)
-            aux.csv_init(self._result_folder, initial_points_index, self._dat)
-            aux.csv_history(self._result_folder,-1,initial_points_index, self._dat)
+            # Results are written by a background thread, off the optimization loop
+            self._result_writer = aux.BackgroundResultWriter(aux.ResultWriter(self._result_folder, self._dat))
+            self._result_writer.write_init(initial_points_index)
+            self._result_writer.write_history(-1, initial_points_index)
     
     
     def sync_optimization(self):
@@ -134,10 +211,16 @@ class PAKMAN:
         Syncronous Knoledge Gradient optimization.
         '''
         _log.info("PARALLEL SYNCRONOUS BAYESIAN OPTIMIZATION")
-        for s in range(self._n_iterations):
-            self.iteration_step(s)
-            if self._objective_func.evaluation_count>1000:
-                break
+        try:
+            for s in range(self._n_iterations):
+                self.iteration_step(s)
+                if self._objective_func.evaluation_count>1000:
+                    break
+        except BaseException:
+            # Report the exception that stopped the loop, not a later error of the result writer
+            self.close(raise_error=False)
+            raise
+        self.close()
 
         _log.info("\nOptimization finished successfully")
 
@@ -176,10 +259,29 @@ class PAKMAN:
 
         self.log_iteration_result(suggested_minimum, s, self._q, unfeasible_points, mape_value)
 
-        if self._save:
-            aux.csv_info(s, self._q, self._objective_func.evaluation_count,
-                         self._global_time, unfeasible_points, mape_value, self._result_folder, self._error)
+        if self._result_writer is not None:
+            self._result_writer.write_timings(s, {'algorithm': alg_time, 'evaluation': max_time})
+            self._result_writer.write_info(s, self._q, self._objective_func.evaluation_count,
+                                           self._global_time, unfeasible_points, mape_value, self._error)
     
+    def close(self, raise_error=True):
+        '''
+        Stop the background hyperparameter sampler, then wait for the pending results to be written.
+        An error of the result writer is raised only if raise_error, the sampler is stopped anyway.
+        '''
+        try:
+            self.close_background_sampler()
+        finally:
+            self.close_result_writer(raise_error)
+
+    def close_result_writer(self, raise_error=True):
+        '''
+        Wait for the pending results to be written and release the result files.
+        '''
+        if self._result_writer is not None:
+            result_writer, self._result_writer = self._result_writer, None
+            result_writer.close(raise_error)
+
     def acquisition_function(self, q, points_being_sampled=None):
         '''
         Definition of the acquisition function.
@@ -199,27 +301,116 @@ class PAKMAN:
                                         num_mc_iterations=2**7,
                                         points_being_sampled=points_being_sampled,
                                         points_to_sample=None)
+        # The GP is not modified until the next acquisition: set up the discrete points and inner optimizer once
+        kg.create_evaluator()
         return kg
 
     def multistart_optimization(self, kg, q):
         '''
         Multistart Optimization.
-        '''
-        report_point=[]
-        kg_list = []
-        for i in range(self._n_restarts):
-            new_point, kg_value = self.optimize_point(kg, q)
-            report_point.append(new_point)
-            kg_list.append(kg_value)
+
+        The restarts run on self._n_optimization_threads threads: the C++ KG computations release the GIL,
+        while the KG and the GP cannot be sent to other processes. Each restart has its own random streams
+        for the Monte Carlo KG estimates, so the result does not depend on the number of threads or on their
+        scheduling.
+        '''
+        # The domain draws from the global random state: draw all the starting points here, in order
+        init_points = [np.array(self._domain.generate_uniform_random_points_in_domain(q)) for _ in range(self._n_restarts)]
+        seeds = np.random.SeedSequence(np.random.randint(np.iinfo(np.int32).max)).spawn(self._n_restarts)
+        restart_kgs = [self._restart_kg(kg, seed) for seed in seeds]
+        constraint_penalty = self._ml_model.linear_constraint_penalty() if self._use_ml else None
+
+        with ThreadPoolExecutor(max_workers=self._n_optimization_threads) as executor:
+            map_restarts = executor.map if self._n_optimization_threads > 1 else map
+            if self._kg_evaluation_budget is None:
+                res = list(map_restarts(self.optimize_point, restart_kgs, init_points,
+                                        [constraint_penalty]*self._n_restarts))
+            else:
+                res = self._race_restarts(map_restarts, restart_kgs, init_points, constraint_penalty)
+        report_point, kg_list = zip(*res)
+        # Ties go to the first restart
         index = np.argmax(kg_list)
         next_points = report_point[index]
         return next_points
+
+    def _race_restarts(self, map_restarts, kgs, points, constraint_penalty=None):
+        '''
+        Successive halving over the restarts: each round spends an equal share of what is left of
+        self._kg_evaluation_budget on gradient ascent steps of the surviving restarts, scores them, and keeps
+        the best half. The first round takes at least one step per restart, the total never exceeds the budget.
+
+        Returns:
+            The (point, penalized KG) of the final survivors, in restart order.
+        '''
+        self._error = 1.0
+        survivors = list(range(len(points)))
+        scores = [None]*len(points)
+        # KG gradient at each point as it was scored, which is the first step of its next round
+        grads = [None]*len(points)
+        n_steps_done = 0
+        n_rounds = max(1, math.ceil(math.log2(len(points))))
+        n_evaluations = 0
+        for r in range(n_rounds):
+            # Each survivor is scored with one evaluation, which also gives the next first step; the first round
+            # also evaluates the gradient at the starting points
+            round_budget = (self._kg_evaluation_budget - n_evaluations) // (n_rounds - r)
+            n_steps = round_budget // len(survivors) - (r == 0)
+            if r == 0:
+                # The budget allows it, see __init__
+                n_steps = max(1, n_steps)
+            n_steps = min(n_steps, self._max_ascent_steps - n_steps_done)
+
+            def advance(i):
+                points[i] = self._ascend(kgs[i], points[i], n_steps_done, n_steps, grads[i], constraint_penalty)
+                kg_value, grads[i] = kgs[i].compute_kg_and_grad()
+                scores[i] = kg_value*self._penalty(points[i])
+
+            # Ascents that are complete, or out of budget, keep their last score
+            if n_steps > 0:
+                list(map_restarts(advance, survivors))
+                n_evaluations += len(survivors)*(n_steps + (r == 0))
+                n_steps_done += n_steps
+            # Keep the best half, ties going to the first restarts
+            survivors = sorted(sorted(survivors, key=lambda i: (-scores[i], i))[:math.ceil(len(survivors)/2)])
+        _log.debug(f"Restart racing used {n_evaluations} KG evaluations")
+        return [(points[i], scores[i]) for i in survivors]
+
+    @property
+    def _max_ascent_steps(self):
+        # Stochastic gradient ascent steps of a complete restart
+        return 100 if self._use_ml else 60
+
+    def _ascend(self, kg, point, first_step, n_steps, grad=None, constraint_penalty=None):
+        '''
+        Stochastic gradient ascent of a point from step first_step, in a single C++ call.
+        Steps do not leave the region accepted by constraint_penalty (the Machine Learning model).
+
+        Returns:
+            The new point; kg is left at it.
+        '''
+        gradient_ascent_parameters = cpp_optimization.StochasticGradientAscentParameters(
+            num_steps=n_steps, first_step=first_step, gamma=0.7, pre_mult=1.0,
+            max_relative_change=1.0 if self._use_ml else 0.5)
+        kg.set_current_point(point)
+        return kg.stochastic_optimization(gradient_ascent_parameters, constraint_penalty=constraint_penalty,
+                                          initial_gradient=grad)
+
+    @staticmethod
+    def _restart_kg(kg, seed):
+        '''
+        Copy of the acquisition function with its own sources of random numbers, for one restart.
+        '''
+        restart_kg = copy.copy(kg)
+        restart_kg._randomness = C_GP.RandomnessSourceContainer(1)
+        normal_seed, uniform_seed = seed.generate_state(2)
+        restart_kg._randomness.SetExplicitNormalRNGSeed(int(normal_seed))
+        restart_kg._randomness.SetExplicitUniformGeneratorSeed(int(uniform_seed))
+        return restart_kg
     
-    def optimize_point(self, kg, q):
+    def optimize_point(self, kg, init_point, constraint_penalty=None):
         '''
         Gradient Ascent + Machine Learning Optimization.
         ''' 
-        init_point = np.array(self._domain.generate_uniform_random_points_in_domain(q))
         # Stocastic Gradient Ascent
         """
         if self._objective_func.evaluation_count - self._n_initial_points > 50:
@@ -229,31 +420,54 @@ class PAKMAN:
         """
         self._error = 1.0
 
-        if self._use_ml:
-            new_point = SA.simulated_annealing_ML(self._domain, kg, self._ml_model, init_point, 40, 3, 0.1)
-            new_point = sga.stochastic_gradient_ml(kg, self._domain, init_point, self._ml_model)
-        else:
-            new_point = SA.simulated_annealing(self._domain, kg, init_point, 40, 2, 0.1)
-            new_point = sga.stochastic_gradient(kg, self._domain, init_point)
-            
+        # The simulated annealing that used to run first is gone: its result was discarded, the gradient ascent
+        # always started from init_point
+        new_point = self._ascend(kg, init_point, 0, self._max_ascent_steps, constraint_penalty=constraint_penalty)
+        return new_point, self._score_point(kg, new_point)
+
+    def _score_point(self, kg, new_point):
+        '''
+        KG of a point, times the Machine Learning penalization.
+        '''
         kg.set_current_point(new_point)
-        # Machine Learning Penalization method
+        kg_value = kg.compute_knowledge_gradient_mcmc()*self._penalty(new_point)
+        return kg_value  
+
+    def _penalty(self, new_point):
+        '''
+        Machine Learning penalization of a point, multiplying its KG.
+        '''
         identity = 1
         if self._nm:    
             identity *= self._ml_model.nascent_minima(new_point)
         if self._ub is not None or self._lb is not None:
             identity*=self._ml_model.exponential_penality(new_point, 7, self._error)
-        kg_value = kg.compute_knowledge_gradient_mcmc()*identity 
-        return new_point, kg_value  
+        return identity
 
 
     def _evaluate_point(self, pt):
+        if hasattr(self._objective_func, 'evaluate_all'):
+            # Precomputed functions return the ML time from the same lookup
+            poi_v, poi_i, poi_t, poi_ml_t = self._objective_func.evaluate_all(pt)
+            return poi_v, poi_i, np.array(poi_t), poi_ml_t
         result = self._objective_func.evaluate(pt)
         if isinstance(result, tuple): 
             poi_v, poi_i, poi_t = result 
-            return poi_v, poi_i, np.array(poi_t)
+            return poi_v, poi_i, np.array(poi_t), None
         else:
-            return result, None, None
+            return result, None, None, None
+
+    def _remember_ml_time(self, index, ml_time):
+        if index is not None and ml_time is not None:
+            self._ml_time_memo[int(index)] = ml_time
+
+    def _ml_time(self, point, index):
+        '''
+        ML time of an evaluated point, resolved again only if it was never looked up in this run.
+        '''
+        if index is not None and int(index) in self._ml_time_memo:
+            return self._ml_time_memo[int(index)]
+        return self._objective_func.evaluate_time(point)
     
     def _wrapper_func(self, pt, queue):
         result = self._evaluate_point(pt)
@@ -269,12 +483,20 @@ class PAKMAN:
         '''
         Evaluate objective function at the next points in sequential order (just one process).
         '''
+        if hasattr(self._objective_func, 'evaluate_all_batch'):
+            # Precomputed functions resolve the whole batch in one pass
+            next_points_value, next_points_index, next_points_time, next_points_ml_time = \
+                self._objective_func.evaluate_all_batch(np.asarray(next_points))
+            for poi_i, poi_ml_t in zip(next_points_index, next_points_ml_time):
+                self._remember_ml_time(poi_i, poi_ml_t)
+            return next_points_value, next_points_index, next_points_time
         dim = len(next_points)
         next_points_value = np.zeros(dim)
         next_points_index = np.zeros(dim)
         next_points_time = np.zeros(dim)
         for count, pt in enumerate(next_points):
-            poi_v, poi_i, poi_t = self._evaluate_point(pt)
+            poi_v, poi_i, poi_t, poi_ml_t = self._evaluate_point(pt)
+            self._remember_ml_time(poi_i, poi_ml_t)
             next_points_value[count] = poi_v
             next_points_index[count] = poi_i
             next_points_time[count] = poi_t
@@ -296,7 +518,9 @@ class PAKMAN:
         while not queue.empty():
             results.append(queue.get())
         self._objective_func.add_evaluation_count(self._q)
-        next_points_value, next_points_index, next_points_time = zip(*results)
+        next_points_value, next_points_index, next_points_time, next_points_ml_time = zip(*results)
+        for poi_i, poi_ml_t in zip(next_points_index, next_points_ml_time):
+            self._remember_ml_time(poi_i, poi_ml_t)
         return np.array(next_points_value), np.array(next_points_index), np.array(next_points_time)
     
     def update_model(self, next_points, next_points_value, next_points_index, s):
@@ -307,12 +531,12 @@ class PAKMAN:
         sampled_points = [data_containers.SamplePoint(pt, next_points_value[num])
                             for num, pt in enumerate(next_points)]
         # Save the data
-        if self._save:
-            aux.csv_history(self._result_folder,s,next_points_index, self._dat)
+        if self._result_writer is not None:
+            self._result_writer.write_history(s, next_points_index)
 
         # Update the ML model
         if self._use_ml:
-            target = np.array([self._objective_func.evaluate_time(pt) for pt in next_points])
+            target = np.array([self._ml_time(pt, idx) for pt, idx in zip(next_points, next_points_index)])
             # Compute the Mean Absolute Percentage Error (MAPE) 
             predictions = self._ml_model.predict(next_points)
             mape_value = mape(target, predictions)
@@ -333,8 +557,52 @@ class PAKMAN:
         Update of the Gaussian Process with the new points sampled.
         '''
         self._gp_loglikelihood.add_sampled_points(sampled_points)
-        self._gp_loglikelihood.train()
+        if self._background_sampler is not None:
+            self._background_sampler.add_sampled_points(sampled_points)
+            self.use_latest_hyperparameters()
+            return
+        self._evaluations_since_refresh += len(sampled_points)
+        if self._needs_refresh():
+            self._gp_loglikelihood.train()
+            self._mark_refresh()
         return
+
+    def use_latest_hyperparameters(self):
+        '''
+        Switch the Gaussian Process to the last hyperparameters completed by the background sampler.
+        '''
+        hypers = self._background_sampler.latest_hypers(self._gp_loglikelihood._num_sampled)
+        if hypers is not None:
+            self._gp_loglikelihood.set_hypers(hypers)
+
+    def close_background_sampler(self):
+        '''
+        Stop the background hyperparameter sampler, if any.
+        '''
+        if self._background_sampler is not None:
+            self._background_sampler.close()
+            self._background_sampler = None
+
+    def _needs_refresh(self):
+        '''
+        True if the GP hyperparameters have to be resampled, according to the refresh policy.
+        '''
+        if self._refresh_evaluations is not None and self._evaluations_since_refresh >= self._refresh_evaluations:
+            return True
+        if self._refresh_seconds is not None and time.time() - self._refresh_time >= self._refresh_seconds:
+            return True
+        if self._refresh_likelihood_drop is not None:
+            log_likelihood = self._gp_loglikelihood.compute_mean_log_likelihood() / self._gp_loglikelihood._num_sampled
+            if self._refresh_log_likelihood - log_likelihood > self._refresh_likelihood_drop:
+                return True
+        return False
+
+    def _mark_refresh(self):
+        self._evaluations_since_refresh = 0
+        self._refresh_time = time.time()
+        if self._refresh_likelihood_drop is not None:
+            self._refresh_log_likelihood = (self._gp_loglikelihood.compute_mean_log_likelihood() /
+                                            self._gp_loglikelihood._num_sampled)
     
     def find_suggested_minimum(self):
         '''
@@ -403,13 +671,11 @@ class PAKMAN:
         '''
         Fake simulation of the objective function
         '''
-        result = self._objective_func.evaluate(point)
-        if isinstance(result, tuple):
-            poi_v, poi_i, poi_t = result
+        poi_v, poi_i, poi_t, poi_ml_t = self._evaluate_point(point)
+        if poi_t is not None:
             fake_time = poi_t/self._time_proportion
             time.sleep(fake_time/1000)
-            queue.put((point, poi_v, poi_i))  
-        else: queue.put((point, poi_v, None))
+        queue.put((point, poi_v, poi_i, poi_ml_t))
         return 
     
     def async_optimization(self, t_restart, n_process, time_proportion):
@@ -434,87 +700,101 @@ class PAKMAN:
         #self._time_proportion = 50000
         time0 = time.time()
         #self._time_proportion = 250 # COnstant for StereoMatch
-        while True:
+        try:
+            while True:
             
-            time1 = time.time()
-            # Avvio di nuovi processi se necessario
-            if len(active_process) < n_process:
-                q = n_process - len(active_process)
-                _log.info(f"q = {q}")
-                # Acquisition function optimization
-                kg = self.acquisition_function(q, points_in_process)
-                points_to_explore = self.multistart_optimization(kg, q)
+                time1 = time.time()
+                # Avvio di nuovi processi se necessario
+                if len(active_process) < n_process:
+                    q = n_process - len(active_process)
+                    _log.info(f"q = {q}")
+                    if self._background_sampler is not None:
+                        self.use_latest_hyperparameters()
+                    # Acquisition function optimization
+                    kg = self.acquisition_function(q, points_in_process)
+                    points_to_explore = self.multistart_optimization(kg, q)
                 
-                # Deliver points where compute the objective function to the processes
-                for point in points_to_explore:
-                    proc = multiprocessing.Process(target=self.func_obj, args=(point , queue))
-                    proc.start()
-                    active_process.append(proc)
-                    assigned_points[proc] = point
+                    # Deliver points where compute the objective function to the processes
+                    for point in points_to_explore:
+                        proc = multiprocessing.Process(target=self.func_obj, args=(point , queue))
+                        proc.start()
+                        active_process.append(proc)
+                        assigned_points[proc] = point
             
-            # Simulate waiting time
-            if t_restart > 0:
-                #print("Waiting time real", int(t_restart/self._time_proportion), "seconds")
-                for _ in tqdm(range(int(t_restart/self._time_proportion)), desc="Wait", unit="second"):
-                    time.sleep(1)
-                #time.sleep(t_restart)
+                # Simulate waiting time
+                wait_time = 0.0
+                if t_restart > 0:
+                    wait_start = time.time()
+                    #print("Waiting time real", int(t_restart/self._time_proportion), "seconds")
+                    for _ in tqdm(range(int(t_restart/self._time_proportion)), desc="Wait", unit="second"):
+                        time.sleep(1)
+                    #time.sleep(t_restart)
+                    wait_time = time.time() - wait_start
           
-            to_be_removed = []
-            for proc in active_process:
-                if not proc.is_alive(): # Check the terminated process
-                    res = queue.get()  # Save the result
-                    if res is not None:
-                        results.append(res)
-                    del assigned_points[proc]   # Delete the inactive processes 
-                    to_be_removed.append(proc)
+                to_be_removed = []
+                for proc in active_process:
+                    if not proc.is_alive(): # Check the terminated process
+                        res = queue.get()  # Save the result
+                        if res is not None:
+                            results.append(res)
+                        del assigned_points[proc]   # Delete the inactive processes 
+                        to_be_removed.append(proc)
                     
-            for proc_ in to_be_removed:   
-                active_process.remove(proc_)
+                for proc_ in to_be_removed:   
+                    active_process.remove(proc_)
             
-            # Get the points that are still in process
-            points_in_process = [assigned_points[proc] for proc in active_process]
+                # Get the points that are still in process
+                points_in_process = [assigned_points[proc] for proc in active_process]
             
-            # Update the model with the computed results
-            if results:
-                next_points = [[*res[0]] for res in results]
-                next_points_value = []
-                next_points_index = []
-
-                for res in results:
-                    next_points_value.append(res[1])
-                    next_points_index.append(res[2])
-
-                dimension = len(next_points_value)
-                self._objective_func.add_evaluation_count(dimension) # Add evaluation count to the model
-                # Update the model
-                target, mape_value = self.update_model(next_points, next_points_value, next_points_index, s)
-
-                # Compute the minimum of the posterior distribution
-                suggested_minimum = self.find_suggested_minimum()
-
-                if t_restart > 0:
-                    self._global_time += time.time() - time1 + t_restart*(self._time_proportion-1) # real time
-                else:
-                    self._global_time = (time.time() - time0)*self._time_proportion 
-
-                # Compute unfeasible points
-                if self._use_ml: unfeasible_points = self._ml_model.out_count(target)
-                else: unfeasible_points = 0
-
-                # Logging the results of the iteration 
-                self.log_iteration_result(suggested_minimum, s, dimension, unfeasible_points, mape_value)
+                # Update the model with the computed results
+                if results:
+                    next_points = [[*res[0]] for res in results]
+                    next_points_value = []
+                    next_points_index = []
+
+                    for res in results:
+                        next_points_value.append(res[1])
+                        next_points_index.append(res[2])
+                        self._remember_ml_time(res[2], res[3])
+
+                    dimension = len(next_points_value)
+                    self._objective_func.add_evaluation_count(dimension) # Add evaluation count to the model
+                    # Update the model
+                    target, mape_value = self.update_model(next_points, next_points_value, next_points_index, s)
+
+                    # Compute the minimum of the posterior distribution
+                    suggested_minimum = self.find_suggested_minimum()
+
+                    if t_restart > 0:
+                        self._global_time += time.time() - time1 + t_restart*(self._time_proportion-1) # real time
+                    else:
+                        self._global_time = (time.time() - time0)*self._time_proportion 
+
+                    # Compute unfeasible points
+                    if self._use_ml: unfeasible_points = self._ml_model.out_count(target)
+                    else: unfeasible_points = 0
+
+                    # Logging the results of the iteration 
+                    self.log_iteration_result(suggested_minimum, s, dimension, unfeasible_points, mape_value)
                 
-                # Save the results
-                if self._save:
-                    aux.csv_info(s,dimension, self._objective_func.evaluation_count,
-                                self._global_time, unfeasible_points, mape_value, self._result_folder, self._error) # add mape
-                results = [] # Reset the results 
-                s+=1  
+                    # Save the results
+                    if self._result_writer is not None:
+                        # The simulated waiting time is not part of the work of the iteration
+                        self._result_writer.write_timings(s, {'iteration': time.time() - time1 - wait_time})
+                        self._result_writer.write_info(s, dimension, self._objective_func.evaluation_count,
+                                                       self._global_time, unfeasible_points, mape_value, self._error)
+                    results = [] # Reset the results 
+                    s+=1  
                 
-                _log.info("Iteration finished succesfully")
+                    _log.info("Iteration finished succesfully")
         
 
-            if self._global_time >= 5000:
-                _log.info(f"Global time reached. Optimization finished succesfully!")
-                break
+                if self._global_time >= 5000:
+                    _log.info(f"Global time reached. Optimization finished succesfully!")
+                    break
+        except BaseException:
+            # Report the exception that stopped the loop, not a later error of the result writer
+            self.close(raise_error=False)
+            raise
+        self.close()
     
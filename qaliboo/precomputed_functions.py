@@ -3,6 +3,7 @@
 The instances exposed here are utilities to manage
  the sample datasets as domains and target functions
 """
+import functools
 import logging
 
 import numpy as np
@@ -15,19 +16,34 @@ _log = logging.getLogger(__name__)
 _log.setLevel(level=logging.DEBUG)
 
 
+# Number of decimals kept when hashing a configuration, so that
+# float noise does not turn an exact match into a miss
+_INDEX_DECIMALS = 9
+
+
+def _configuration_key(x) -> tuple:
+    return tuple(np.round(np.asarray(x, dtype=float).flatten(), _INDEX_DECIMALS).tolist())
+
+
 class _PrecomputedFunction(finite_domain.CPPFiniteDomain, abstract_problem.AbstractProblem):
 
     def __init__(self, dataset: datasets.Dataset):
-        m = np.min(dataset.X, axis=0).astype(float)
-        M = np.max(dataset.X, axis=0).astype(float)
+        m = np.min(dataset.X_array, axis=0)
+        M = np.max(dataset.X_array, axis=0)
         domain_bounds = np.vstack([m, M]).transpose()
-        super().__init__(data=dataset.X.values,
+        super().__init__(data=dataset.X_array,
                          search_domain=domain_bounds,
-                         min_value=np.min(dataset.y))
+                         min_value=np.min(dataset.y_array))
         self._dataset = dataset
         self.lower_bounds = m
         self.upper_bounds = M
 
+        # Exact-match index: configuration -> indexes of the rows having it
+        exact_index = {}
+        for i, row in enumerate(self._data):
+            exact_index.setdefault(_configuration_key(row), []).append(i)
+        self._exact_index = {key: np.array(indexes) for key, indexes in exact_index.items()}
+
     @property
     def lower_bound(self):
         return self.lower_bounds
@@ -36,81 +52,73 @@ class _PrecomputedFunction(finite_domain.CPPFiniteDomain, abstract_problem.Abstr
         return self.upper_bounds
     @property
     def minimum(self):
-        ix = np.argmin(self._dataset.y)
-        return self._dataset.X.loc[ix].values
+        ix = np.argmin(self._dataset.y_array)
+        return self._dataset.X_array[ix]
     @ property
     def dataset(self):
         return self._dataset
 
-    def evaluate_true(self, x):
-        distances, indexes, points = self.find_distances_indexes_closest_points(x)
-        # if any(distances > 0.00001):
-        #     _log.warning(f'POSSIBLE EVALUATION ERROR: The distance between the point in '
-        #                  f'domain and the evaluated point is large')
-        min_distance = np.min(distances)
-        
-        #if min_distance == 0.0:
-        #    _log.debug('There is at least one exact match')
-        
-        mask = distances == min_distance
-        if np.sum(mask) == 1:
-            #_log.debug('Only one match, return it')
-            my_index = indexes[mask][0]
-            values = self._dataset.y[my_index]
-            realtime = self._dataset.real_time[my_index]
-        else:
-            #_log.debug('Multiple matches, random pick...')
-            indexes = indexes[mask]
-            my_index = np.random.choice(indexes)
-            values = self._dataset.y[my_index]
-            realtime = self._dataset.real_time[my_index]
-        
-        return np.array(values), my_index, realtime
-    
-    def evaluate_time(self, x):
-        distances, indexes, points = self.find_distances_indexes_closest_points(x)
-        min_distance = np.min(distances)
-        mask = distances == min_distance
-        
-        if np.sum(mask)==1:
-            my_index = indexes[mask][0]
-            values = self._dataset.time[my_index]
-            #values = self._dataset.time[indexes[mask]]
-
-        else:
-            indexes = indexes[mask]
-            my_index = np.random.choice(indexes)
-            values = self._dataset.time[my_index]
-
-        return values
-
-
+    def find_closest_indexes(self, X) -> np.ndarray:
+        """Indexes of the dataset rows matching the rows of X
+
+        Configurations in the dataset are resolved through the exact-match index,
+        the others fall back to a single batch nearest neighbours search.
+        Ties between equally distant rows are broken at random.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        candidates = [self._exact_index.get(_configuration_key(x)) for x in X]
+        misses = [i for i, indexes in enumerate(candidates) if indexes is None]
+        if misses:
+            distances, indexes, points = self.find_distances_indexes_closest_points_batch(X[misses])
+            for i, row_distances, row_indexes in zip(misses, distances, indexes):
+                candidates[i] = row_indexes[row_distances == np.min(row_distances)]
+        return np.array([indexes[0] if len(indexes) == 1 else np.random.choice(indexes)
+                         for indexes in candidates], dtype=int)
+
+    def find_closest_index(self, x):
+        """Index of the dataset row matching x"""
+        return self.find_closest_indexes(x)[0]
+
+    def evaluate_all_batch(self, X, *, do_not_count=False):
+        """Evaluate the rows of X returning targets, row indexes, real times and ML times
+
+        All the values come from a single search of the dataset rows,
+        so callers needing the times too do not have to resolve X again.
+        """
+        indexes = self.find_closest_indexes(X)
+        if not do_not_count:
+            self._evaluation_count += len(indexes)
+        values = self._dataset.y_array[indexes]
+        realtime = self._dataset.real_time_array[indexes]
+        ml_time = self._dataset.time_array[indexes]
+        return values, indexes, realtime, ml_time
+
+    def evaluate_batch(self, X, *, do_not_count=False):
+        return self.evaluate_all_batch(X, do_not_count=do_not_count)[:3]
+
+    def evaluate_all(self, x, *, do_not_count=False):
+        values, indexes, realtime, ml_time = self.evaluate_all_batch(x, do_not_count=do_not_count)
+        return np.array(values[0]), indexes[0], realtime[0], ml_time[0]
 
+    def evaluate_true(self, x):
+        values, my_index, realtime, _ = self.evaluate_all(x, do_not_count=True)
+        return values, my_index, realtime
 
-Query26 = _PrecomputedFunction(
-    dataset=datasets.Query26
-)
+    def evaluate_time(self, x):
+        return self.evaluate_all(x, do_not_count=True)[3]
 
-ScaledQuery26 = _PrecomputedFunction(
-    dataset=datasets.ScaledQuery26
-)
 
-StereoMatch = _PrecomputedFunction(
-    dataset=datasets.StereoMatch
-)
+@functools.lru_cache(maxsize=None)
+def load(name: str) -> _PrecomputedFunction:
+    """Build the precomputed function of the named dataset on first access and cache it"""
+    return _PrecomputedFunction(dataset=datasets.load(name))
 
-ScaledStereoMatch = _PrecomputedFunction(
-    dataset=datasets.ScaledStereoMatch
-)
 
-LiGenTot = _PrecomputedFunction(
-    dataset=datasets.LiGenTot
-)
+def __getattr__(name):
+    if name in datasets._DATASETS:
+        return load(name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-ScaledLiGenTot = _PrecomputedFunction(
-    dataset=datasets.ScaledLiGenTot
-)
 
-ScaledStereoMatch10 = _PrecomputedFunction(
-    dataset=datasets.ScaledStereoMatch10
-)
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + list(datasets._DATASETS))